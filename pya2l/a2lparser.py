@@ -24,19 +24,18 @@ __copyright__="""
   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
-from collections import namedtuple, OrderedDict
-import enum
 import itertools
 import io
 import re
-from pprint import pprint
 
-import antlr4
 import six
 
-from pya2l import aml
 from pya2l import classes
+from pya2l.database import A2LDatabase
+from pya2l.decoders import OBJECT_VALUES, PLAIN_VALUES, TYPED_PLAIN_VALUES, blockDecoder, optionDecoder
 from pya2l.logger import Logger
+from pya2l import tokenizer
+from pya2l.tokenizer import A2LTokenizer, A2LTokenSource, MappedFile
 
 
 
@@ -46,71 +45,185 @@ AML = re.compile(r"""
 /end\s+A[23]ML
 """, re.VERBOSE | re.DOTALL | re.MULTILINE)
 
-CompuTab = namedtuple("CompuTabRange", "inVal outVal")
-CompuVTab = namedtuple("CompuVTabRange", "inVal outVal")
-CompuVTabRange = namedtuple("CompuVTabRange", "inValMin inValMax outVal")
+class BlockObject(object):
 
-class ValueType(enum.IntEnum):
+    def __init__(self, keyword, children):
+        self._keyword = keyword
+        self._children = children
 
-    INT = 0
-    FLOAT = 2
-    STRING = 3
-    IDENT = 4
+    @property
+    def keyword(self):
+        return self._keyword
 
+    @property
+    def children(self):
+        return self._children
 
-class ValueObject(object):
 
-    __slots__ = ['_value', '_type']
+class A2LSyntaxError(Exception):
+    pass
 
-    def __init__(self, value, typ):
-        self._value = value
-        self._type = typ
 
-    @property
-    def value(self):
-        return self._value
+class KeywordFilter(object):
+    """Select the blocks to be materialized, s. :class:`A2LParser`.
 
-    @property
-    def type(self):
-        return self._type
+    Blocks whose keyword is in `include` are walked with all their content;
+    other blocks are only entered if an included keyword may occur somewhere inside
+    (according to the `children` of the :mod:`pya2l.classes` keywords), otherwise they are skipped.
+    Blocks whose keyword is in `exclude` are always skipped.
 
-    def __str__(self):
-        return "<ValueObject: '{}' [{}]>".format(self._value, str(self._type))
+    Parameters
+    ----------
+    include: iterable of str
+        Block keywords, None means all.
+    exclude: iterable of str
+    """
 
-    __repr__ = __str__
+    def __init__(self, include = None, exclude = None):
+        for keyword in list(include or ()) + list(exclude or ()):
+            if keyword not in classes.KEYWORD_MAP:
+                raise ValueError("Unknown keyword '{0}'.".format(keyword))
+        self.include = frozenset(include) if include is not None else None
+        self.exclude = frozenset(exclude or ())
+        self._leadsTo = {}
 
+    def __reduce__(self):
+        return (KeywordFilter, (self.include, self.exclude))
 
-class BlockObject(object):
+    def __eq__(self, other):
+        return isinstance(other, KeywordFilter) and (self.include, self.exclude) == (other.include, other.exclude)
 
-    def __init__(self, keyword, children):
-        self._keyword = keyword
-        self._children = children
+    def __ne__(self, other):
+        return not self == other
 
-    @property
-    def keyword(self):
-        return self._keyword
+    def __hash__(self):
+        return hash((self.include, self.exclude))
+
+    def includes(self, keyword):
+        return self.include is None or keyword in self.include
+
+    def leadsTo(self, keyword):
+        """Is `keyword` included or may it contain included keywords?
+        """
+        result = self._leadsTo.get(keyword)
+        if result is None:
+            result = self.includes(keyword)
+            if not result:
+                self._leadsTo[keyword] = False    # Guard against cycles.
+                klass = classes.KEYWORD_MAP.get(keyword)
+                result = any(self.leadsTo(child) for child in (klass.children if klass else ()))
+            self._leadsTo[keyword] = result
+        return result
+
+
+class BaseWalker(A2LDatabase):
+    """Turn the content of A2L blocks into :mod:`pya2l.classes` instances.
+
+    The representation of the block content is up to the derived classes,
+    children passed to :meth:`walkBlock` are only inspected by the following methods:
+
+        - isBlock()
+        - isPrimitiveTypeOrIdent()
+        - getText()
+        - getValue()
+        - valueToken()
+        - enterBlock()
+
+    Values are decoded by token type, s. :data:`pya2l.decoders.OBJECT_VALUES`; if :attr:`plainValues` is set,
+    as Python scalars typed by the attribute declarations in :mod:`pya2l.classes` instead.
+    The block structure is taken from the compiled :class:`pya2l.decoders.BlockDecoder` s.
+    """
+
+    keywordFilter = None    # s. :class:`KeywordFilter`.
+    insideIncluded = False
+    values = OBJECT_VALUES  # Token type ==> decoder.
+    typedValues = {}        # Attribute type ==> token type ==> decoder, if different from :attr:`values`.
 
     @property
-    def children(self):
-        return self._children
+    def plainValues(self):
+        return self.values is PLAIN_VALUES
+
+    @plainValues.setter
+    def plainValues(self, plainValues):
+        self.values = PLAIN_VALUES if plainValues else OBJECT_VALUES
+        self.typedValues = TYPED_PLAIN_VALUES if plainValues else {}
+
+    def __init__(self):
+        super(BaseWalker, self).__init__()
+        self.logger = Logger(self, 'A2LParser')
+        self.level = 0
+        self.blockStack = []
+
+    def walkFiltered(self, keyword, walk, skip):
+        """Walk a nested `keyword` block by calling `walk` -- unless :attr:`keywordFilter` rejects it,
+        then `skip` is called and None returned.
+        """
+        keywordFilter = self.keywordFilter
+        if keywordFilter is None:
+            return walk()
+        inside = self.insideIncluded
+        if keyword in keywordFilter.exclude or not (inside or keywordFilter.leadsTo(keyword)):
+            skip()
+            return None
+        self.insideIncluded = inside or keywordFilter.includes(keyword)
+        try:
+            return walk()
+        finally:
+            self.insideIncluded = inside
+
+    def walkBlock(self, startTag, endTag, children, level):
+        """Create the instance of a `startTag` block from its content `children` (an iterator),
+        by the walker compiled for the keyword, s. :meth:`pya2l.decoders.BlockDecoder.walker`.
+        """
+        return blockDecoder(startTag).walker(self.plainValues)(self, children, level)
+
+    def fetchOptionallArgument(self, name, iter, isTag):
+        decoder = optionDecoder(name, isTag)
+        args = []
+        for attr, table in zip(decoder.fixedAttributes, decoder.fixedTables[self.plainValues]):
+            child = next(iter)
+            if self.isPrimitiveTypeOrIdent(child):
+                token = self.valueToken(child)
+                args.append((attr, table[token.type](token.text)))
+            else:
+                print("error")
+        return classes.createInstance(decoder.keyword, args)
+
+    def fetchVariableParameters(self, name, iter, table):
+        valueToken = self.valueToken
+        return [table[token.type](token.text) for token in (valueToken(child) for child in iter)]
+
+    def fetchTuples(self, count, size, factory, iter, startValue):
+        result = [startValue]
+        result.extend([self.getValue(next(iter)) for _ in range((count * size) - 1  )])
+        tmp = [factory(*result[x : x + size]) for x in range(0, len(result), size)]
+        return tmp
 
 
-class A2LWalker(object):
+class A2LWalker(BaseWalker):
+    """Walk the parse tree created by the ANTLR generated parser.
+    """
 
     def __init__(self, tree):
-        self.logger = Logger(self, 'A2LParser')
+        super(A2LWalker, self).__init__()
         self.tree = tree
         self.parser = tree.parser
-        self.level = 0
-        self.blockStack = []
-        self.instList = []
 
     def run(self):
         a2lFile = self.tree
         if not a2lFile.children:
             return
         for child in a2lFile.children:
-            self.instList.append((self.traverseBlock(child), 0))
+            if isinstance(child, self.parser.VersionContext):
+                inst = None
+            else:
+                inst = self.walkFiltered(child.kw0.text, lambda: self.traverseBlock(child), lambda: None)
+                if inst is None:
+                    continue
+            self.instList.append((inst, 0))
+
+    def isBlock(self, value):
+        return isinstance(value, self.parser.ValueBlockContext)
 
     def isPrimitiveType(self, value):
         return isinstance(value, (self.parser.ValueStringContext, self.parser.ValueIntContext,
@@ -120,16 +233,19 @@ class A2LWalker(object):
         return isinstance(value, (self.parser.ValueStringContext, self.parser.ValueIntContext,
             self.parser.ValueHexContext, self.parser.ValueFloatContext, self.parser.ValueIdentContext))
 
-    def getValue(self, ctx):
-        CONTEXTS = {
-            self.parser.ValueIdentContext: lambda x: ValueObject(x.IDENT().getText(), ValueType.IDENT),
-            self.parser.ValueStringContext: lambda x: ValueObject(x.STRING().getText().strip('"'), ValueType.STRING),
-            self.parser.ValueIntContext: lambda x: ValueObject(int(x.INT().getText()), ValueType.INT),
-            self.parser.ValueHexContext: lambda x: ValueObject(int(x.HEX().getText(), 16), ValueType.INT),
-            self.parser.ValueFloatContext: lambda x: ValueObject(float(x.FLOAT().getText()), ValueType.FLOAT),
-        }
-        fkt = CONTEXTS[type(ctx)]
-        return fkt(ctx)
+    def getText(self, ctx):
+        return ctx.getText()
+
+    def valueToken(self, ctx):
+        return ctx.start    # Value rules consist of a single token.
+
+    def getValue(self, ctx, attrType = None):
+        token = ctx.start
+        return self.typedValues.get(attrType, self.values)[token.type](token.text)
+
+    def enterBlock(self, ctx, level):
+        tree = ctx.children[0]
+        return self.walkFiltered(tree.kw0.text, lambda: self.traverseBlock(tree, level), lambda: None)
 
     def traverseBlock(self, tree, level = 0):
         if not tree.children:
@@ -138,97 +254,367 @@ class A2LWalker(object):
         if isinstance(tree, self.parser.VersionContext):
             return
 
-        level += 1
-        spaces = "  " * level
         startTag, endTag = tree.kw0.text, tree.kw1.text
-        #print("{}{}".format(spaces, startTag))
+        children = iter(tree.children[2 : -2])
+        return self.walkBlock(startTag, endTag, children, level)
 
 
-        klass = classes.KEYWORD_MAP.get(startTag)
+class BlockStart(object):
+    """Stands for a nested block in the content of a block walked by :class:`A2LTokenWalker`.
+    """
 
-        # Untersuchen: AXIS_DESCR
+    __slots__ = ['token', 'entered']
 
-        fixedParameters =  klass.fixedAttributes
-        variableParameters =  klass.variableAttribute
-        optionalParameters = klass.children
-        numParameters = len(fixedParameters)
+    def __init__(self, token):
+        self.token = token
+        self.entered = False
 
-        children = iter(tree.children[2 : -2])
 
-        args = []
-        optArgs = []
-        varArgs = []
-        fetchAttrs = True if numParameters else False
-        argCount = 0
-        for child in children:
-            if fetchAttrs:
-                if self.isPrimitiveTypeOrIdent(child):
-                    #print(self.getValue(child))
-                    args.append((fixedParameters[argCount], self.getValue(child)))
-                else:
-                    print("att error" + child.getText())
-                argCount += 1
-                if argCount >= numParameters:
-                    fetchAttrs = False
-            else:
-                if isinstance(child, self.parser.ValueBlockContext):
-                    self.instList.append(((self.traverseBlock(child.children[0], level)), level))
-                else:
-                    param = child.getText()
-                    if param in optionalParameters:
-                        optArgs.append((param, self.fetchOptionallArgument(param, children, param == endTag)))
-                    else:
-                        if variableParameters:
-                            varArgs = [self.getValue(child)]
-                            res = self.fetchVariableParameters(param, children)
-                            varArgs.extend(res)
-                            #print("   VParams: {}".format(varArgs))
-                        elif startTag == 'COMPU_TAB':
-                            numberValuePairs = [x[1].value for x in args if x[0] == 'NumberValuePairs'][0]   # Fkt!!!
-                            result = self.fetchTuples(numberValuePairs, 2, CompuTab, children, self.getValue(child))
-                            print(result)
-                        elif startTag == 'COMPU_VTAB':
-                            numberValuePairs = [x[1].value for x in args if x[0] == 'NumberValuePairs'][0]   # Fkt!!!
-                            result = self.fetchTuples(numberValuePairs, 2, CompuVTab, children, self.getValue(child))
-                            print(result)
-                        elif startTag == 'COMPU_VTAB_RANGE':
-                            numberOfTriples = [x[1].value for x in args if x[0] == 'NumberValueTriples'][0]   # Fkt!!!
-                            result = self.fetchTuples(numberOfTriples, 3, CompuVTabRange, children, self.getValue(child))
-                            print(result)
-                        else:
-                            print("Error:      *", param)
-        if varArgs:
-                pass
-        inst = classes.instanceFactory(startTag, **OrderedDict(args+optArgs))
-        return inst
+class Splice(object):
+    """Placeholder in a token stream for blocks parsed elsewhere, s. :mod:`pya2l.parallel`.
 
+    Parameters
+    ----------
+    future: :class:`concurrent.futures.Future`
+        Result is a tuple `(instList, children, lineCount)`; `instList` as built by
+        :meth:`BaseWalker.walkBlock` for the blocks, `children` the instances of the blocks themselves.
+    """
 
-    def fetchOptionallArgument(self, name, iter, isTag):
-        if not isTag:
-            if name+"Attr" in classes.KEYWORD_MAP.keys():
-                name = name+"Attr"
-        klass = classes.KEYWORD_MAP.get(name)
-        parameters = klass.fixedAttributes
-        args = []
-        for idx in range(len(klass.fixedAttributes)):
-            child = next(iter)
-            if self.isPrimitiveTypeOrIdent(child):
-                value = self.getValue(child)
-                args.append(value)
-            else:
-                print("error")
-        inst = classes.instanceFactory(name, **OrderedDict(zip(parameters, args)))
-        return inst
+    __slots__ = ['future']
 
-    def fetchVariableParameters(self, name, iter):
-        result  = [self.getValue(x) for x in list(iter)]
-        return result
+    type = tokenizer.SPLICE
+
+    def __init__(self, future):
+        self.future = future
+
+    def result(self):
+        instList, children, _ = self.future.result()
+        return instList, children
+
+    @property
+    def lineCount(self):
+        return self.future.result()[2]
+
+
+class A2LTokenWalker(BaseWalker):
+    """Recursive-descent parser working directly on tokens, i.e. no parse tree is created.
+
+    Parameters
+    ----------
+    tokens: iterable
+        :class:`pya2l.tokenizer.Token` s, whitespace and comments already removed.
+    fastForward: bool
+        `tokens` is a generator returned by :meth:`pya2l.tokenizer.A2LTokenizer.tokens`,
+        so skipped blocks don't need to be tokenized.
+    """
+
+    PRIMITIVE_TYPES = (tokenizer.IDENT, tokenizer.STRING, tokenizer.INT, tokenizer.HEX, tokenizer.FLOAT)
+
+    def __init__(self, tokens, fastForward = False):
+        super(A2LTokenWalker, self).__init__()
+        self.tokens = iter(tokens)
+        self.token = None
+        self.fastForward = fastForward
+
+    def run(self):
+        token = self.nextToken()
+        if token is None:
+            return
+        if token.type == tokenizer.ASAP2_VERSION:
+            self.expect(tokenizer.INT)
+            self.expect(tokenizer.INT)
+            self.instList.append((None, 0))
+            token = self.nextToken()
+        if token is None or token.type != tokenizer.BEGIN:
+            self.syntaxError("'/begin' expected")
+        inst = self.enterBlock(BlockStart(token), 0)
+        if inst is not None:
+            self.instList.append((inst, 0))
+        self.tokens = iter(())  # Don't keep the tokenizer and its input buffer alive.
+        self.token = None
+
+    def nextToken(self):
+        self.token = next(self.tokens, None)
+        return self.token
+
+    def expect(self, tokenType):
+        token = self.nextToken()
+        if token is None or token.type != tokenType:
+            self.syntaxError("unexpected {0}".format("end of file" if token is None else repr(token.text)))
+        return token
+
+    def syntaxError(self, message):
+        if self.token is None:
+            raise A2LSyntaxError(message)
+        raise A2LSyntaxError("{0}:{1}: {2}".format(self.token.line, self.token.column, message))
+
+    def isBlock(self, value):
+        return value.__class__ is BlockStart
+
+    def isPrimitiveTypeOrIdent(self, value):
+        return value.__class__ is not BlockStart and value.type in self.PRIMITIVE_TYPES
+
+    def getText(self, token):
+        return token.text
+
+    def valueToken(self, token):
+        return token
+
+    def getValue(self, token, attrType = None):
+        return self.typedValues.get(attrType, self.values)[token.type](token.text)
+
+    def enterBlock(self, block, level):
+        if self.keywordFilter is None:
+            return self.traverseBlock(block, level)
+        block.entered = True
+        startTag = self.expect(tokenizer.IDENT).text
+        return self.walkFiltered(startTag,
+            lambda: self.walkBlock(startTag, startTag, self.blockContent(startTag), level), self.skipBlock
+        )
+
+    def traverseBlock(self, block, level = 0):
+        block.entered = True
+        startTag = self.expect(tokenizer.IDENT).text
+        return self.walkBlock(startTag, startTag, self.blockContent(startTag), level)
+
+    def blockContent(self, startTag):
+        """Generate the content of the current block, nested blocks are represented by
+        :class:`BlockStart` objects; if the consumer doesn't enter them, they get skipped.
+        """
+        while True:
+            token = self.nextToken()
+            if token is None:
+                self.syntaxError("premature end of file, '/end {0}' expected".format(startTag))
+            if token.type == tokenizer.BEGIN:
+                block = BlockStart(token)
+                yield block
+                if not block.entered:
+                    self.skipBlock()
+            elif token.type == tokenizer.END:
+                endTag = self.expect(tokenizer.IDENT).text
+                if endTag != startTag:
+                    self.syntaxError("'/end {0}' expected, got '/end {1}'".format(startTag, endTag))
+                return
+            else:
+                yield token
+
+    def skipBlock(self):
+        """Fast-forward to the end of the current block, just counting `/begin` and `/end`.
+        """
+        if self.fastForward:
+            self.token = None
+            try:
+                self.token = self.tokens.send(tokenizer.SKIP_BLOCK)
+            except StopIteration:
+                self.syntaxError("premature end of file")
+            self.expect(tokenizer.IDENT)
+            return
+        BEGIN, END = tokenizer.BEGIN, tokenizer.END
+        depth = 1
+        for token in self.tokens:
+            tokenType = token.type
+            if tokenType == BEGIN:
+                depth += 1
+            elif tokenType == END:
+                depth -= 1
+                if not depth:
+                    self.token = token
+                    self.expect(tokenizer.IDENT)
+                    return
+        self.token = None
+        self.syntaxError("premature end of file")
+
+class Frame(object):
+    """Bookkeeping of an open block while iterparsing.
+    """
+
+    __slots__ = ['keyword', 'klass', 'level', 'remaining', 'content', 'children', 'element',
+        'materialize', 'report', 'begun']
+
+    def __init__(self, keyword, klass, level, materialize, report):
+        self.keyword = keyword
+        self.klass = klass
+        self.level = level
+        self.remaining = len(klass.fixedAttributes)
+        self.content = []
+        self.children = []
+        self.element = None
+        self.materialize = materialize
+        self.report = report
+        self.begun = False
+
+
+class A2LIterParser(A2LTokenWalker):
+    """Incrementally parse an A2L file, s. :func:`iterparse`.
+    """
+
+    EVENTS = ("begin", "end")
+
+    def __init__(self, source, events = ("end", ), tags = None, chunkSize = A2LTokenizer.CHUNK_SIZE):
+        for event in events:
+            if event not in self.EVENTS:
+                raise ValueError("Invalid event '{0}'.".format(event))
+        self.ownsFile = isinstance(source, six.string_types)
+        if self.ownsFile:
+            fp = io.open(source, encoding = "latin1")
+        else:
+            fp = source
+        super(A2LIterParser, self).__init__(A2LTokenizer(fp, skipA2ML = True, chunkSize = chunkSize))
+        self.fp = fp
+        self.reportedEvents = frozenset(events)
+        self.tags = frozenset(tags) if tags else None
+        self._skip = False
+        self._iterator = self.iterparse()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    next = __next__     # Python 2.x
+
+    def skip(self):
+        """Called after a "begin" event: skip the rest of the block, i.e. it won't get materialized
+        and there is no corresponding "end" event.
+        """
+        self._skip = True
+
+    def iterparse(self):
+        try:
+            for event in self.events():
+                yield event
+        finally:
+            if self.ownsFile:
+                self.fp.close()
+
+    def events(self):
+        stack = []
+        while True:
+            token = self.nextToken()
+            if token is None:
+                if stack:
+                    self.syntaxError("premature end of file, '/end {0}' expected".format(stack[-1].keyword))
+                break
+            tokenType = token.type
+            if tokenType == tokenizer.BEGIN:
+                if stack and not stack[-1].begun:
+                    for event in self.beginEvent(stack[-1]):
+                        yield event
+                    if self._skip:
+                        self._skip = False
+                        self.skipBlock()        # The nested one.
+                        self.skipBlock()
+                        stack.pop()
+                        continue
+                keyword = self.expect(tokenizer.IDENT).text
+                klass = classes.KEYWORD_MAP.get(keyword)
+                if klass is None:
+                    self.skipBlock()
+                    continue
+                wanted = self.tags is None or keyword in self.tags
+                inside = bool(stack) and stack[-1].materialize
+                frame = Frame(keyword, klass, len(stack), wanted or inside, wanted)
+                stack.append(frame)
+                if frame.remaining == 0:
+                    for event in self.beginEvent(frame):
+                        yield event
+                    if self._skip:
+                        self._skip = False
+                        self.skipBlock()
+                        stack.pop()
+            elif tokenType == tokenizer.END:
+                frame = stack.pop() if stack else self.syntaxError("unexpected '/end'")
+                endTag = self.expect(tokenizer.IDENT).text
+                if endTag != frame.keyword:
+                    self.syntaxError("'/end {0}' expected, got '/end {1}'".format(frame.keyword, endTag))
+                if not frame.begun:
+                    for event in self.beginEvent(frame):
+                        yield event
+                    if self._skip:
+                        self._skip = False
+                        continue
+                if not frame.materialize:
+                    continue
+                inst = self.walkBlock(frame.keyword, frame.keyword, iter(frame.content), frame.level)
+                inst.children.extend(frame.children)
+                if frame.element is not None:
+                    inst = self.mergeElements(frame.element, inst)
+                if stack and stack[-1].materialize:
+                    stack[-1].children.append(inst)
+                if frame.report and "end" in self.reportedEvents:
+                    yield ("end", inst)
+            elif not stack:
+                if tokenType == tokenizer.ASAP2_VERSION:
+                    self.expect(tokenizer.INT)
+                    self.expect(tokenizer.INT)
+                else:
+                    self.syntaxError("'/begin' expected")
+            else:
+                frame = stack[-1]
+                if frame.materialize:
+                    frame.content.append(token)
+                if not frame.begun:
+                    frame.remaining -= 1
+                    if frame.remaining == 0:
+                        for event in self.beginEvent(frame):
+                            yield event
+                        if self._skip:
+                            self._skip = False
+                            self.skipBlock()
+                            stack.pop()
+
+    def beginEvent(self, frame):
+        frame.begun = True
+        if frame.report and "begin" in self.reportedEvents:
+            klass = frame.klass
+            args = [(name, self.getValue(token, attrType))
+                for name, attrType, token in zip(klass.fixedAttributes, klass.fixedAttributeTypes, frame.content)
+                if self.isPrimitiveTypeOrIdent(token)
+            ]
+            frame.element = classes.createInstance(frame.keyword, args)
+            yield ("begin", frame.element)
+
+    def mergeElements(self, element, inst):
+        """Update the element reported by the "begin" event, so that "begin" and "end" refer to the same object.
+        """
+        for attr in inst.attrs:
+            if attr not in element.attrs:
+                element.addAttribute(attr, getattr(inst, attr))
+        element.children = inst.children
+        return element
+
+
+def iterparse(source, events = ("end", ), tags = None):
+    """Parse an A2L file incrementally.
+
+    The input is read in chunks and the object model is built on the fly, so memory usage
+    doesn't depend on file size.
+
+    Parameters
+    ----------
+    source: str or file-like object
+        File name or file object.
+    events: sequence of str
+        - "begin": reported after the fixed attributes of a block have been read.
+        - "end": reported with the completely decoded block, including its children.
+    tags: set of str
+        Only report these keywords (default: all keywords).
+        Blocks outside of reported ones are not materialized at all.
+
+    Returns
+    -------
+    :class:`A2LIterParser`
+        Iterator yielding `(event, element)` tuples; call its `skip()` method after
+        a "begin" event to skip the block.
+
+    Note
+    ----
+    Like `xml.etree.ElementTree.iterparse()`, elements stay attached to their parents.
+    If all blocks are reported, clear `element.children` when done to keep memory flat.
+    """
+    return A2LIterParser(source, events, tags)
 
-    def fetchTuples(self, count, size, factory, iter, startValue):
-        result = [startValue]
-        result.extend([self.getValue(next(iter)) for _ in range((count * size) - 1  )])
-        tmp = [factory(*result[x : x + size]) for x in range(0, len(result), size)]
-        return tmp
 
 """
 VA: ANNOTATION_TEXT ==> ['Text']
@@ -255,33 +641,159 @@ VA: VIRTUAL_CHARACTERISTIC ==> ['Characteristic']
 """
 
 
-class A2LParser(object):
+def readText(data):
+    """The ANTLR runtime requires the complete input as string.
+    """
+    return data.read() if hasattr(data, "read") else data
 
-    def __init__(self):
+
+class A2LParser(object):
+    """Parse A2L files.
+
+    Parameters
+    ----------
+    tokenizer: str
+        - "antlr": the lexer generated from `a2l.g4`.
+        - "fast": the hand-written :class:`pya2l.tokenizer.A2LTokenizer`, produces the same
+          token stream, but is considerably faster.
+    engine: str
+        - "antlr": build an ANTLR parse tree and walk it (:class:`A2LWalker`).
+        - "recursive": walk the token stream directly (:class:`A2LTokenWalker`),
+          no parse tree gets created.
+    cache: bool or :class:`pya2l.cache.A2LCache`
+        Cache the results of :meth:`parseFromFileName` on disk; `True` uses
+        the default cache directory. On cache hits a :class:`pya2l.database.A2LDatabase`
+        is returned instead of a walker.
+    workers: int
+        Parse large files with that many processes (s. :mod:`pya2l.parallel`),
+        always using the fast tokenizer and the recursive engine.
+    include: iterable of str
+        Only materialize blocks with these keywords (and the blocks containing them),
+        s. :class:`KeywordFilter`. With the "recursive" engine, other blocks are skipped
+        at the token level.
+    exclude: iterable of str
+        Skip blocks with these keywords.
+    plainValues: bool
+        Decode attributes as Python scalars (`str`, `int`, `float`) instead of
+        :class:`pya2l.classes.ValueObject` s; `Float` attributes always get a `float`.
+
+        Filtered parses and parses with plain values bypass the cache.
+    """
+
+    TOKENIZERS = ("antlr", "fast")
+    ENGINES = ("antlr", "recursive")
+
+    def __init__(self, tokenizer = "antlr", engine = "antlr", cache = None, workers = None, include = None, exclude = None,
+            plainValues = False):
+        if tokenizer not in self.TOKENIZERS:
+            raise ValueError("Invalid tokenizer '{0}'.".format(tokenizer))
+        if engine not in self.ENGINES:
+            raise ValueError("Invalid engine '{0}'.".format(engine))
+        self.tokenizer = tokenizer
+        self.engine = engine
+        if cache is True:
+            from pya2l.cache import A2LCache
+
+            cache = A2LCache()
+        self.cache = cache or None
+        self.workers = workers
+        self.keywordFilter = KeywordFilter(include, exclude) if include is not None or exclude else None
+        self.plainValues = plainValues
         self.logger = Logger(self, 'parser')
 
     def parseFromFileName(self, filename):
-        fp = six.io.open(filename, encoding = "latin1")
-        parser = self.parse(fp)
-        return parser
+        """Parse an A2L file.
+
+        The file is memory-mapped and fed in chunks to the tokenizer, A2ML sections are
+        skipped by their byte offsets, so no complete copy of the file is ever created
+        (with the "antlr" tokenizer the text is still read as a whole).
+        """
+        if self.cache is None or self.keywordFilter is not None or self.plainValues:
+            return self.parseUncached(filename)
+        key = self.cache.key(filename)
+        database = self.cache.load(key)
+        if database is None:
+            database = self.parseUncached(filename)
+            self.cache.store(key, database)
+        return database
+
+    def parseUncached(self, filename):
+        if self.workers and self.workers > 1:
+            from pya2l.parallel import parseParallel
+
+            return parseParallel(self, filename, self.workers)
+        return self.parseFile(filename)
+
+    def parseMany(self, filenames, workers = None):
+        """Parse many A2L files in a pool of worker processes, s. :func:`pya2l.parallel.parseMany`.
+
+        Returns
+        -------
+        generator of :class:`pya2l.parallel.BatchResult`
+            In order of completion.
+        """
+        from pya2l.parallel import parseMany
+
+        return parseMany(self, filenames, workers)
+
+    def parseLazy(self, filename):
+        """Open an A2L file, parsing the blocks in MODULEs only when they are accessed,
+        s. :class:`pya2l.lazy.A2LLazyDatabase`.
+        """
+        from pya2l.lazy import A2LLazyDatabase
+
+        return A2LLazyDatabase(filename, self.plainValues)
+
+    def parseFile(self, filename):
+        with MappedFile(filename) as fp:
+            return self.parseText(fp)
 
     def parseFromString(self, stringObj):
-        self.parse(six.StringIO(stringObj))
+        return self.parse(six.StringIO(stringObj))
 
     def parse(self, fp):
-        pa = aml.ParserWrapper('a2l', 'a2lFile')
         data = fp.read()
         match = AML.search(data)
         if match:
             header = data[0 : match.start()]
             amlS = data[match.start() : match.end()]
             lineCount = amlS.count('\n')
-            footer = data[match.end() : -1]
+            footer = data[match.end() : ]
             data = header + '\n' * lineCount + footer
-        tree = pa.parseFromString(data)
-        print("Finished ANTLR parsing.")
-        walker = A2LWalker(tree)
+        return self.parseText(data)
+
+    def parseText(self, data):
+        """Parse A2L source without A2ML sections.
+
+        Parameters
+        ----------
+        data: str or file-like object
+        """
+        if self.engine == "recursive":
+            walker = A2LTokenWalker(self.tokenize(data), fastForward = self.tokenizer == "fast")
+        else:
+            from pya2l import aml
+
+            pa = aml.ParserWrapper('a2l', 'a2lFile')
+            if self.tokenizer == "fast":
+                tree = pa.parseFromTokenSource(A2LTokenSource(A2LTokenizer(data)))
+            else:
+                tree = pa.parseFromString(readText(data))
+            print("Finished ANTLR parsing.")
+            walker = A2LWalker(tree)
+        walker.keywordFilter = self.keywordFilter
+        walker.plainValues = self.plainValues
         walker.run()
         print("Finished walking.")
         return walker
 
+    def tokenize(self, data):
+        """Generate :class:`pya2l.tokenizer.Token` s using the configured tokenizer.
+        """
+        if self.tokenizer == "fast":
+            return A2LTokenizer(data).tokens()
+        import antlr4
+        from pya2l import aml
+
+        lexer = aml.ParserWrapper('a2l', 'a2lFile').lexerClass(antlr4.InputStream(readText(data)))
+        return tokenizer.tokensFromTokenSource(lexer)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Map ECU addresses back to MEASUREMENT, CHARACTERISTIC and AXIS_PTS objects.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import chain
+import re
+
+DATATYPE_SIZES = {
+    "UBYTE": 1, "SBYTE": 1,
+    "UWORD": 2, "SWORD": 2,
+    "ULONG": 4, "SLONG": 4,
+    "A_UINT64": 8, "A_INT64": 8,
+    "FLOAT32_IEEE": 4, "FLOAT64_IEEE": 8,
+}
+
+AXES = "XYZ45"
+
+##
+## RECORD_LAYOUT components referring to an axis, e.g. 'AXIS_PTS_X'.
+##
+AXIS_COMPONENT = re.compile(r"^(?P<component>[A-Z_]+)_(?P<axis>[XYZ45W])$")
+
+
+def plainValue(value):
+    return getattr(value, "value", value)
+
+
+def elementCount(inst):
+    """Number of values of an object, s. `MATRIX_DIM`, `ARRAY_SIZE` and `NUMBER`.
+    """
+    matrixDim = getattr(inst, "MATRIX_DIM", None)
+    if matrixDim is not None:
+        count = 1
+        for attr in ("xDim", "yDim", "zDim"):
+            dim = plainValue(getattr(matrixDim, attr, 1))
+            count *= dim if dim else 1
+        return count
+    for keyword in ("ARRAY_SIZE", "NUMBER"):
+        value = getattr(inst, keyword, None)
+        if value is not None:
+            return plainValue(value.Number)
+    return 1
+
+
+def objectSize(inst, plans):
+    """Size of a MEASUREMENT, CHARACTERISTIC or AXIS_PTS in bytes or None if unknown.
+
+    Records are sized by the :class:`pya2l.layouts.LayoutPlan` of their RECORD_LAYOUT,
+    i.e. including alignment gaps, as if all axes were filled up to MaxAxisPoints.
+
+    Parameters
+    ----------
+    plans: :class:`pya2l.layouts.LayoutPlans`
+    """
+    inst = getattr(inst, "element", inst)   # :class:`pya2l.lazy.LazyBlock`
+    keyword = inst.__class__.__name__
+    if keyword == "MEASUREMENT":
+        return DATATYPE_SIZES[plainValue(inst.Datatype)] * elementCount(inst)
+    if keyword == "AXIS_PTS":
+        maxPoints, count = [plainValue(inst.MaxAxisPoints)], 1
+    else:
+        maxPoints = [plainValue(axis.MaxAxisPoints) for axis in inst.children
+            if axis.__class__.__name__ == "AXIS_DESCR"
+        ]
+        count = 1 if maxPoints else elementCount(inst)
+    try:
+        return plans.plan(plainValue(inst.Deposit), plainValue(inst.Address), maxPoints, count).size
+    except KeyError:
+        return None     # No such RECORD_LAYOUT.
+
+
+def objectAddress(inst):
+    if hasattr(inst, "Address"):
+        return plainValue(inst.Address)
+    ecuAddress = getattr(inst, "ECU_ADDRESS", None)
+    if ecuAddress is not None:
+        return plainValue(ecuAddress.Address)
+    return None
+
+
+class AddressIndex(object):
+    """Sorted-array index over the memory occupied by MEASUREMENT, CHARACTERISTIC
+    and AXIS_PTS objects.
+
+    Intervals are sorted by start address and grouped by length class, i.e. lengths within
+    `(2**(k - 1), 2**k]`. Within a group no interval is longer than the group's longest one,
+    so only objects starting within `[address - maxLength, address + length)` can overlap a query,
+    both bounds are found by bisection -- a single large object doesn't widen the window for all others.
+
+    Parameters
+    ----------
+    database: :class:`pya2l.database.A2LDatabase`
+    """
+
+    KEYWORDS = ("MEASUREMENT", "CHARACTERISTIC", "AXIS_PTS")
+
+    def __init__(self, database):
+        plans = database.layoutPlans
+        intervals = []
+        self.unsized = []
+        for inst in chain(*[database.instances(keyword) for keyword in self.KEYWORDS]):
+            address = objectAddress(inst)
+            if address is None:
+                continue    # e.g. virtual measurements.
+            size = objectSize(inst, plans)
+            if size is None:
+                self.unsized.append(inst)
+                size = 1
+            intervals.append((address, address + max(size, 1), len(intervals), inst))
+        intervals.sort()
+        self.starts = [start for start, _, _, _ in intervals]
+        self.ends = [end for _, end, _, _ in intervals]
+        self.elements = [inst for _, _, _, inst in intervals]
+        groups = {}
+        for idx, (start, end) in enumerate(zip(self.starts, self.ends)):
+            groups.setdefault((end - start - 1).bit_length(), []).append(idx)
+        self.groups = [(max(self.ends[idx] - self.starts[idx] for idx in indexes), [self.starts[idx] for idx in indexes], indexes)
+            for _, indexes in sorted(groups.items())
+        ]
+        segments = sorted(((plainValue(inst.Address), plainValue(inst.Address) + plainValue(inst.Size), inst)
+            for modPar in database.instances("MOD_PAR") for inst in modPar.children
+            if inst.__class__.__name__ == "MEMORY_SEGMENT"), key = lambda item: item[ : 2]
+        )
+        self.segmentStarts = [start for start, _, _ in segments]
+        self.segments = segments
+
+    def __len__(self):
+        return len(self.elements)
+
+    def overlapping(self, address, length = 1):
+        """Objects overlapping `[address, address + length)`, ordered by address.
+        """
+        end = address + length
+        result = []
+        for maxLength, starts, indexes in self.groups:
+            lo = bisect_right(starts, address - maxLength)
+            hi = bisect_left(starts, end)
+            result.extend(idx for idx in indexes[lo : hi] if self.ends[idx] > address)
+        result.sort()
+        return [self.elements[idx] for idx in result]
+
+    def interval(self, inst):
+        """`(start, end)` of an indexed object.
+        """
+        idx = bisect_left(self.starts, objectAddress(inst))
+        while idx < len(self.elements):
+            if self.elements[idx] is inst:
+                return self.starts[idx], self.ends[idx]
+            idx += 1
+        raise KeyError(inst)
+
+    def segment(self, address, length = 1):
+        """The MEMORY_SEGMENT containing `[address, address + length)` or None.
+        """
+        idx = bisect_right(self.segmentStarts, address) - 1
+        if idx >= 0:
+            start, end, inst = self.segments[idx]
+            if address + length <= end:
+                return inst
+        return None
+
+    def validate(self):
+        """Objects not completely located inside a MEMORY_SEGMENT (empty if there are no segments).
+        """
+        if not self.segments:
+            return []
+        return [inst for start, end, inst in zip(self.starts, self.ends, self.elements)
+            if self.segment(start, end - start) is None
+        ]
@@ -28,13 +28,13 @@ __author__  = 'Christoph Schueler'
 __version__ = '0.1.0'
 
 import codecs
-import importlib
 from pprint import pprint
 import sys
 
 import six
 import antlr4
 import antlr4.tree
+from pya2l import atnsnapshot
 import pya2l.parserlib
 import pya2l.amllib as amllib
 
@@ -66,13 +66,16 @@ class ParserWrapper(object):
     def _load(self, name):
         className = '{0}{1}'.format(self.grammarName, name)
         moduleName = 'pya2l.py{0}.{1}'.format(2 if six.PY2 else 3, className)
-        module = importlib.import_module(moduleName)
+        module = atnsnapshot.importRecognizer(moduleName)
         klass = getattr(module, className)
         return (module, klass, )
 
     def parse(self, input, trace = False):
         lexer = self.lexerClass(input)
-        tokenStream = antlr4.CommonTokenStream(lexer)
+        return self.parseFromTokenSource(lexer, trace)
+
+    def parseFromTokenSource(self, tokenSource, trace = False):
+        tokenStream = antlr4.CommonTokenStream(tokenSource)
         parser = self.parserClass(tokenStream)
         parser.setTrace(True if trace else False)
         meth = getattr(parser, self.startSymbol)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Snapshots of the ANTLR recognizers' ATNs and warmed-up DFA caches.
+
+The generated lexers and parsers deserialize their ATN on import and build their
+DFA caches while parsing, so the first files parsed by a process are slower.
+Snapshots taken after training parses are stored next to the generated modules
+(`<recognizer>.atn`) and restored by :class:`pya2l.aml.ParserWrapper` when a recognizer is imported,
+which is also faster than deserializing the ATN. Snapshots are ignored if the grammar has been
+regenerated or the ANTLR runtime has been upgraded since.
+
+Create new snapshots with::
+
+    python -m pya2l.atnsnapshot [files]
+"""
+
+from glob import glob
+import hashlib
+import importlib
+import io
+import os
+import pickle
+import sys
+
+GRAMMARS = ("a2l", "aml")
+
+FORMAT_VERSION = 1
+RECURSION_LIMIT = 20000     # ATNs are deeply nested object graphs.
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples")
+
+RUNTIMES = ("antlr4-python3-runtime", "antlr4-python2-runtime")
+
+_runtimeVersion = []
+
+def snapshotFile(moduleName):
+    """Snapshots are stored per recognizer, so only the ones in use get loaded.
+    """
+    package, _, name = moduleName.rpartition(".")
+    return os.path.join(os.path.dirname(importlib.import_module(package).__file__), "{0}.atn".format(name))
+
+
+def runtimeVersion():
+    """Version of the installed ANTLR runtime or None if unknown -- pickled ATNs and DFAs depend on its classes.
+    """
+    if not _runtimeVersion:
+        try:
+            from importlib.metadata import version
+        except ImportError:     # Python < 3.8
+            import pkg_resources
+
+            version = lambda name: pkg_resources.get_distribution(name).version
+        result = None
+        for name in RUNTIMES:
+            try:
+                result = version(name)
+                break
+            except Exception:
+                continue
+        _runtimeVersion.append(result)
+    return _runtimeVersion[0]
+
+
+def fingerprint(data):
+    """Hash of a serialized ATN and the ANTLR runtime version.
+    """
+    return hashlib.sha1("{0}\n{1}".format(runtimeVersion(), data).encode("utf-8")).hexdigest()
+
+
+class deepRecursion(object):
+
+    def __enter__(self):
+        self.limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(self.limit, RECURSION_LIMIT))
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        sys.setrecursionlimit(self.limit)
+
+
+def loadSnapshot(moduleName):
+    """
+    Returns
+    -------
+    tuple
+        `(fingerprint, atn, decisionsToDFA)` or None if there is no usable snapshot.
+    """
+    try:
+        with io.open(snapshotFile(moduleName), "rb") as fp, deepRecursion():
+            version, digest, atn, decisionsToDFA = pickle.load(fp)
+    except Exception:
+        return None
+    if version != FORMAT_VERSION:
+        return None
+    return digest, atn, decisionsToDFA
+
+
+def importRecognizer(moduleName):
+    """Import a generated lexer or parser module, restoring ATN and DFA cache of its recognizer class
+    from the snapshot.
+
+    While the module is executed, :class:`antlr4.atn.ATNDeserializer.ATNDeserializer` returns the
+    snapshot's ATN if the serialized ATN of the module is the one the snapshot was taken from;
+    otherwise the module is imported as usual.
+    """
+    if moduleName in sys.modules:
+        return sys.modules[moduleName]
+    snapshot = loadSnapshot(moduleName)
+    if snapshot is None:
+        return importlib.import_module(moduleName)
+    digest, atn, decisionsToDFA = snapshot
+    from antlr4.atn.ATNDeserializer import ATNDeserializer
+
+    deserialize = ATNDeserializer.deserialize
+
+    def restore(self, data):
+        if fingerprint(data) == digest:
+            return atn
+        return deserialize(self, data)
+
+    ATNDeserializer.deserialize = restore
+    try:
+        module = importlib.import_module(moduleName)
+    finally:
+        ATNDeserializer.deserialize = deserialize
+    klass = getattr(module, moduleName.rpartition(".")[2])
+    if klass.atn is atn:
+        klass.decisionsToDFA = decisionsToDFA
+    return module
+
+
+def saveSnapshot(klass):
+    from pya2l.cache import replaceFile
+
+    module = sys.modules[klass.__module__]
+    filename = snapshotFile(klass.__module__)
+    with io.open(filename + ".tmp", "wb") as fp, deepRecursion():
+        pickle.dump((FORMAT_VERSION, fingerprint(module.serializedATN()), klass.atn, klass.decisionsToDFA), fp, protocol = 2)
+    replaceFile(filename + ".tmp", filename)
+    return filename
+
+
+def trainingFiles():
+    return sorted(glob(os.path.join(EXAMPLES_DIR, "*.a2l")) + glob(os.path.join(EXAMPLES_DIR, "*.aml")))
+
+def createSnapshots(filenames = None):
+    """Parse `filenames` (defaults to the bundled examples) and store the state of all recognizers.
+
+    `.aml` files are parsed with the A2ML grammar, everything else with the A2L grammar.
+    Existing snapshots are the starting point, so the DFAs only grow.
+
+    Returns
+    -------
+    list of str
+        Names of the snapshot files.
+    """
+    from pya2l import aml
+    from pya2l.a2lparser import A2LParser
+
+    for name in filenames or trainingFiles():
+        try:
+            if name.lower().endswith(".aml"):
+                aml.ParserWrapper('aml', 'amlFile').parseFromFile(name)
+            else:
+                A2LParser().parseFromFileName(name)
+        except Exception:
+            pass    # Only recognition matters, the DFAs are warmed up anyway.
+    result = []
+    for grammar in GRAMMARS:
+        wrapper = aml.ParserWrapper(grammar, grammar + "File")
+        result.append(saveSnapshot(wrapper.lexerClass))
+        result.append(saveSnapshot(wrapper.parserClass))
+    return result
+
+def main():
+    for filename in createSnapshots(sys.argv[1 : ] or None):
+        print("Wrote {0}.".format(filename))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Persistent cache of parsed A2L files.
+
+Entries are keyed by a hash of the file content; a file whose size and
+modification time didn't change since it was hashed last isn't read again.
+The object model is stored in a neutral form of builtin types and dropped when the
+pyA2L version, :data:`FORMAT_VERSION` or the keyword schema in :mod:`pya2l.classes` changes.
+Instances of :mod:`pya2l.classes` can be pickled (s. `A2LElement.__reduce__`), but entries
+made of builtin types don't depend on how element classes are laid out (e.g. their `__slots__`),
+so their format changes only when :data:`FORMAT_VERSION` is bumped; they are also about a quarter
+smaller, and resolved references may be stored as plain identifiers (`keepReferences`).
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import sys
+
+import six
+
+import pya2l
+from pya2l import classes
+from pya2l.classes import ReferenceObject, ValueObject, ValueType
+from pya2l.database import A2LDatabase
+from pya2l.decoders import ROWS
+from pya2l.logger import Logger
+
+
+##
+## Version of the pickled object model, to be bumped whenever the parser changes what it stores:
+##  1: initial format.
+##  2: variable-length attributes stored as lists (e.g. REF_MEASUREMENT.Identifier),
+##     COMPU_TAB/COMPU_VTAB/COMPU_VTAB_RANGE rows stored as tables.
+##  3: optional keywords allowed multiple times (e.g. SYSTEM_CONSTANT) stored as lists.
+##
+FORMAT_VERSION = 3
+MAGIC = b"A2LC"
+ENTRY_SUFFIX = ".a2lc"
+STAT_DIR = "stat"
+BLOCK_SIZE = 1024 * 1024
+
+replaceFile = getattr(os, "replace", os.rename)   # Python 2.x has no atomic replace.
+
+
+def defaultDirectory():
+    """Cache directory used if none is given, can be set by the `PYA2L_CACHE_DIR` environment variable.
+    """
+    directory = os.environ.get("PYA2L_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pya2l")
+
+
+def schemaFingerprint():
+    """Hash over everything the cached object model depends on.
+    """
+    def name(item):
+        return getattr(item, "__name__", str(item))
+
+    digest = hashlib.sha1()
+    digest.update("{0} {1} {2}".format(pya2l.__version__, FORMAT_VERSION, sys.version_info[0]).encode("ascii"))
+    for keyword in sorted(classes.KeywordType.classDict):
+        klass = classes.KeywordType.classDict[keyword]
+        attrs = [tuple(name(item) for item in attr) for attr in getattr(klass, "attrs", [])]
+        children = [name(child) for child in getattr(klass, "children", [])]
+        digest.update(repr((keyword, getattr(klass, "multiple", None), getattr(klass, "block", None),
+            attrs, children)).encode("ascii")
+        )
+    return digest.hexdigest()[ : 16]
+
+
+def contentHash(filename):
+    digest = hashlib.sha256()
+    with io.open(filename, "rb") as inf:
+        for block in iter(lambda: inf.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Encoder(object):
+    """Convert an :class:`A2LDatabase` into nested builtin types.
+
+    Instances referenced more than once (e.g. from `instList` and from their
+    parent's children) are encoded once and referenced by number afterwards.
+
+    Parameters
+    ----------
+    keepReferences: bool
+        If false, resolved references are stored as plain identifiers.
+    """
+
+    def __init__(self, keepReferences = True):
+        self.memo = {}
+        self.keepReferences = keepReferences
+
+    def encodeDatabase(self, database):
+        return [(self.encode(inst), level) for inst, level in database.instList]
+
+    def encode(self, value):
+        if value is None or isinstance(value, (bool, float) + six.integer_types + six.string_types):
+            return value
+        valueType = type(value)
+        if valueType is ValueObject:
+            return ('V', value.value, int(value.type))
+        elif valueType is ReferenceObject:
+            if not self.keepReferences:
+                return ('V', value.value, int(value.type))
+            return ('X', value.value, int(value.type), self.encode(value.target))
+        elif valueType is list:
+            return [self.encode(item) for item in value]
+        elif valueType is tuple:
+            return ('T', [self.encode(item) for item in value])
+        elif valueType.__name__ in ROWS:
+            return ('N', valueType.__name__, [self.encode(item) for item in value])
+        elif isinstance(value, dict):
+            return ('D', [(key, self.encode(item)) for key, item in value.items()])
+        elif isinstance(value, classes.A2LElement):
+            key = id(value)
+            if key in self.memo:
+                return ('R', self.memo[key])
+            number = len(self.memo)
+            self.memo[key] = number
+            attrs = [(attr, self.encode(getattr(value, attr))) for attr in value.attrs]
+            children = [self.encode(child) for child in value.children]
+            return ('E', number, valueType.__name__, attrs, children)
+        raise TypeError("Can't cache values of type '{0}'.".format(valueType.__name__))
+
+
+class Decoder(object):
+    """Inverse of :class:`Encoder`.
+    """
+
+    def __init__(self):
+        self.memo = {}
+
+    def decodeDatabase(self, data):
+        return A2LDatabase([(self.decode(inst), level) for inst, level in data])
+
+    def decode(self, value):
+        valueType = type(value)
+        if valueType is list:
+            return [self.decode(item) for item in value]
+        elif valueType is not tuple:
+            return value
+        tag = value[0]
+        if tag == 'V':
+            return ValueObject(value[1], ValueType(value[2]))
+        elif tag == 'X':
+            return ReferenceObject(value[1], ValueType(value[2]), self.decode(value[3]))
+        elif tag == 'E':
+            _, number, className, attrs, children = value
+            inst = classes.createInstance(className, ())
+            self.memo[number] = inst
+            for attr, item in attrs:
+                inst.addAttribute(attr, self.decode(item))
+            inst.children = [self.decode(child) for child in children]
+            return inst
+        elif tag == 'R':
+            return self.memo[value[1]]
+        elif tag == 'T':
+            return tuple(self.decode(item) for item in value[1])
+        elif tag == 'D':
+            return dict((key, self.decode(item)) for key, item in value[1])
+        elif tag == 'N':
+            return ROWS[value[1]](*[self.decode(item) for item in value[2]])
+        raise ValueError("Invalid cache entry.")
+
+
+class A2LCache(object):
+    """On-disk cache of parsed A2L files, s. :class:`pya2l.a2lparser.A2LParser`.
+
+    Parameters
+    ----------
+    directory: str
+        Defaults to :func:`defaultDirectory`.
+    maxSize: int
+        Upper bound of the total size of cache entries in bytes; least recently
+        used entries are evicted first.
+    """
+
+    MAX_SIZE = 512 * 1024 * 1024
+
+    def __init__(self, directory = None, maxSize = MAX_SIZE):
+        self.directory = directory or defaultDirectory()
+        self.maxSize = maxSize
+        self.schema = schemaFingerprint()
+        self.filename = self.directory
+        self.lineNo = 0
+        self.logger = Logger(self, 'cache')
+
+    def key(self, filename):
+        """Content hash of `filename`; size and modification time are checked first,
+        so unchanged files are only hashed once.
+        """
+        stat = os.stat(filename)
+        fingerprint = "{0} {1!r}".format(stat.st_size, stat.st_mtime)
+        statFile = os.path.join(self.directory, STAT_DIR,
+            hashlib.sha1(os.path.abspath(filename).encode("utf-8")).hexdigest()
+        )
+        try:
+            with io.open(statFile, encoding = "ascii") as inf:
+                recordedFingerprint, digest = inf.read().rsplit(" ", 1)
+            if recordedFingerprint == fingerprint:
+                return digest
+        except (IOError, OSError, ValueError):
+            pass
+        digest = contentHash(filename)
+        try:
+            self.writeFile(statFile, u"{0} {1}".format(fingerprint, digest).encode("ascii"))
+        except (IOError, OSError) as e:
+            self.warn(filename, "could not record file state: {0}".format(e))
+        return digest
+
+    def entryName(self, key):
+        return os.path.join(self.directory, "{0}-{1}{2}".format(key, self.schema, ENTRY_SUFFIX))
+
+    def get(self, filename):
+        """Return a cached :class:`A2LDatabase` or None.
+        """
+        return self.load(self.key(filename))
+
+    def put(self, filename, database):
+        self.store(self.key(filename), database)
+
+    def load(self, key):
+        entry = self.entryName(key)
+        try:
+            with io.open(entry, "rb") as inf:
+                if inf.read(len(MAGIC)) != MAGIC:
+                    raise ValueError("bad magic")
+                database = Decoder().decodeDatabase(pickle.load(inf))
+        except (IOError, OSError):
+            return None
+        except Exception as e:
+            self.warn(entry, "dropping unreadable cache entry: {0}".format(e))
+            self.remove(entry)
+            return None
+        try:
+            os.utime(entry, None)   # Entries are evicted by modification time.
+        except OSError:
+            pass
+        return database
+
+    def store(self, key, database):
+        entry = self.entryName(key)
+        try:
+            data = Encoder().encodeDatabase(database)
+        except TypeError as e:
+            self.warn(entry, str(e))
+            return
+        try:
+            self.writeFile(entry, MAGIC + pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+        except (IOError, OSError) as e:
+            self.warn(entry, "could not write cache entry: {0}".format(e))
+            return
+        self.prune()
+
+    def entries(self):
+        """List `(mtime, size, path)` of all entries, oldest first.
+        """
+        result = []
+        if not os.path.isdir(self.directory):
+            return result
+        for name in os.listdir(self.directory):
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            result.append((stat.st_mtime, stat.st_size, path))
+        result.sort()
+        return result
+
+    def prune(self):
+        """Remove entries of other schemas and evict least recently used ones down to `maxSize`.
+        """
+        suffix = "-{0}{1}".format(self.schema, ENTRY_SUFFIX)
+        entries = []
+        for entry in self.entries():
+            if entry[2].endswith(suffix):
+                entries.append(entry)
+            else:
+                self.remove(entry[2])
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.maxSize:
+                break
+            self.remove(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self.remove(path)
+        statDir = os.path.join(self.directory, STAT_DIR)
+        if os.path.isdir(statDir):
+            for name in os.listdir(statDir):
+                self.remove(os.path.join(statDir, name))
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def writeFile(self, path, data):
+        """Write atomically, concurrent readers see either the old or the new content.
+        """
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+        tmpName = "{0}.{1}.tmp".format(path, os.getpid())
+        with io.open(tmpName, "wb") as of:
+            of.write(data)
+        replaceFile(tmpName, path)
+
+    def warn(self, filename, message):
+        self.filename = filename
+        self.logger.warn(message)
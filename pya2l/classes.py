@@ -24,6 +24,7 @@ __copyright__="""
 """
 
 from collections import namedtuple
+import enum
 import threading
 import sys
 import six
@@ -72,12 +73,58 @@ class Indexorder(SingletonBase):
     enumValues = ('INDEX_INCR', 'INDEX_DECR')
 
 
+class ValueType(enum.IntEnum):
+
+    INT = 0
+    FLOAT = 2
+    STRING = 3
+    IDENT = 4
+
+
+class ValueObject(object):
+
+    __slots__ = ['_value', '_type']
+
+    def __init__(self, value, typ):
+        self._value = value
+        self._type = typ
+
+    @property
+    def value(self):
+        return self._value
+
+    @property
+    def type(self):
+        return self._type
+
+    def __str__(self):
+        return "<ValueObject: '{}' [{}]>".format(self._value, str(self._type))
+
+    __repr__ = __str__
+
+
+class ReferenceObject(ValueObject):
+    """Identifier resolved to the object it names, s. :mod:`pya2l.references`.
+    """
+
+    __slots__ = ['_target']
+
+    def __init__(self, value, typ, target):
+        super(ReferenceObject, self).__init__(value, typ)
+        self._target = target
+
+    @property
+    def target(self):
+        return self._target
+
+
 CompuPair = namedtuple('CompuPair', 'inVal outVal')
 CompuTriplet = namedtuple('CompuTriplet', 'valMin valMax outVal')
 
 class KeywordType(type):
     classDict = dict()
     classes = set()
+    decoders = dict()   # Keyword ==> :class:`pya2l.decoders.BlockDecoder`, filled on first use.
 
     def __new__(klass, name, bases, namespace):
         newKlass = super(klass, KeywordType).__new__(klass, name, bases, namespace)
@@ -87,15 +134,21 @@ class KeywordType(type):
         attrs = namespace.get('attrs', [])
 
         fixedAttributes = []
+        fixedAttributeTypes = []
         variableAttribute = None
+        variableAttributeType = None
         if attrs:
             fixedAttributes = [attr[1] for attr in attrs if not MULTIPLE in attr]
+            fixedAttributeTypes = [attr[0] for attr in attrs if not MULTIPLE in attr]
             variableAttribute = [attr[1] for attr in attrs if MULTIPLE in attr]
             if variableAttribute:
                 #print("VA: {} ==> {}".format(newKlass.__name__, variableAttribute))
                 variableAttribute = variableAttribute[0]
+                variableAttributeType = [attr[0] for attr in attrs if MULTIPLE in attr][0]
         setattr(newKlass, 'fixedAttributes', fixedAttributes)
+        setattr(newKlass, 'fixedAttributeTypes', fixedAttributeTypes)   # Uint, Float, Ident, ...
         setattr(newKlass, 'variableAttribute', variableAttribute)
+        setattr(newKlass, 'variableAttributeType', variableAttributeType)
         setattr(newKlass, 'attrDict', dict(zip([a[1] for a in attrs], attrs)))
 
         return newKlass
@@ -119,6 +172,7 @@ class Keyword(object):
     textNode = False
     attrs = []
     children = []
+    tableAttribute = None   # Attribute holding the tuples following the fixed attributes, s. :data:`pya2l.decoders.TUPLES`.
 
     @classmethod
     def attributeNames(cls):
@@ -501,10 +555,8 @@ class COMPU_TAB(Keyword):
         (String, "LongIdentifier"),
         (Enum, "ConversionType", ('TAB_INTP', 'TAB_NOINTP')),
         (Uint, "NumberValuePairs"),
-##
-##  TODO: (float InVal float OutVal)* !!!
-##
     ]
+    tableAttribute = "Pairs"    # (float InVal float OutVal)*
 
 
 class COMPU_TAB_REF(Keyword):
@@ -522,10 +574,8 @@ class COMPU_VTAB(Keyword):
         (String, "LongIdentifier"),
         (Enum, "ConversionType", ('TAB_VERB',)),
         (Uint, "NumberValuePairs"),
-##
-##  TODO: (float InVal float OutVal)* !!!
-##
     ]
+    tableAttribute = "Pairs"    # (float InVal string OutVal)*
 
 
 class COMPU_VTAB_RANGE(Keyword):
@@ -536,10 +586,8 @@ class COMPU_VTAB_RANGE(Keyword):
         (Ident, "Name"),
         (String, "LongIdentifier"),
         (Uint, "NumberValueTriples"),
-##
-##  TODO: (float InValMin float InValMax string OutVal)* !!!
-##
     ]
+    tableAttribute = "Triples"  # (float InValMin float InValMax string OutVal)*
 
 
 class CPU_TYPE(Keyword):
@@ -2036,28 +2084,113 @@ KEYWORD_MAP = {
 
 
 class A2LElement(object):
+    """Base of the classes created by :func:`elementClass`.
+
+    Attributes
+    ----------
+    attrs: tuple of str
+        Names of the attributes set, in file order; equal tuples are shared between instances.
+    children: list
+        Instances of nested blocks.
+    """
+
+    __slots__ = ()
 
     def __str__(self):
         result = []
         result.append("%s {" % self.__class__.__name__)
         for attr in self.attrs:
             value = getattr(self, attr)
-            formatStr = '    %s = "%s";' if isinstance(value, str) else "    %s = %s;"
-            result.append(formatStr % (attr, value))
+            if isinstance(value, list) and value and isinstance(value[0], A2LElement):
+                result.append("    %s = [%s];" % (attr, ", ".join(str(item) for item in value)))
+            else:
+                formatStr = '    %s = "%s";' if isinstance(value, str) else "    %s = %s;"
+                result.append(formatStr % (attr, value))
         result.append("}")
 
         return "\n".join(result)
 
+    def addAttribute(self, name, value):
+        setattr(self, name, value)
+        if name not in self.attrs:
+            self.attrs = internAttributes(self.attrs + (name, ))
 
-def instanceFactory(className, **kws):
+    def __reduce__(self):
+        return (restoreInstance, (self.__class__.__name__, [(attr, getattr(self, attr)) for attr in self.attrs],
+            self.children)
+        )
+
+
+ATTRIBUTE_NAMES = {}
+
+def internAttributes(attrs):
+    return ATTRIBUTE_NAMES.setdefault(attrs, attrs)
+
+
+def slotNames(keyword):
+    """Attribute names instances of `keyword` may have.
+    """
+    names = ['attrs', 'children']
+    names.extend(keyword.fixedAttributes)
+    if keyword.variableAttribute:
+        names.append(keyword.variableAttribute)
+    if keyword.tableAttribute:
+        names.append(keyword.tableAttribute)
+        names.append('_lookup')    # s. :func:`pya2l.tables.lookupTable`.
+    names.extend(keyword.children)
+    result = []
+    for name in names:
+        if name not in result:
+            result.append(name)
+    return tuple(result)
+
+
+ELEMENT_CLASSES = {}    # Keyword ==> `__slots__` class, created on first use (not at import time) by elementClass().
+
+def elementClass(className):
+    """Return the :class:`A2LElement` subclass representing `className` instances.
+
+    Classes are created on first use, once per keyword, and use `__slots__`, so instances have no `__dict__`;
+    names not in :data:`KeywordType.classDict` get a class with a `__dict__`.
+    """
+    klass = ELEMENT_CLASSES.get(className)
+    if klass is None:
+        keyword = KeywordType.classDict.get(className)
+        if keyword is not None:
+            slots = slotNames(keyword)
+        else:
+            slots = ('attrs', 'children', '__dict__')
+        klass = ELEMENT_CLASSES[className] = type(str(className), (A2LElement, ), {'__slots__': slots})
+    return klass
+
+
+def createInstance(className, items):
     """Create an instance of a given class.
+
+    Parameters
+    ----------
+    className: str
+    items: sequence of (name, value) tuples
+        Attributes; if a name occurs more than once, the last value wins.
     """
-    klass = type(str(className), (A2LElement, ), {})
-    inst = klass()
-    inst.attrs = []
-    for k, v in kws.items():
-        setattr(inst, k, v)
-        inst.attrs.append(k)
+    inst = elementClass(className)()
+    names = []
+    for name, value in items:
+        setattr(inst, name, value)
+        if name not in names:
+            names.append(name)
+    inst.attrs = internAttributes(tuple(names))
     inst.children = []
     return inst
 
+
+def restoreInstance(className, items, children):
+    inst = createInstance(className, items)
+    inst.children = children
+    return inst
+
+
+def instanceFactory(className, **kws):
+    """Create an instance of a given class.
+    """
+    return createInstance(className, kws.items())
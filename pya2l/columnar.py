@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Columnar (struct-of-arrays) view of MEASUREMENT and CHARACTERISTIC objects.
+
+Requires NumPy (`pip install pya2l[numpy]`).
+"""
+
+import numpy as np
+
+from pya2l.addressindex import objectAddress
+
+
+class StringTable(object):
+    """Interned strings, each distinct string is stored once and referred to by its code.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __getitem__(self, code):
+        return self.strings[code]
+
+    def add(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def code(self, value):
+        """Code of `value` or -1 if not present.
+        """
+        return self.codes.get(value, -1)
+
+
+class Categorical(object):
+    """Column of strings stored as integer codes into a :class:`StringTable`.
+    """
+
+    def __init__(self, values):
+        self.categories = StringTable()
+        self.codes = np.array([-1 if value is None else self.categories.add(value) for value in values], dtype = np.int32)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row):
+        code = self.codes[row]
+        return None if code < 0 else self.categories[code]
+
+    def mask(self, *values):
+        """Boolean mask of the rows equal to one of `values`.
+        """
+        codes = [self.categories.code(value) for value in values]
+        return np.isin(self.codes, [code for code in codes if code >= 0])
+
+
+def plainValue(value, default = None):
+    return default if value is None else getattr(value, "value", value)
+
+
+class ColumnarView(object):
+    """MEASUREMENT or CHARACTERISTIC objects as columns, one row per object in file order.
+
+    Numeric columns are :class:`numpy.ndarray` s, missing values are NaN (floats)
+    or masked by `hasAddress` (addresses).
+
+    Parameters
+    ----------
+    database: :class:`pya2l.database.A2LDatabase`
+    keyword: str
+        "MEASUREMENT" or "CHARACTERISTIC".
+
+    Attributes
+    ----------
+    names: :class:`Categorical`
+        Row `i` is named `names[i]`; names may repeat, e.g. in different MODULEs.
+    address, hasAddress, lowerLimit, upperLimit
+        Common columns.
+    datatype, conversion: :class:`Categorical`
+        The datatype of characteristics is the one of `FNC_VALUES` in their RECORD_LAYOUT.
+    resolution, accuracy
+        Only MEASUREMENT.
+    type, deposit: :class:`Categorical`
+        maxDiff: numeric column, only CHARACTERISTIC.
+    elements: list
+        The objects themselves.
+    """
+
+    KEYWORDS = ("MEASUREMENT", "CHARACTERISTIC")
+
+    def __init__(self, database, keyword):
+        if keyword not in self.KEYWORDS:
+            raise ValueError("Invalid keyword '{0}'.".format(keyword))
+        self.keyword = keyword
+        self.elements = list(database.instances(keyword))
+        self.names = Categorical([plainValue(inst.Name) for inst in self.elements])
+        addresses = [objectAddress(inst) for inst in self.elements]
+        self.hasAddress = np.array([address is not None for address in addresses], dtype = bool)
+        self.address = np.array([address or 0 for address in addresses], dtype = np.uint64)
+        self.lowerLimit = self.floatColumn("LowerLimit")
+        self.upperLimit = self.floatColumn("UpperLimit")
+        self.conversion = Categorical([plainValue(getattr(inst, "Conversion", None)) for inst in self.elements])
+        if keyword == "MEASUREMENT":
+            self.datatype = Categorical([plainValue(inst.Datatype) for inst in self.elements])
+            self.resolution = self.floatColumn("Resolution")
+            self.accuracy = self.floatColumn("Accuracy")
+        else:
+            recordLayouts = database.recordLayouts
+            datatypes = []
+            for inst in self.elements:
+                layout = recordLayouts.get(plainValue(inst.Deposit))
+                fncValues = getattr(layout, "FNC_VALUES", None) if layout is not None else None
+                datatypes.append(plainValue(fncValues.Datatype) if fncValues is not None else None)
+            self.datatype = Categorical(datatypes)
+            self.type = Categorical([plainValue(inst.Type) for inst in self.elements])
+            self.deposit = Categorical([plainValue(inst.Deposit) for inst in self.elements])
+            self.maxDiff = self.floatColumn("MaxDiff")
+
+    def floatColumn(self, attr):
+        return np.array([plainValue(getattr(inst, attr, None), np.nan) for inst in self.elements], dtype = np.float64)
+
+    def __len__(self):
+        return len(self.elements)
+
+    def rows(self, mask):
+        """Row numbers selected by a boolean mask.
+        """
+        return np.flatnonzero(mask)
+
+    def select(self, mask):
+        """Objects selected by a boolean mask.
+        """
+        return [self.elements[row] for row in self.rows(mask)]
+
+    def selectNames(self, mask):
+        return [self.names[row] for row in self.rows(mask)]
@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+"""Conversion of ECU internal (raw) values to physical values and back, as described by COMPU_METHODs.
+
+A COMPU_METHOD is compiled once into a :class:`Conversion`, which converts whole arrays of samples
+with a few NumPy operations; :meth:`pya2l.database.A2LDatabase.conversion` caches them per database.
+
+Requires NumPy (`pip install pya2l[numpy]`).
+"""
+
+import numpy as np
+
+from pya2l.decoders import valueOf
+from pya2l.formula import compileFormula
+from pya2l.tables import lookupTable
+
+TABLE_KEYWORDS = ("COMPU_TAB", "COMPU_VTAB", "COMPU_VTAB_RANGE")
+
+
+class Conversion(object):
+    """Compiled COMPU_METHOD.
+
+    :meth:`toPhysical` and :meth:`toRaw` take scalars or array-likes and return NumPy arrays
+    (or NumPy scalars); calling the conversion is the same as calling :meth:`toPhysical`.
+
+    Parameters
+    ----------
+    name: str
+        Name of the COMPU_METHOD.
+    """
+
+    conversionType = None
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, raw):
+        return self.toPhysical(raw)
+
+    def toPhysical(self, raw):
+        raise NotImplementedError()
+
+    def toRaw(self, physical):
+        """Inverse of :meth:`toPhysical`, e.g. for calibration writes.
+        """
+        raise NotImplementedError()
+
+    def __repr__(self):
+        return "<{0} {1}>".format(self.__class__.__name__, self.name)
+
+
+class Identical(Conversion):
+
+    conversionType = "IDENTICAL"
+
+    def toPhysical(self, raw):
+        return np.asarray(raw)
+
+    def toRaw(self, physical):
+        return np.asarray(physical)
+
+
+class Linear(Conversion):
+    """`physical = a * raw + b`, s. COEFFS_LINEAR.
+    """
+
+    conversionType = "LINEAR"
+
+    def __init__(self, name, a, b):
+        super(Linear, self).__init__(name)
+        self.a = a
+        self.b = b
+
+    def toPhysical(self, raw):
+        result = np.multiply(raw, self.a, dtype = np.float64)
+        result += self.b
+        return result
+
+    def toRaw(self, physical):
+        if self.a == 0:
+            raise ValueError("Conversion '{0}' isn't invertible.".format(self.name))
+        result = np.subtract(physical, self.b, dtype = np.float64)
+        result /= self.a
+        return result
+
+
+class RationalFunction(Conversion):
+    """`raw = (a * physical**2 + b * physical + c) / (d * physical**2 + e * physical + f)`, s. COEFFS.
+
+    Note that the coefficients describe the conversion from physical to raw values;
+    its inverse is unique only if `a` and `d` are zero.
+    """
+
+    conversionType = "RAT_FUNC"
+
+    def __init__(self, name, a, b, c, d, e, f):
+        super(RationalFunction, self).__init__(name)
+        self.coeffs = (a, b, c, d, e, f)
+        self.scale = self.offset = None
+        if a == 0 and d == 0 and e == 0 and b != 0:
+            # physical = (f * raw - c) / b, the usual case.
+            self.scale = float(f) / b
+            self.offset = -float(c) / b
+
+    def toPhysical(self, raw):
+        if self.scale is not None:
+            result = np.multiply(raw, self.scale, dtype = np.float64)
+            if self.offset:
+                result += self.offset
+            return result
+        a, b, c, d, e, f = self.coeffs
+        if a != 0 or d != 0:
+            raise ValueError("Conversion '{0}' has no unique inverse of its quadratic terms.".format(self.name))
+        # physical = (c - f * raw) / (e * raw - b)
+        numerator = np.multiply(raw, -f, dtype = np.float64)
+        numerator += c
+        denominator = np.multiply(raw, e, dtype = np.float64)
+        denominator -= b
+        return numerator / denominator
+
+    def toRaw(self, physical):
+        a, b, c, d, e, f = self.coeffs
+        physical = np.asarray(physical, dtype = np.float64)
+        numerator = (a * physical + b) * physical + c
+        denominator = (d * physical + e) * physical + f
+        return numerator / denominator
+
+
+class InterpolatedTable(Conversion):
+    """TAB_INTP, s. :meth:`pya2l.tables.NumericLookup.interpolate`.
+
+    Parameters
+    ----------
+    name: str
+    lookup: :class:`pya2l.tables.NumericLookup`
+    """
+
+    conversionType = "TAB_INTP"
+
+    def __init__(self, name, lookup):
+        super(InterpolatedTable, self).__init__(name)
+        self.lookup = lookup
+
+    def toPhysical(self, raw):
+        return self.lookup.interpolate(raw)
+
+    def toRaw(self, physical):
+        return self.lookup.inverseInterpolate(physical)
+
+
+class Table(InterpolatedTable):
+    """TAB_NOINTP, s. :meth:`pya2l.tables.NumericLookup.lookup`.
+    """
+
+    conversionType = "TAB_NOINTP"
+
+    def toPhysical(self, raw):
+        return self.lookup.lookup(raw)
+
+    def toRaw(self, physical):
+        return self.lookup.inverseLookup(physical)
+
+
+class VerbalTable(InterpolatedTable):
+    """TAB_VERB: raw values ==> strings, s. :class:`pya2l.tables.VerbalLookup` and
+    :class:`pya2l.tables.VerbalRangeLookup`.
+    """
+
+    conversionType = "TAB_VERB"
+
+    def toPhysical(self, raw):
+        return self.lookup.lookup(raw)
+
+    def toRaw(self, physical):
+        return self.lookup.values(physical)
+
+
+class FormulaConversion(Conversion):
+    """FORM: `physical = formula(raw)`, `raw = inverse(physical)`.
+
+    Parameters
+    ----------
+    formula, inverse: :class:`pya2l.formula.Formula`
+        `inverse` is None without FORMULA_INV.
+    systemConstants: dict
+        Values for `sysc()`.
+    """
+
+    conversionType = "FORM"
+
+    def __init__(self, name, formula, inverse = None, systemConstants = None):
+        super(FormulaConversion, self).__init__(name)
+        self.formula = formula
+        self.inverse = inverse
+        self.systemConstants = systemConstants
+
+    def toPhysical(self, raw):
+        return self.formula(raw, systemConstants = self.systemConstants)
+
+    def toRaw(self, physical):
+        if self.inverse is None:
+            raise ValueError("Conversion '{0}' has no FORMULA_INV.".format(self.name))
+        return self.inverse(physical, systemConstants = self.systemConstants)
+
+
+def coefficients(compuMethod, keyword, names):
+    coeffs = getattr(compuMethod, keyword, None)
+    if coeffs is None:
+        raise ValueError("COMPU_METHOD '{0}' has no {1}.".format(valueOf(compuMethod.Name), keyword))
+    return [float(valueOf(getattr(coeffs, name))) for name in names]
+
+
+def conversionTable(compuMethod, database):
+    """COMPU_TAB, COMPU_VTAB or COMPU_VTAB_RANGE referenced by `compuMethod`.
+    """
+    methodName = valueOf(compuMethod.Name)
+    reference = getattr(compuMethod, "COMPU_TAB_REF", None)
+    if reference is None:
+        raise ValueError("COMPU_METHOD '{0}' has no COMPU_TAB_REF.".format(methodName))
+    table = getattr(reference.ConversionTable, "target", None)
+    name = valueOf(reference.ConversionTable)
+    if table is None and database is not None:
+        for keyword in TABLE_KEYWORDS:
+            table = database.index(keyword).get(name)
+            if table is not None:
+                break
+    if table is None:
+        raise ValueError("Conversion table '{0}' of COMPU_METHOD '{1}' not found.".format(name, methodName))
+    return table
+
+
+def compileIdentical(compuMethod, database):
+    return Identical(valueOf(compuMethod.Name))
+
+
+def compileLinear(compuMethod, database):
+    return Linear(valueOf(compuMethod.Name), *coefficients(compuMethod, "COEFFS_LINEAR", "ab"))
+
+
+def compileRationalFunction(compuMethod, database):
+    return RationalFunction(valueOf(compuMethod.Name), *coefficients(compuMethod, "COEFFS", "abcdef"))
+
+
+def compileFormulaConversion(compuMethod, database):
+    name = valueOf(compuMethod.Name)
+    formula = next((child for child in compuMethod.children if child.__class__.__name__ == "FORMULA"), None)
+    if formula is None:
+        raise ValueError("COMPU_METHOD '{0}' has no FORMULA.".format(name))
+    inverse = getattr(formula, "FORMULA_INV", None)
+    if inverse is not None:
+        inverse = compileFormula(valueOf(inverse.G_x))
+    return FormulaConversion(name, compileFormula(valueOf(formula.F_x)), inverse,
+        database.systemConstants if database is not None else None
+    )
+
+
+def compileTable(compuMethod, database):
+    factory = InterpolatedTable if valueOf(compuMethod.ConversionType) == "TAB_INTP" else Table
+    return factory(valueOf(compuMethod.Name), lookupTable(conversionTable(compuMethod, database)))
+
+
+def compileVerbalTable(compuMethod, database):
+    return VerbalTable(valueOf(compuMethod.Name), lookupTable(conversionTable(compuMethod, database)))
+
+
+##
+## ConversionType ==> function(compuMethod, database) returning a :class:`Conversion`.
+##
+COMPILERS = {
+    "IDENTICAL": compileIdentical,
+    "FORM": compileFormulaConversion,
+    "LINEAR": compileLinear,
+    "RAT_FUNC": compileRationalFunction,
+    "TAB_INTP": compileTable,
+    "TAB_NOINTP": compileTable,
+    "TAB_VERB": compileVerbalTable,
+}
+
+
+def compileConversion(compuMethod, database = None):
+    """Compile a COMPU_METHOD into a :class:`Conversion`.
+
+    Parameters
+    ----------
+    compuMethod: COMPU_METHOD instance
+    database: :class:`pya2l.database.A2LDatabase`
+        Used to look up the conversion table, unless references are resolved.
+
+    Raises
+    ------
+    ValueError
+        The conversion type isn't supported or the COMPU_METHOD is incomplete.
+    """
+    compuMethod = getattr(compuMethod, "element", compuMethod)  # Lazy proxies, e.g. :class:`pya2l.lazy.LazyBlock`.
+    conversionType = valueOf(compuMethod.ConversionType)
+    compiler = COMPILERS.get(conversionType)
+    if compiler is None:
+        raise ValueError("Unsupported conversion type '{0}' of COMPU_METHOD '{1}'.".format(
+            conversionType, valueOf(compuMethod.Name))
+        )
+    return compiler(compuMethod, database)
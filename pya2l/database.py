@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Container for the object model of an A2L file.
+"""
+
+import six
+
+from pya2l.classes import ValueObject
+from pya2l.decoders import valueOf
+
+
+class A2LDatabase(object):
+    """Result of parsing an A2L file.
+
+    Parameters
+    ----------
+    instList: list of (instance, level) tuples
+        :mod:`pya2l.classes` instances in post-order, i.e. nested blocks precede their parents;
+        the first entry is `(None, 0)` if the file contains an `ASAP2_VERSION`.
+    """
+
+    def __init__(self, instList = None):
+        self.instList = instList if instList is not None else []
+        self._indexes = {}
+
+    def index(self, keyword):
+        """Map names of `keyword` instances to the instances.
+
+        Indexes are built on first use and rebuilt if `instList` has grown since.
+        If names aren't unique, the first instance wins.
+        """
+        size = len(self.instList)
+        entry = self._indexes.get(keyword)
+        if entry is None or entry[0] != size:
+            index = {}
+            for inst, _ in self.instList:
+                if inst is not None and inst.__class__.__name__ == keyword:
+                    name = getattr(inst, "Name", None)
+                    if isinstance(name, ValueObject):
+                        name = name.value
+                    if isinstance(name, six.string_types):
+                        index.setdefault(name, inst)
+            entry = self._indexes[keyword] = (size, index)
+        return entry[1]
+
+    @property
+    def addressIndex(self):
+        """:class:`pya2l.addressindex.AddressIndex`, built on first use.
+        """
+        size = len(self.instList)
+        entry = self._indexes.get(None)
+        if entry is None or entry[0] != size:
+            from pya2l.addressindex import AddressIndex
+
+            entry = self._indexes[None] = (size, AddressIndex(self))
+        return entry[1]
+
+    def columns(self, keyword):
+        """:class:`pya2l.columnar.ColumnarView` of "MEASUREMENT" or "CHARACTERISTIC" objects (requires NumPy).
+        """
+        size = len(self.instList)
+        entry = self._indexes.get(("columns", keyword))
+        if entry is None or entry[0] != size:
+            from pya2l.columnar import ColumnarView
+
+            entry = self._indexes[("columns", keyword)] = (size, ColumnarView(self, keyword))
+        return entry[1]
+
+    def instances(self, keyword):
+        """Instances of `keyword` in the order of :attr:`instList`.
+        """
+        for inst, _ in self.instList:
+            if inst is not None and inst.__class__.__name__ == keyword:
+                yield inst
+
+    @property
+    def systemConstants(self):
+        """Map names of the SYSTEM_CONSTANT s in MOD_PAR to their values (strings).
+        """
+        size = len(self.instList)
+        entry = self._indexes.get("systemConstants")
+        if entry is None or entry[0] != size:
+            constants = {}
+            for modPar in self.instances("MOD_PAR"):
+                for constant in getattr(modPar, "SYSTEM_CONSTANT", []):
+                    constants.setdefault(valueOf(constant.Name), valueOf(constant.Value))
+            entry = self._indexes["systemConstants"] = (size, constants)
+        return entry[1]
+
+    def conversion(self, name):
+        """:class:`pya2l.conversion.Conversion` compiled from the COMPU_METHOD `name` (requires NumPy).
+
+        Raises
+        ------
+        KeyError
+            There is no COMPU_METHOD `name`.
+        """
+        size = len(self.instList)
+        entry = self._indexes.get(("conversion", name))
+        if entry is None or entry[0] != size:
+            from pya2l.conversion import compileConversion
+
+            entry = self._indexes[("conversion", name)] = (size, compileConversion(self.compuMethods[name], self))
+        return entry[1]
+
+    @property
+    def layoutPlans(self):
+        """:class:`pya2l.layouts.LayoutPlans` of the RECORD_LAYOUTs (reading records requires NumPy).
+        """
+        size = len(self.instList)
+        entry = self._indexes.get(("layoutPlans", ))
+        if entry is None or entry[0] != size:
+            from pya2l.layouts import LayoutPlans
+
+            entry = self._indexes[("layoutPlans", )] = (size, LayoutPlans(self))
+        return entry[1]
+
+    def resolveReferences(self):
+        """Replace identifiers naming other objects by :class:`pya2l.classes.ReferenceObject` s.
+
+        Returns
+        -------
+        :class:`pya2l.references.CrossReferences`
+            Also available as :attr:`crossReferences`.
+        """
+        from pya2l.references import resolveReferences
+
+        self._indexes["references"] = (len(self.instList), resolveReferences(self))
+        return self._indexes["references"][1]
+
+    @property
+    def crossReferences(self):
+        """:class:`pya2l.references.CrossReferences`, references get resolved on first use.
+        """
+        entry = self._indexes.get("references")
+        if entry is None or entry[0] != len(self.instList):
+            return self.resolveReferences()
+        return entry[1]
+
+    @property
+    def measurements(self):
+        return self.index("MEASUREMENT")
+
+    @property
+    def characteristics(self):
+        return self.index("CHARACTERISTIC")
+
+    @property
+    def axisPts(self):
+        return self.index("AXIS_PTS")
+
+    @property
+    def compuMethods(self):
+        return self.index("COMPU_METHOD")
+
+    @property
+    def recordLayouts(self):
+        return self.index("RECORD_LAYOUT")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Decoders of A2L block content, compiled from the keyword schema in :mod:`pya2l.classes`.
+
+:func:`blockDecoder` turns a keyword class into a :class:`BlockDecoder`: the fixed attributes with the
+value decoders for their types, the optional keywords, and so on. :meth:`BlockDecoder.walker` compiles
+this schema into a closure walking the content of a block of the keyword, which is what
+:meth:`pya2l.a2lparser.BaseWalker.walkBlock` runs -- the fixed attribute list and the dispatch of the
+optional keywords are bound in advance instead of being interpreted per block.
+Decoders are created on first use and cached in :attr:`pya2l.classes.KeywordType.decoders`.
+"""
+
+from collections import namedtuple
+import itertools
+import sys
+
+import six
+
+from pya2l import classes
+from pya2l.classes import ValueObject, ValueType
+from pya2l import tokenizer
+
+CompuTab = namedtuple("CompuTab", "inVal outVal")
+CompuVTab = namedtuple("CompuVTab", "inVal outVal")
+CompuVTabRange = namedtuple("CompuVTabRange", "inValMin inValMax outVal")
+
+# Name ==> factory, used to restore cached tables.
+ROWS = dict((factory.__name__, factory) for factory in (CompuTab, CompuVTab, CompuVTabRange))
+
+if six.PY2:
+    _identifiers = {}
+
+    def intern(text):
+        """Share equal identifiers, `intern()` doesn't take unicode strings on Python 2.x.
+        """
+        return _identifiers.setdefault(text, text)
+else:
+    intern = sys.intern
+
+
+def stripQuotes(text):
+    return text.strip('"')
+
+
+def hexValue(text):
+    return int(text, 16)
+
+
+##
+## Token type ==> decoder of the token text, token types of the ANTLR lexer are the same.
+## (Enum members are bound as defaults, looking them up costs more than creating the ValueObject.)
+##
+OBJECT_VALUES = {
+    tokenizer.IDENT: lambda x, typ = ValueType.IDENT: ValueObject(intern(x), typ),
+    tokenizer.STRING: lambda x, typ = ValueType.STRING: ValueObject(x.strip('"'), typ),
+    tokenizer.INT: lambda x, typ = ValueType.INT: ValueObject(int(x), typ),
+    tokenizer.HEX: lambda x, typ = ValueType.INT: ValueObject(int(x, 16), typ),
+    tokenizer.FLOAT: lambda x, typ = ValueType.FLOAT: ValueObject(float(x), typ),
+}
+
+PLAIN_VALUES = {
+    tokenizer.IDENT: intern,
+    tokenizer.STRING: stripQuotes,
+    tokenizer.INT: int,
+    tokenizer.HEX: hexValue,
+    tokenizer.FLOAT: float,
+}
+
+##
+## Attribute type (s. `attrs` in :mod:`pya2l.classes`) ==> decoders of plain values, if different from PLAIN_VALUES.
+##
+FLOAT_VALUES = dict(PLAIN_VALUES)
+FLOAT_VALUES.update({
+    tokenizer.INT: float,
+    tokenizer.HEX: lambda x: float(int(x, 16)),
+})
+
+TYPED_PLAIN_VALUES = {
+    classes.Float: FLOAT_VALUES,
+}
+
+
+def valueOf(value):
+    """Python value of an attribute, whether decoded as :class:`pya2l.classes.ValueObject` or not.
+    """
+    return value.value if isinstance(value, ValueObject) else value
+
+##
+## Keywords whose content ends with tuples: keyword ==> (attribute holding their number, tuple size, factory).
+## The tuples are stored as list in the `tableAttribute` of the keyword class.
+##
+TUPLES = {
+    "COMPU_TAB": ("NumberValuePairs", 2, CompuTab),
+    "COMPU_VTAB": ("NumberValuePairs", 2, CompuVTab),
+    "COMPU_VTAB_RANGE": ("NumberValueTriples", 3, CompuVTabRange),
+}
+
+
+class BlockDecoder(object):
+    """Schema of a keyword, prepared for walking.
+
+    Decoder tables are pairs, indexed by :attr:`pya2l.a2lparser.BaseWalker.plainValues`:
+    the first one decodes to :class:`pya2l.classes.ValueObject` s, the second to plain values.
+
+    Attributes
+    ----------
+    keyword: str
+    arity: int
+        Number of fixed attributes.
+    fixedAttributes: tuple of str
+    fixedTables: pair of tuples
+        Token type ==> decoder dicts, one per fixed attribute.
+    children: frozenset
+        Optional keywords.
+    multipleChildren: frozenset
+        Optional keywords that may occur more than once, their values are collected in lists.
+    variableAttribute: str or None
+        Attribute taking the rest of the values.
+    variableTables: pair
+        Token type ==> decoder dicts for :attr:`variableAttribute`.
+    tuples: tuple or None
+        s. :data:`TUPLES`.
+    tableAttribute: str or None
+        Attribute taking the :attr:`tuples`.
+    """
+
+    __slots__ = ['keyword', 'arity', 'fixedAttributes', 'fixedTables', 'children', 'multipleChildren', 'variableAttribute',
+        'variableTables', 'tuples', 'tableAttribute', 'walkers'
+    ]
+
+    def __init__(self, keyword):
+        klass = classes.KEYWORD_MAP[keyword]
+        types = klass.fixedAttributeTypes
+        self.keyword = keyword
+        self.arity = len(klass.fixedAttributes)
+        self.fixedAttributes = tuple(klass.fixedAttributes)
+        self.fixedTables = (
+            tuple(OBJECT_VALUES for _ in types),
+            tuple(TYPED_PLAIN_VALUES.get(attrType, PLAIN_VALUES) for attrType in types),
+        )
+        self.children = frozenset(klass.children)
+        self.multipleChildren = frozenset(name for name in klass.children
+            if classes.KEYWORD_MAP[name].multiple and not classes.KEYWORD_MAP[name].block
+        )
+        self.variableAttribute = klass.variableAttribute
+        self.variableTables = (OBJECT_VALUES, TYPED_PLAIN_VALUES.get(klass.variableAttributeType, PLAIN_VALUES))
+        self.tuples = TUPLES.get(keyword)
+        self.tableAttribute = klass.tableAttribute
+        self.walkers = [None, None]
+
+    def __repr__(self):
+        return "<BlockDecoder {0}>".format(self.keyword)
+
+    def walker(self, plainValues):
+        """Function `walk(walker, children, level)` creating the instance of a block from its content,
+        s. :func:`compileWalker`; compiled on first use.
+        """
+        walk = self.walkers[plainValues]
+        if walk is None:
+            walk = self.walkers[plainValues] = compileWalker(self, plainValues)
+        return walk
+
+
+def compileOptions(decoder, plainValues):
+    """Optional keyword ==> `(keyword, fields, multiple)`; `fields` are `(attribute, decoder table)` pairs.
+    """
+    result = {}
+    for name in decoder.children:
+        option = optionDecoder(name, name == decoder.keyword)
+        fields = tuple(zip(option.fixedAttributes, option.fixedTables[plainValues]))
+        result[name] = (option.keyword, fields, name in decoder.multipleChildren)
+    return result
+
+
+def compileRest(decoder, plainValues):
+    """Function `rest(walker, child, children, args)` consuming values following the fixed attributes
+    (variable attribute or tuples), None if there are none.
+    """
+    if decoder.variableAttribute:
+        attribute = decoder.variableAttribute
+        table = decoder.variableTables[plainValues]
+
+        def variableValues(walker, child, children, args):
+            tokens = map(walker.valueToken, itertools.chain((child, ), children))
+            args.append((attribute, [table[token.type](token.text) for token in tokens]))
+        return variableValues
+    if decoder.tuples is not None:
+        countAttribute, size, factory = decoder.tuples
+        attribute = decoder.tableAttribute
+
+        def tuples(walker, child, children, args):
+            count = [valueOf(value) for name, value in args if name == countAttribute][0]
+            args.append((attribute, walker.fetchTuples(count, size, factory, children, walker.getValue(child))))
+        return tuples
+    return None
+
+
+def compileWalker(decoder, plainValues):
+    """Compile the schema of a keyword into a closure walking the content of its blocks.
+
+    Parameters
+    ----------
+    decoder: :class:`BlockDecoder`
+    plainValues: bool
+        s. :attr:`pya2l.a2lparser.BaseWalker.plainValues`.
+
+    Returns
+    -------
+    function
+        `walk(walker, children, level)`, s. :meth:`pya2l.a2lparser.BaseWalker.walkBlock`; `children`
+        is an iterator over the content of the block, inspected by the methods of `walker`.
+    """
+    from pya2l.a2lparser import Splice     # a2lparser imports this module.
+
+    keyword = decoder.keyword
+    fixed = tuple(zip(decoder.fixedAttributes, decoder.fixedTables[plainValues]))
+    options = compileOptions(decoder, plainValues)
+    rest = compileRest(decoder, plainValues)
+    createInstance = classes.createInstance
+
+    def walk(walker, children, level):
+        level += 1
+        isPrimitiveTypeOrIdent = walker.isPrimitiveTypeOrIdent
+        valueToken = walker.valueToken
+        args = []
+        for attribute, table in fixed:
+            child = next(children, None)
+            if child is None:
+                break
+            if isPrimitiveTypeOrIdent(child):
+                token = valueToken(child)
+                args.append((attribute, table[token.type](token.text)))
+            else:
+                print("att error" + walker.getText(child))
+        optArgs = []
+        multiples = None
+        blockChildren = []
+        isBlock = walker.isBlock
+        for child in children:
+            if isBlock(child):
+                inst = walker.enterBlock(child, level)
+                if inst is not None:
+                    walker.instList.append((inst, level))
+                    blockChildren.append(inst)
+            elif child.__class__ is Splice:
+                instList, insts = child.result()
+                walker.instList.extend(instList)
+                blockChildren.extend(insts)
+            else:
+                param = walker.getText(child)
+                option = options.get(param)
+                if option is not None:
+                    optionKeyword, fields, multiple = option
+                    optionArgs = []
+                    for attribute, table in fields:
+                        value = next(children)
+                        if isPrimitiveTypeOrIdent(value):
+                            token = valueToken(value)
+                            optionArgs.append((attribute, table[token.type](token.text)))
+                        else:
+                            print("error")
+                    value = createInstance(optionKeyword, optionArgs)
+                    if multiple:
+                        if multiples is None:
+                            multiples = {}
+                        values = multiples.get(param)
+                        if values is None:
+                            values = multiples[param] = []
+                            optArgs.append((param, values))
+                        values.append(value)
+                    else:
+                        optArgs.append((param, value))
+                elif rest is not None:
+                    rest(walker, child, children, args)
+                else:
+                    print("Error:      *", param)
+        inst = createInstance(keyword, args + optArgs)
+        inst.children.extend(blockChildren)
+        return inst
+
+    walk.__name__ = str("walk_" + keyword)
+    return walk
+
+
+def blockDecoder(keyword):
+    """The cached :class:`BlockDecoder` of `keyword`.
+
+    Raises
+    ------
+    KeyError
+        `keyword` is unknown.
+    """
+    decoder = classes.KeywordType.decoders.get(keyword)
+    if decoder is None:
+        decoder = classes.KeywordType.decoders[keyword] = BlockDecoder(keyword)
+    return decoder
+
+
+def optionDecoder(keyword, isTag):
+    """:class:`BlockDecoder` of an optional `keyword` in a block's content.
+
+    Some keywords have a different signature when used as attribute, e.g. `RASTER` and `RASTERAttr`;
+    `isTag` is true if `keyword` is also the name of the enclosing block.
+    """
+    if not isTag and keyword + "Attr" in classes.KEYWORD_MAP:
+        keyword += "Attr"
+    return blockDecoder(keyword)
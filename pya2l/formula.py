@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+"""Compiler for the formulas of COMPU_METHODs (FORMULA, FORMULA_INV).
+
+Formulas are parsed into a tree of closures over NumPy ufuncs -- nothing is passed to `eval()` --
+so a compiled :class:`Formula` evaluates whole arrays at once. Supported are
+
+    - the input values `X1` .. `Xn` (`X` is the same as `X1`),
+    - decimal and hexadecimal numbers,
+    - the operators `+ - * /`, `& | ^ ~ << >>` (on integers), `< <= > >= == !=` and `&& || !`,
+    - the functions in :data:`FUNCTIONS`,
+    - `sysc(name)`, the value of the system constant `name`, s. `SYSTEM_CONSTANT` in `MOD_PAR`.
+
+:func:`compileFormula` caches formulas by their text.
+
+Requires NumPy (`pip install pya2l[numpy]`).
+"""
+
+import re
+
+import numpy as np
+import six
+
+
+class FormulaSyntaxError(ValueError):
+    pass
+
+
+def integers(value):
+    return np.asarray(value).astype(np.int64)
+
+
+def bitwise(function):
+    return lambda left, right: function(integers(left), integers(right))
+
+
+FUNCTIONS = {
+    "abs": np.abs, "acos": np.arccos, "asin": np.arcsin, "atan": np.arctan, "ceil": np.ceil,
+    "cos": np.cos, "cosh": np.cosh, "exp": np.exp, "floor": np.floor, "log": np.log, "log10": np.log10,
+    "pow": np.power, "sin": np.sin, "sinh": np.sinh, "sqrt": np.sqrt, "tan": np.tan, "tanh": np.tanh,
+}
+
+##
+## Operator ==> (precedence, function); higher precedences bind tighter, all operators are left-associative.
+##
+BINARY_OPERATORS = {
+    "||": (1, np.logical_or),
+    "&&": (2, np.logical_and),
+    "|": (3, bitwise(np.bitwise_or)),
+    "^": (4, bitwise(np.bitwise_xor)),
+    "&": (5, bitwise(np.bitwise_and)),
+    "==": (6, np.equal), "!=": (6, np.not_equal),
+    "<": (7, np.less), "<=": (7, np.less_equal), ">": (7, np.greater), ">=": (7, np.greater_equal),
+    "<<": (8, bitwise(np.left_shift)), ">>": (8, bitwise(np.right_shift)),
+    "+": (9, np.add), "-": (9, np.subtract),
+    "*": (10, np.multiply), "/": (10, np.true_divide),
+}
+
+UNARY_OPERATORS = {
+    "-": np.negative,
+    "+": np.positive,
+    "!": np.logical_not,
+    "~": lambda value: np.invert(integers(value)),
+}
+
+TOKENS = re.compile(r"""\s*(?:
+    (?P<number>0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+    |(?P<name>[A-Za-z_][A-Za-z0-9_.\[\]]*)
+    |(?P<string>"[^"]*")
+    |(?P<operator>\|\||&&|<<|>>|<=|>=|==|!=|[-+*/&|^~!<>(),])
+    )""", re.VERBOSE
+)
+
+VARIABLE = re.compile(r"[Xx](\d*)$")
+
+
+class Constant(object):
+    """Folded subexpression.
+    """
+
+    __slots__ = ['value']
+
+    def __init__(self, value):
+        self.value = value
+
+
+def apply(function, operands):
+    """Closure applying `function` to the values of `operands` or a :class:`Constant` if all of them are constant.
+    """
+    if all(isinstance(operand, Constant) for operand in operands):
+        return Constant(function(*[operand.value for operand in operands]))
+    if len(operands) == 1:
+        (operand, ) = operands
+        return lambda args, constants: function(operand(args, constants))
+    elif len(operands) == 2:
+        left, right = operands
+        if isinstance(left, Constant):
+            value = left.value
+            return lambda args, constants: function(value, right(args, constants))
+        elif isinstance(right, Constant):
+            value = right.value
+            return lambda args, constants: function(left(args, constants), value)
+        return lambda args, constants: function(left(args, constants), right(args, constants))
+    operands = [(lambda args, constants, value = operand.value: value) if isinstance(operand, Constant) else operand
+        for operand in operands
+    ]
+    return lambda args, constants: function(*[operand(args, constants) for operand in operands])
+
+
+def systemConstant(constants, name):
+    if constants is None or name not in constants:
+        raise ValueError("Unknown system constant '{0}'.".format(name))
+    value = constants[name]
+    return float(value) if isinstance(value, six.string_types) else value
+
+
+class Parser(object):
+    """Recursive descent parser, the result of each rule is a closure `(args, constants) ==> value`
+    or a :class:`Constant`.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = self.tokenize(text)
+        self.position = 0
+        self.arity = 0
+        self.systemConstants = set()
+
+    def tokenize(self, text):
+        tokens = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = TOKENS.match(text, position)
+            if match is None or match.end() == position:
+                raise FormulaSyntaxError("Invalid character at {0} in formula '{1}'.".format(position, text))
+            tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+        return tokens
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            self.error("unexpected end")
+        self.position += 1
+        return token
+
+    def expect(self, operator):
+        kind, value = self.next()
+        if kind != "operator" or value != operator:
+            self.error("'{0}' expected, got '{1}'".format(operator, value))
+
+    def error(self, message):
+        raise FormulaSyntaxError("Formula '{0}': {1}.".format(self.text, message))
+
+    def parse(self):
+        result = self.expression(1)
+        if self.peek()[0] is not None:
+            self.error("unexpected '{0}'".format(self.peek()[1]))
+        return result
+
+    def expression(self, minPrecedence):
+        left = self.unary()
+        while True:
+            kind, value = self.peek()
+            if kind != "operator" or value not in BINARY_OPERATORS:
+                return left
+            precedence, function = BINARY_OPERATORS[value]
+            if precedence < minPrecedence:
+                return left
+            self.next()
+            left = apply(function, (left, self.expression(precedence + 1)))
+
+    def unary(self):
+        kind, value = self.peek()
+        if kind == "operator" and value in UNARY_OPERATORS:
+            self.next()
+            return apply(UNARY_OPERATORS[value], (self.unary(), ))
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.next()
+        if kind == "number":
+            return Constant(int(value, 16) if value[ : 2] in ("0x", "0X") else float(value))
+        elif kind == "operator" and value == "(":
+            result = self.expression(1)
+            self.expect(")")
+            return result
+        elif kind == "name":
+            if self.peek() == ("operator", "("):
+                return self.call(value)
+            match = VARIABLE.match(value)
+            if match is None:
+                self.error("unknown name '{0}'".format(value))
+            number = int(match.group(1) or 1)
+            if number < 1:
+                self.error("invalid input value '{0}'".format(value))
+            self.arity = max(self.arity, number)
+            index = number - 1
+            return lambda args, constants: args[index]
+        self.error("unexpected '{0}'".format(value))
+
+    def call(self, name):
+        self.expect("(")
+        if name == "sysc":
+            kind, value = self.next()
+            if kind not in ("name", "string"):
+                self.error("system constant name expected")
+            constant = value.strip('"')
+            self.expect(")")
+            self.systemConstants.add(constant)
+            return lambda args, constants: systemConstant(constants, constant)
+        function = FUNCTIONS.get(name)
+        if function is None:
+            self.error("unknown function '{0}'".format(name))
+        arguments = [self.expression(1)]
+        while self.peek() == ("operator", ","):
+            self.next()
+            arguments.append(self.expression(1))
+        self.expect(")")
+        return apply(function, arguments)
+
+
+class Formula(object):
+    """Compiled formula, s. :func:`compileFormula`.
+
+    Attributes
+    ----------
+    text: str
+    arity: int
+        Number of input values, i.e. the highest `n` of `Xn`.
+    systemConstants: frozenset
+        Names of the system constants used.
+    """
+
+    def __init__(self, text):
+        parser = Parser(text)
+        self.function = parser.parse()
+        self.text = text
+        self.arity = parser.arity
+        self.systemConstants = frozenset(parser.systemConstants)
+
+    def __call__(self, *args, **kws):
+        """Evaluate the formula for the input values `args` (scalars or arrays).
+
+        Parameters
+        ----------
+        systemConstants: dict
+            Name ==> value, s. :attr:`pya2l.database.A2LDatabase.systemConstants`.
+        """
+        if len(args) < self.arity:
+            raise ValueError("Formula '{0}' takes {1} input values.".format(self.text, self.arity))
+        constants = kws.get("systemConstants")
+        if isinstance(self.function, Constant):
+            shape = np.shape(args[0]) if args else ()
+            return np.full(shape, self.function.value, dtype = np.float64)
+        return self.function([np.asarray(arg) for arg in args], constants)
+
+    def __repr__(self):
+        return "<Formula '{0}'>".format(self.text)
+
+
+FORMULAS = {}   # Text ==> :class:`Formula`.
+
+def compileFormula(text):
+    """Compile `text` into a :class:`Formula`; formulas are cached, each text is compiled once.
+
+    Raises
+    ------
+    FormulaSyntaxError
+    """
+    formula = FORMULAS.get(text)
+    if formula is None:
+        formula = FORMULAS.setdefault(text, Formula(text))
+    return formula
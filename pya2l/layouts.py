@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+"""Compiled RECORD_LAYOUTs.
+
+The memory layout of a CHARACTERISTIC or AXIS_PTS object is described by its RECORD_LAYOUT:
+components (FNC_VALUES, AXIS_PTS_X, NO_AXIS_PTS_X, RESERVED, ...) are deposited in the order of
+their positions, each one aligned as given by ALIGNMENT_xxx (of the RECORD_LAYOUT, then of MOD_COMMON).
+A :class:`LayoutPlan` is this layout resolved for given numbers of axis points: offset, datatype and
+number of values of each component, as NumPy structured dtype. :class:`LayoutPlans` memoizes
+plans per layout and dimensions, so objects sharing a RECORD_LAYOUT are laid out once.
+
+Reading records requires NumPy (`pip install pya2l[numpy]`), compiling plans, e.g. for their sizes, doesn't.
+"""
+
+from collections import namedtuple
+
+try:
+    from math import gcd
+except ImportError:     # Python 2.x
+    from fractions import gcd
+
+from pya2l.addressindex import AXES, AXIS_COMPONENT, DATATYPE_SIZES
+from pya2l.decoders import valueOf
+
+DTYPES = {
+    "UBYTE": "u1", "SBYTE": "i1",
+    "UWORD": "u2", "SWORD": "i2",
+    "ULONG": "u4", "SLONG": "i4",
+    "A_UINT64": "u8", "A_INT64": "i8",
+    "FLOAT32_IEEE": "f4", "FLOAT64_IEEE": "f8",
+}
+
+DATASIZE_TYPES = {"BYTE": "UBYTE", "WORD": "UWORD", "LONG": "ULONG"}
+
+ALIGNMENTS = {
+    "UBYTE": "ALIGNMENT_BYTE", "SBYTE": "ALIGNMENT_BYTE",
+    "UWORD": "ALIGNMENT_WORD", "SWORD": "ALIGNMENT_WORD",
+    "ULONG": "ALIGNMENT_LONG", "SLONG": "ALIGNMENT_LONG",
+    "A_UINT64": "ALIGNMENT_INT64", "A_INT64": "ALIGNMENT_INT64",
+    "FLOAT32_IEEE": "ALIGNMENT_FLOAT32_IEEE", "FLOAT64_IEEE": "ALIGNMENT_FLOAT64_IEEE",
+}
+
+DEFAULT_ALIGNMENTS = {
+    "ALIGNMENT_BYTE": 1, "ALIGNMENT_WORD": 2, "ALIGNMENT_LONG": 4, "ALIGNMENT_INT64": 8,
+    "ALIGNMENT_FLOAT32_IEEE": 4, "ALIGNMENT_FLOAT64_IEEE": 8,
+}
+
+##
+## FNC_VALUES index mode ==> NumPy order of the value array, whose shape is (X, Y, ...) points.
+##
+INDEX_ORDERS = {"COLUMN_DIR": "C", "ROW_DIR": "F"}
+
+##
+## Position-ordered component of a RECORD_LAYOUT, `index` is the axis index (-1 for non-axis components).
+##
+Component = namedtuple("Component", "name kind index datatype size alignment element")
+
+##
+## RECORD_LAYOUT resolved independently of dimensions, `period` is the common multiple of all alignments.
+##
+Layout = namedtuple("Layout", "name components static fixedPoints indexMode order period")
+
+
+def align(address, alignment):
+    return -(-address // alignment) * alignment
+
+
+def alignments(inst, defaults):
+    """ALIGNMENT_xxx of MOD_COMMON or a RECORD_LAYOUT, missing ones are taken from `defaults`.
+    """
+    result = dict(defaults)
+    for keyword in DEFAULT_ALIGNMENTS:
+        alignment = getattr(inst, keyword, None)
+        if alignment is not None:
+            result[keyword] = valueOf(alignment.AlignmentBorder) or 1
+    return result
+
+
+def componentDatatype(component):
+    if hasattr(component, "Datatype"):
+        return valueOf(component.Datatype)
+    return DATASIZE_TYPES[valueOf(component.DataSize)]
+
+
+def layoutComponents(layout):
+    """Components of a RECORD_LAYOUT having a position, as `(position, name, component)` in position order.
+    """
+    result = []
+    for name in layout.attrs:
+        value = getattr(layout, name)
+        for component in value if isinstance(value, list) else (value, ):   # RESERVED may repeat.
+            position = getattr(component, "Position", None)
+            if position is not None:
+                result.append((valueOf(position), name, component))
+    result.sort(key = lambda item: item[0])
+    return result
+
+
+def product(values):
+    result = 1
+    for value in values:
+        result *= value
+    return result
+
+
+def resolveLayout(layout, defaults):
+    """Resolve components, alignments and static properties of a RECORD_LAYOUT.
+
+    Parameters
+    ----------
+    layout: RECORD_LAYOUT object
+    defaults: dict
+        Alignments of MOD_COMMON, s. :func:`alignments`.
+
+    Returns
+    -------
+    :class:`Layout`
+    """
+    layoutAlignments = alignments(layout, defaults)
+    components = []
+    indexMode = None
+    period = 1
+    for position, name, element in layoutComponents(layout):
+        datatype = componentDatatype(element)
+        alignment = layoutAlignments[ALIGNMENTS[datatype]]
+        period = period * alignment // gcd(period, alignment)
+        match = AXIS_COMPONENT.match(name)
+        kind, index = (match.group("component"), AXES.find(match.group("axis"))) if match else (name, -1)
+        if kind == "FNC_VALUES":
+            indexMode = valueOf(element.IndexMode)
+        components.append(Component(name, kind, index, datatype, DATATYPE_SIZES[datatype], alignment, element))
+    fixedPoints = {}
+    for index, axis in enumerate(AXES):
+        fixed = getattr(layout, "FIX_NO_AXIS_PTS_{0}".format(axis), None)
+        if fixed is not None:
+            fixedPoints[index] = valueOf(fixed.NumberOfAxisPoints)
+    static = getattr(layout, "STATIC_RECORD_LAYOUT", None) is not None
+    order = INDEX_ORDERS.get(indexMode, "C" if indexMode is None else None)
+    return Layout(valueOf(layout.Name), components, static, fixedPoints, indexMode, order, period)
+
+
+class LayoutPlan(object):
+    """Memory map of a record for given numbers of axis points.
+
+    Attributes
+    ----------
+    name: str
+        Name of the RECORD_LAYOUT.
+    maxPoints: tuple of int
+        Number of axis points memory is reserved for.
+    points: tuple of int
+        Actual number of axis points.
+    count: int
+        Number of values per axis point, e.g. of VAL_BLKs.
+    order: str
+        NumPy order of FNC_VALUES, None if their index mode isn't supported (records can't be read then).
+    offsets: dict
+        Component name ==> offset relative to the start of the record, for all components.
+    fields: list of `(name, offset, datatype, shape)`
+        Decoded components: FNC_VALUES (`shape` as stored, i.e. in NumPy `order`), AXIS_PTS_xxx and NO_AXIS_PTS_xxx.
+    counted: list of int
+        Indexes of axes whose actual number of points is given by NO_AXIS_PTS_xxx, in position order.
+    countFields: dict
+        Axis index ==> `(name, offset, datatype)` of its NO_AXIS_PTS_xxx.
+    dependencies: dict
+        Axis index ==> indexes of the axes whose numbers of points the offset of its NO_AXIS_PTS_xxx depends on.
+    decreasing: tuple of int
+        Indexes of axes deposited with INDEX_DECR.
+    size: int
+        Size of the record in bytes.
+    """
+
+    def __init__(self, layout, maxPoints, points, count, phase):
+        self.name = layout.name
+        self.maxPoints = maxPoints
+        self.points = points
+        self.count = count
+        self.order = layout.order
+        self.indexMode = layout.indexMode
+        self.offsets = {}
+        self.fields = []
+        self.counted = []
+        self.countFields = {}
+        self.dependencies = {}
+        decreasing = []
+        dimensions = len(points)
+        variable = set()    # Axes the sizes of the components so far depend on.
+        address = phase
+        for component in layout.components:
+            address = align(address, component.alignment)
+            offset = address - phase
+            self.offsets[component.name] = offset
+            kind, index = component.kind, component.index
+            if kind == "FNC_VALUES":
+                shape = list(maxPoints if layout.static else points) + ([count] if count > 1 or not points else [])
+                stored = product(shape)
+                self.fields.append((component.name, offset, component.datatype, tuple(shape)))
+                if not layout.static:
+                    variable.update(range(dimensions))
+            elif kind == "AXIS_PTS" and 0 <= index < dimensions:
+                stored = maxPoints[index] if layout.static else points[index]
+                self.fields.append((component.name, offset, component.datatype, (points[index], )))
+                if valueOf(component.element.IndexIncr) == "INDEX_DECR":
+                    decreasing.append(index)
+                if not layout.static:
+                    variable.add(index)
+            elif kind == "NO_AXIS_PTS" and 0 <= index < dimensions:
+                stored = 1
+                self.fields.append((component.name, offset, component.datatype, (1, )))
+                self.counted.append(index)
+                self.countFields[index] = (component.name, offset, component.datatype)
+                self.dependencies[index] = frozenset(variable)
+            elif kind == "AXIS_PTS":
+                stored = 0  # Axis the object doesn't have.
+            elif kind == "AXIS_RESCALE":
+                stored = 2 * valueOf(component.element.MaxNumberOfRescalePairs)
+            else:
+                stored = 1  # Not decoded, e.g. RESERVED, SRC_ADDR_xxx, IDENTIFICATION.
+            address += stored * component.size
+        self.decreasing = tuple(decreasing)
+        self.size = address - phase
+        self._dtypes = {}
+
+    def dtype(self, byteOrder):
+        """NumPy structured dtype of the record, decoded components being fields.
+
+        Parameters
+        ----------
+        byteOrder: str
+            "<" or ">".
+        """
+        result = self._dtypes.get(byteOrder)
+        if result is None:
+            import numpy as np
+
+            if self.order is None:
+                raise ValueError("FNC_VALUES index mode {0} isn't supported.".format(self.indexMode))
+            names, formats, offsets = [], [], []
+            for name, offset, datatype, shape in self.fields:
+                if name == "FNC_VALUES" and self.order == "F":
+                    shape = shape[ : : -1]
+                names.append(name)
+                formats.append((byteOrder + DTYPES[datatype], shape))
+                offsets.append(offset)
+            result = self._dtypes[byteOrder] = np.dtype({
+                "names": names, "formats": formats, "offsets": offsets, "itemsize": max(self.size, 1)
+            })
+        return result
+
+    def record(self, buffer, offset, byteOrder):
+        """Decoded components of the record at `offset` of `buffer`, as views of it.
+
+        Returns
+        -------
+        dict
+            Component name ==> array. FNC_VALUES have shape `(X, Y, ...)` points (plus values per point).
+            Axes deposited with INDEX_DECR are reversed, along with the FNC_VALUES.
+        """
+        import numpy as np
+
+        record = np.frombuffer(buffer, self.dtype(byteOrder), 1, offset)[0]
+        result = {}
+        for name, _, _, _ in self.fields:
+            values = record[name]
+            if name == "FNC_VALUES":
+                if self.order == "F":
+                    values = values.T
+                if self.points and self.points != self.maxPoints:
+                    values = values[tuple(slice(0, number) for number in self.points)]
+                if self.decreasing:
+                    values = np.flip(values, self.decreasing)
+            elif self.decreasing and name.startswith("AXIS_PTS_") and AXES.find(name[-1]) in self.decreasing:
+                values = values[ : : -1]
+            result[name] = values
+        return result
+
+
+class LayoutPlans(object):
+    """Memoized :class:`LayoutPlan` s of the RECORD_LAYOUTs of a database.
+
+    Parameters
+    ----------
+    database: :class:`pya2l.database.A2LDatabase`
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self.alignments = alignments(next(database.instances("MOD_COMMON"), None), DEFAULT_ALIGNMENTS)
+        self.layouts = {}
+        self.plans = {}
+
+    def layout(self, name):
+        """:class:`Layout` of the RECORD_LAYOUT `name`.
+
+        Raises
+        ------
+        KeyError
+            There is no RECORD_LAYOUT `name`.
+        """
+        result = self.layouts.get(name)
+        if result is None:
+            result = self.layouts[name] = resolveLayout(self.database.recordLayouts[name], self.alignments)
+        return result
+
+    def plan(self, name, address, maxPoints, count = 1, points = None):
+        """:class:`LayoutPlan` of the record of RECORD_LAYOUT `name` at `address`.
+
+        Alignments depend on `address` only modulo :attr:`Layout.period`, so plans are shared
+        by all records of equal dimensions.
+
+        Parameters
+        ----------
+        maxPoints: sequence of int
+            Number of axis points memory is reserved for (MaxAxisPoints of the axes).
+        count: int
+            Number of values per axis point, e.g. of VAL_BLKs.
+        points: sequence of int
+            Actual number of axis points, `maxPoints` by default. If the plan is `counted`, read the
+            NO_AXIS_PTS_xxx in position order, getting the plan for the numbers known so far
+            after each one -- offsets of later components may depend on them.
+        """
+        layout = self.layout(name)
+        maxPoints = tuple(layout.fixedPoints.get(index, number) for index, number in enumerate(maxPoints))
+        points = maxPoints if points is None else tuple(layout.fixedPoints.get(index, number) for index, number in enumerate(points))
+        key = (name, maxPoints, points, count, address % layout.period)
+        result = self.plans.get(key)
+        if result is None:
+            result = self.plans[key] = LayoutPlan(layout, maxPoints, points, count, key[-1])
+        return result
@@ -0,0 +1,550 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+"""Open A2L files without parsing the objects in MODULEs up front.
+
+A byte-level scan (s. :func:`pya2l.parallel.prescan`) records keyword, name and byte range
+of each block in a MODULE; the rest of the file is parsed as usual. The blocks are
+represented by :class:`LazyBlock` proxies, which parse their range on first attribute access.
+
+Each block also records a digest of its bytes (including the whitespace and comments preceding it),
+so :meth:`A2LLazyDatabase.updateFrom` can tell which blocks of a regenerated file actually changed.
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+import hashlib
+import re
+
+import six
+
+from pya2l.a2lparser import A2LParser, A2LTokenWalker
+from pya2l.database import A2LDatabase
+from pya2l.decoders import valueOf
+from pya2l.parallel import PRESCAN, SPLIT_ANCESTORS, BlockSequenceWalker, prescan, splicedTokens
+from pya2l.tokenizer import A2LTokenizer, A2ML_END_BYTES, MappedFile
+
+BLOCK_HEADER = re.compile(br'/begin\s+([A-Za-z_][A-Za-z_0-9]*)\s+("(?:\\.|[^\\"])*"|[^\s"/]+)?')
+
+A2ML_KEYWORDS = ("A2ML", "A3ML")
+
+BlockChanges = namedtuple("BlockChanges", "removed added")
+
+
+@contextmanager
+def bufferView(buffer):
+    """Slices of memory-mapped files without copying, if supported.
+    """
+    try:
+        view = memoryview(buffer)
+    except TypeError:
+        yield buffer
+        return
+    try:
+        yield view
+    finally:
+        view.release()
+
+
+def scanBlocks(buffer, start, end):
+    """Byte ranges of the blocks in `buffer[start : end]`, which must not leave the enclosing MODULE.
+
+    Returns
+    -------
+    list of `(start, end)` tuples or None
+        None if `/begin` and `/end` don't match up within the range.
+    """
+    result = []
+    depth = 0
+    blockStart = None
+    pos = start
+    search = PRESCAN.search
+    while True:
+        match = search(buffer, pos, end)
+        if match is None:
+            break
+        pos = match.end()
+        tag = match.group("tag")
+        if tag is None:
+            continue    # String or comment.
+        keyword = match.group("keyword").decode("ascii")
+        if keyword in SPLIT_ANCESTORS:
+            return None
+        if tag == b"begin":
+            if keyword in A2ML_KEYWORDS:
+                a2mlEnd = A2ML_END_BYTES.search(buffer, pos, end)
+                if a2mlEnd is None:
+                    return None
+                pos = a2mlEnd.end()
+                continue
+            if depth == 0:
+                blockStart = match.start()
+            depth += 1
+        else:
+            if depth == 0:
+                return None
+            depth -= 1
+            if depth == 0:
+                result.append((blockStart, pos))
+    if depth:
+        return None
+    return result
+
+
+class LazyBlock(object):
+    """Proxy of a block in an :class:`A2LLazyDatabase`.
+
+    `keyword`, `name`, `level` and the byte range `start`/`end` are available right away,
+    any other attribute access parses the block.
+    """
+
+    __slots__ = ['_database', '_element', 'keyword', 'name', 'level', 'start', 'end', 'line', 'lines',
+        'spanStart', 'digest'
+    ]
+
+    def __init__(self, database, keyword, name, level, start, end, line):
+        self._database = database
+        self._element = None
+        self.keyword = keyword
+        self.name = name
+        self.level = level
+        self.start = start
+        self.end = end
+        self.line = line
+        self.lines = 0          # Newlines within the block.
+        self.spanStart = start  # Covered by `digest`, i.e. including what precedes the block.
+        self.digest = None
+
+    @property
+    def element(self):
+        """The parsed :mod:`pya2l.classes` instance.
+        """
+        if self._element is None:
+            if self._database is None:
+                raise ValueError("Block '{0}' was removed from the database.".format(self.name))
+            self._element = self._database.materialize(self)
+        return self._element
+
+    @property
+    def materialized(self):
+        return self._element is not None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.element, name)
+
+    def __str__(self):
+        return str(self.element)
+
+    def __repr__(self):
+        return "<LazyBlock {0} '{1}'>".format(self.keyword, self.name)
+
+
+class Blocks(object):
+    """Stands in for the :class:`concurrent.futures.Future` of a :class:`pya2l.a2lparser.Splice`.
+    """
+
+    __slots__ = ['_result']
+
+    def __init__(self, block, lineCount):
+        self._result = ([(block, block.level)], [block], lineCount)
+
+    def result(self):
+        return self._result
+
+
+class A2LLazyDatabase(A2LDatabase):
+    """A2L file whose MODULE content is parsed on demand.
+
+    :attr:`instList` contains :class:`LazyBlock` s for the blocks in MODULEs (blocks nested in them
+    don't show up until their parent is parsed); everything else is parsed right away.
+    The file stays memory-mapped until :meth:`close`.
+
+    Parameters
+    ----------
+    filename: str
+    plainValues: bool
+        s. :class:`pya2l.a2lparser.A2LParser`.
+    """
+
+    def __init__(self, filename, plainValues = False):
+        super(A2LLazyDatabase, self).__init__()
+        self.plainValues = plainValues
+        self.scan(filename)
+
+    def scan(self, filename):
+        self.filename = filename
+        self.source = MappedFile(filename, skipA2ML = False)
+        self.tailDigest = None
+        buffer = self.source.buffer
+        self.size = len(buffer)
+        blocks = prescan(buffer)
+        if blocks is None:
+            self.close()
+            parser = A2LParser(tokenizer = "fast", engine = "recursive", plainValues = self.plainValues)
+            self.instList = parser.parseFile(filename).instList
+            return
+        chunks = []
+        futures = []
+        line = 1
+        pos = 0
+        spanStart = 0
+        with bufferView(buffer) as view:
+            for _, start, end, level in blocks:
+                header = BLOCK_HEADER.match(buffer, start)
+                keyword = header.group(1).decode("ascii")
+                if keyword in A2ML_KEYWORDS:
+                    continue
+                name = header.group(2)
+                if name is not None:
+                    name = name.decode("latin1").strip('"')
+                line += buffer[pos : start].count(b'\n')
+                pos = start
+                block = LazyBlock(self, keyword, name, level, start, end, line)
+                block.lines = buffer[start : end].count(b'\n')
+                block.spanStart = spanStart
+                block.digest = hashlib.sha1(view[spanStart : end]).digest()
+                spanStart = end
+                chunks.append((start, end, level))
+                futures.append(Blocks(block, block.lines))
+            self.tailDigest = hashlib.sha1(view[spanStart : ]).digest()
+        walker = A2LTokenWalker(splicedTokens(buffer, filename, chunks, futures))
+        walker.plainValues = self.plainValues
+        walker.run()
+        self.instList = walker.instList
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the file; blocks not parsed by now can't be parsed anymore.
+        """
+        self.source.close()
+
+    def materialize(self, block):
+        """Parse the range of a :class:`LazyBlock`.
+        """
+        text = self.source.buffer[block.start : block.end].decode("latin1")
+        tokens = A2LTokenizer(text, self.filename, skipA2ML = True, firstLine = block.line).tokens()
+        walker = BlockSequenceWalker(tokens, block.level, fastForward = True)
+        walker.plainValues = self.plainValues
+        walker.run()
+        return walker.children[0]
+
+    def index(self, keyword):
+        """Like :meth:`A2LDatabase.index`, but blocks aren't parsed to get their names.
+        """
+        size = len(self.instList)
+        entry = self._indexes.get(keyword)
+        if entry is None or entry[0] != size:
+            index = {}
+            for inst, _ in self.instList:
+                if inst.__class__ is LazyBlock:
+                    if inst.keyword == keyword and inst.name is not None:
+                        index.setdefault(inst.name, inst)
+                elif inst is not None and inst.__class__.__name__ == keyword:
+                    name = valueOf(getattr(inst, "Name", None))
+                    if isinstance(name, six.string_types):
+                        index.setdefault(name, inst)
+            entry = self._indexes[keyword] = (size, index)
+        return entry[1]
+
+    def instances(self, keyword):
+        """Like :meth:`A2LDatabase.instances`, unparsed blocks are returned as :class:`LazyBlock` s.
+        """
+        for inst, _ in self.instList:
+            if inst.__class__ is LazyBlock:
+                if inst.keyword == keyword:
+                    yield inst
+            elif inst is not None and inst.__class__.__name__ == keyword:
+                yield inst
+
+    def resolveReferences(self):
+        """Like :meth:`A2LDatabase.resolveReferences`, parses all blocks.
+
+        References are reported by the parsed instances and point to the :class:`LazyBlock` s.
+        """
+        from pya2l.references import resolveReferences
+
+        instList = []
+        for inst, level in self.instList:
+            if inst.__class__ is LazyBlock:
+                instList.extend(postOrder(inst.element, level))
+            else:
+                instList.append((inst, level))
+        self._indexes["references"] = (len(self.instList), resolveReferences(self, instList))
+        return self._indexes["references"][1]
+
+    def updateFrom(self, filename):
+        """Switch over to a new version of the file, parsing only the blocks that changed.
+
+        Blocks are compared by keyword, name and digest; unchanged ones are kept (parsed or not),
+        changed ones replaced by new :class:`LazyBlock` s -- which are parsed right away if their
+        predecessor was. Name indexes and :attr:`crossReferences` are patched in place, other indexes
+        are rebuilt on next use. If the change reaches beyond the blocks of a single MODULE,
+        the file is scanned from scratch.
+
+        Parameters
+        ----------
+        filename: str
+
+        Returns
+        -------
+        :class:`BlockChanges`
+            :class:`LazyBlock` s `removed` from and `added` to the database; removed ones
+            which weren't parsed before can't be parsed anymore.
+        """
+        blocks = self.blocks
+        source = MappedFile(filename, skipA2ML = False)
+        try:
+            plan = self.planUpdate(source.buffer, blocks) if blocks and self.tailDigest is not None else None
+        except Exception:
+            source.close()
+            raise
+        if plan is None:
+            source.close()
+            return self.rescan(filename, blocks)
+        self.source.close()
+        self.source = source
+        self.filename = filename
+        return self.applyUpdate(blocks, *plan)
+
+    def planUpdate(self, buffer, blocks):
+        """Locate the changed blocks of `buffer`, None if the MODULE structure changed.
+
+        The longest runs of unchanged blocks at the start and (shifted by the change in size) at the end
+        of the file are skipped, the range in between is scanned for blocks.
+        """
+        size = len(buffer)
+        shift = size - self.size
+        count = len(blocks)
+        with bufferView(buffer) as view:
+            def digest(start, end):
+                return hashlib.sha1(view[start : end]).digest()
+
+            tailStart = blocks[-1].end + shift
+            if tailStart < 0 or digest(tailStart, size) != self.tailDigest:
+                return None
+            first = 0
+            while first < count:
+                block = blocks[first]
+                if block.end > size or digest(block.spanStart, block.end) != block.digest:
+                    break
+                first += 1
+            windowStart = blocks[first].spanStart if first < count else blocks[-1].end
+            last = count - 1
+            while last >= first:
+                block = blocks[last]
+                if block.spanStart + shift < windowStart or \
+                        digest(block.spanStart + shift, block.end + shift) != block.digest:
+                    break
+                last -= 1
+            windowEnd = (blocks[last + 1].spanStart if last + 1 < count else blocks[-1].end) + shift
+            if windowEnd < windowStart:
+                return None
+            parents = self.blockParents()
+            neighbours = blocks[first : last + 1] or blocks[max(first - 1, 0) : first + 1]
+            if len(set(id(parents.get(id(block))) for block in neighbours)) != 1:
+                return None     # Change spans MODULEs.
+            parent = parents.get(id(neighbours[0]))
+            if parent is None:
+                return None
+            ranges = scanBlocks(buffer, windowStart, windowEnd)
+            if ranges is None:
+                return None
+            candidates = {}
+            for block in blocks[first : last + 1]:
+                candidates.setdefault((block.keyword, block.name, block.digest), []).append(block)
+            line = blocks[first - 1].line + blocks[first - 1].lines if first else 1
+            level = neighbours[0].level
+            pos = spanStart = windowStart
+            current = []
+            for start, end in ranges:
+                header = BLOCK_HEADER.match(buffer, start)
+                keyword = header.group(1).decode("ascii")
+                name = header.group(2)
+                if name is not None:
+                    name = name.decode("latin1").strip('"')
+                line += buffer[pos : start].count(b'\n')
+                pos = start
+                blockDigest = digest(spanStart, end)
+                reusable = candidates.get((keyword, name, blockDigest))
+                if reusable:
+                    block = reusable.pop(0)
+                else:
+                    block = LazyBlock(self, keyword, name, level, start, end, line)
+                    block.digest = blockDigest
+                current.append((block, start, end, line, buffer[start : end].count(b'\n'), spanStart))
+                spanStart = end
+            if last + 1 < count:
+                following = blocks[last + 1]
+                line += buffer[pos : following.start + shift].count(b'\n')
+                lineShift = line - following.line
+                followingDigest = digest(spanStart, following.end + shift)
+            else:
+                lineShift = 0
+                followingDigest = digest(spanStart, size)
+        return (parent, first, last, current, shift, lineShift, spanStart, followingDigest, size)
+
+    def applyUpdate(self, blocks, parent, first, last, current, shift, lineShift, spanStart, followingDigest, size):
+        oldSize = len(self.instList)
+        replaced = blocks[first : last + 1]
+        kept = set()
+        for block, start, end, line, lines, blockSpanStart in current:
+            kept.add(id(block))
+            block.start, block.end, block.line, block.lines, block.spanStart = start, end, line, lines, blockSpanStart
+        for block in blocks[last + 1 : ]:
+            block.start += shift
+            block.end += shift
+            block.spanStart += shift
+            block.line += lineShift
+        if last + 1 < len(blocks):
+            blocks[last + 1].spanStart = spanStart
+            blocks[last + 1].digest = followingDigest
+        else:
+            self.tailDigest = followingDigest
+        self.size = size
+        removed = [block for block in replaced if id(block) not in kept]
+        replacedIds = set(id(block) for block in replaced)
+        newBlocks = [block for block, _, _, _, _, _ in current]
+        added = [block for block in newBlocks if id(block) not in replacedIds]
+
+        if replaced:
+            anchor, offset = replaced[0], 0
+        elif first and parent.children and indexOf(parent.children, blocks[first - 1]) is not None:
+            anchor, offset = blocks[first - 1], 1
+        else:
+            anchor, offset = blocks[first], 0
+        position = indexOf(parent.children, anchor) + offset
+        parent.children[position : position + len(replaced)] = newBlocks
+        position = indexOf([inst for inst, _ in self.instList], anchor) + offset
+        self.instList[position : position + len(replaced)] = [(block, block.level) for block in newBlocks]
+        if not (removed or added):
+            return BlockChanges(removed, added)
+        self.patchIndexes(oldSize, removed, added)
+
+        materialized = set((block.keyword, block.name) for block in removed if block.materialized)
+        references = self._indexes.pop("references", None)
+        for block in added:
+            if references is not None or (block.keyword, block.name) in materialized:
+                block.element
+        if references is not None and references[0] == oldSize:
+            from pya2l.references import updateReferences
+
+            removedInstances = []
+            for block in removed:
+                removedInstances.append((block, block.level))
+                if block.materialized:
+                    removedInstances.extend(postOrder(block.element, block.level))
+            addedInstances = []
+            for block in added:
+                addedInstances.extend(postOrder(block.element, block.level))
+            updateReferences(self, references[1], removedInstances, addedInstances)
+            self._indexes["references"] = (len(self.instList), references[1])
+        for block in removed:
+            block._database = None
+        return BlockChanges(removed, added)
+
+    def rescan(self, filename, blocks):
+        for block in blocks:
+            block._database = None
+        self.close()
+        self._indexes = {}
+        self.scan(filename)
+        return BlockChanges(blocks, self.blocks)
+
+    def blockParents(self):
+        """Map `id()` s of :class:`LazyBlock` s to their MODULEs.
+        """
+        result = {}
+        for inst, _ in self.instList:
+            if inst is not None and inst.__class__ is not LazyBlock:
+                for child in inst.children:
+                    if child.__class__ is LazyBlock:
+                        result[id(child)] = inst
+        return result
+
+    def patchIndexes(self, oldSize, removed, added):
+        """Update name indexes built before `removed` were replaced by `added`, drop all other indexes.
+
+        Indexes are dropped, too, if names of `removed` blocks may be shared by other blocks.
+        """
+        size = len(self.instList)
+        for key, entry in list(self._indexes.items()):
+            if key == "references":
+                continue
+            del self._indexes[key]
+            if not isinstance(key, six.string_types) or entry[0] != oldSize:
+                continue
+            index = entry[1]
+            vacant = set()
+            for block in removed:
+                if block.keyword == key and index.get(block.name) is block:
+                    del index[block.name]
+                    vacant.add(block.name)
+            consistent = True
+            for block in added:
+                if block.keyword == key and block.name is not None:
+                    if block.name in index:
+                        consistent = False
+                        break
+                    index[block.name] = block
+                    vacant.discard(block.name)
+            if consistent and not vacant:
+                self._indexes[key] = (size, index)
+
+    @property
+    def blocks(self):
+        """All :class:`LazyBlock` s, in file order.
+        """
+        return [inst for inst, _ in self.instList if inst.__class__ is LazyBlock]
+
+
+def indexOf(items, item):
+    """Position of `item` in `items` by identity, None if not contained.
+    """
+    for position, other in enumerate(items):
+        if other is item:
+            return position
+    return None
+
+
+def postOrder(inst, level):
+    """`inst` and the blocks nested in it as `(instance, level)` tuples, in the order of `instList`.
+    """
+    result = []
+    for child in inst.children:
+        result.extend(postOrder(child, level + 1))
+    result.append((inst, level))
+    return result
@@ -27,24 +27,35 @@ __copyright__ = """
 __author__  = 'Christoph Schueler'
 __version__ = '0.1.0'
 
-import logging
 import os
 
+##
+## Same values as in `logging`, which is imported on first use.
+##
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+CRITICAL = 50
+
 
 class Logger(object):
 
     LOGGER_BASE_NAME = 'pya2l'
     FORMAT = "[%(levelname)s (%(name)s)]: %(message)s"
 
-    def __init__(self, parent, name, level = logging.WARN):
+    def __init__(self, parent, name, level = WARN):
+        import logging
+
         self.parent = parent
         self.logger = logging.getLogger("{0}.{1}".format(self.LOGGER_BASE_NAME, name))
         self.logger.setLevel(level)
-        handler = logging.StreamHandler()
-        handler.setLevel(level)
-        formatter = logging.Formatter(self.FORMAT)
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        if not self.logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setLevel(level)
+            formatter = logging.Formatter(self.FORMAT)
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
         self.lastMessage = None
         self.lastSeverity = None
 
@@ -61,35 +72,35 @@ class Logger(object):
         )
 
     def info(self, message):
-        self.log(message, logging.INFO)
+        self.log(message, INFO)
 
     def warn(self, message):
-        self.log(message, logging.WARN)
+        self.log(message, WARN)
 
     def debug(self, message):
-        self.log(message, logging.DEBUG)
+        self.log(message, DEBUG)
 
     def error(self, message):
-        self.log(message, logging.ERROR)
+        self.log(message, ERROR)
 
     def critical(self, message):
-        self.log(message, logging.CRITICAL)
+        self.log(message, CRITICAL)
 
     def verbose(self):
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(DEBUG)
 
     def silent(self):
-        self.logger.setLevel(logging.CRITICAL)
+        self.logger.setLevel(CRITICAL)
 
     def setLevel(self, level):
         LEVEL_MAP = {
-            "INFO": logging.INFO,
-            "WARN": logging.WARN,
-            "DEBUG": logging.DEBUG,
-            "ERROR": logging.ERROR,
-            "CRITICAL": logging.CRITICAL,
+            "INFO": INFO,
+            "WARN": WARN,
+            "DEBUG": DEBUG,
+            "ERROR": ERROR,
+            "CRITICAL": CRITICAL,
         }
         if isinstance(level, str):
-            level = LEVEL_MAP.get(level.upper(), logging.WARN)
+            level = LEVEL_MAP.get(level.upper(), WARN)
         self.logger.setLevel(level)
 
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+"""Decoder of calibration values (CHARACTERISTIC objects) in ECU memory images.
+
+The memory layout of a CHARACTERISTIC is described by its RECORD_LAYOUT, compiled to
+a :class:`pya2l.layouts.LayoutPlan` shared by all objects of equal layout and dimensions.
+Records are read with :func:`numpy.frombuffer`, i.e. as views of the image, and converted
+to physical values by their COMPU_METHODs.
+
+Requires NumPy (`pip install pya2l[numpy]`).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import six
+
+from pya2l.addressindex import AXES, elementCount
+from pya2l.decoders import valueOf
+from pya2l.layouts import DTYPES
+
+BYTE_ORDERS = {"MSB_LAST": "<", "LITTLE_ENDIAN": "<", "MSB_FIRST": ">", "BIG_ENDIAN": ">"}
+
+##
+## CHARACTERISTIC type ==> number of axes.
+##
+DIMENSIONS = {"VALUE": 0, "VAL_BLK": 0, "ASCII": 0, "CURVE": 1, "MAP": 2, "CUBOID": 3, "CUBE_4": 4, "CUBE_5": 5}
+
+Value = namedtuple("Value", "name physical raw axes")
+Axis = namedtuple("Axis", "physical raw")
+
+
+def byteOrder(inst, default):
+    order = getattr(inst, "BYTE_ORDER", None)
+    return default if order is None else BYTE_ORDERS[valueOf(order.ByteOrder)]
+
+
+class ImageDecoder(object):
+    """Read CHARACTERISTIC values from a memory image.
+
+    Parameters
+    ----------
+    database: :class:`pya2l.database.A2LDatabase`
+    image: bytes-like
+        `bytes`, `bytearray`, `mmap`, ... -- anything supporting the buffer protocol.
+    baseAddress: int
+        ECU address of the first byte of `image`.
+    """
+
+    def __init__(self, database, image, baseAddress = 0):
+        self.database = database
+        self.image = np.frombuffer(image, dtype = np.uint8)
+        self.baseAddress = baseAddress
+        modCommon = next(database.instances("MOD_COMMON"), None)
+        self.byteOrder = byteOrder(modCommon, "<")
+        self.plans = database.layoutPlans
+        deposit = getattr(modCommon, "DEPOSIT", None)
+        self.deposit = "ABSOLUTE" if deposit is None else valueOf(deposit.Mode)
+
+    def read(self, address, datatype, count, order):
+        """`count` values of `datatype` at `address` as view of the image.
+        """
+        dtype = np.dtype(order + DTYPES[datatype])
+        offset = address - self.baseAddress
+        if offset < 0 or offset + count * dtype.itemsize > len(self.image):
+            raise ValueError("Address range 0x{0:08X}..0x{1:08X} isn't in the image.".format(
+                address, address + count * dtype.itemsize)
+            )
+        return np.frombuffer(self.image, dtype, count, offset)
+
+    def decode(self, characteristic):
+        """Decode a CHARACTERISTIC (object or name).
+
+        Returns
+        -------
+        :class:`Value`
+            `physical` and `raw` values with shape `(X, Y, ...)` points, `axes` as list of :class:`Axis`.
+            ASCII strings are returned as `str`.
+
+        Raises
+        ------
+        ValueError
+            The characteristic isn't in the image or uses unsupported layout features.
+        """
+        if isinstance(characteristic, six.string_types):
+            characteristic = self.database.characteristics[characteristic]
+        characteristic = getattr(characteristic, "element", characteristic)     # Lazy proxies.
+        name = valueOf(characteristic.Name)
+        kind = valueOf(characteristic.Type)
+        order = byteOrder(characteristic, self.byteOrder)
+        descriptions = [axis for axis in characteristic.children if axis.__class__.__name__ == "AXIS_DESCR"]
+        descriptions = descriptions[ : DIMENSIONS[kind]]
+        if len(descriptions) < DIMENSIONS[kind]:
+            raise ValueError("{0} '{1}' lacks AXIS_DESCRs.".format(kind, name))
+        maxPoints = [valueOf(axis.MaxAxisPoints) for axis in descriptions]
+        axes = [None] * len(descriptions)
+        for index, axis in enumerate(descriptions):
+            attribute = valueOf(axis.Attribute)
+            if attribute == "FIX_AXIS":
+                axes[index] = self.fixAxis(axis)
+            elif attribute == "COM_AXIS":
+                axes[index] = self.decodeAxisPts(self.database.axisPts[valueOf(axis.AXIS_PTS_REF.AxisPoints)])
+            elif attribute != "STD_AXIS":
+                raise ValueError("{0} of '{1}' isn't supported.".format(attribute, name))
+            if axes[index] is not None:
+                maxPoints[index] = len(axes[index].raw)
+        count = 1 if kind in ("VALUE", "CURVE", "MAP", "CUBOID", "CUBE_4", "CUBE_5") else elementCount(characteristic)
+        layout = valueOf(characteristic.Deposit)
+        record = self.readRecord(valueOf(characteristic.Address), layout, order, maxPoints, count)
+        if "FNC_VALUES" not in record:
+            raise ValueError("RECORD_LAYOUT '{0}' has no FNC_VALUES.".format(layout))
+        for index, axis in enumerate(descriptions):
+            if axes[index] is None:
+                raw = record.get("AXIS_PTS_{0}".format(AXES[index]))
+                if raw is None:
+                    raise ValueError("RECORD_LAYOUT '{0}' has no AXIS_PTS_{1}.".format(layout, AXES[index]))
+                axes[index] = self.axis(axis, raw)
+        raw = record["FNC_VALUES"]
+        if kind == "ASCII":
+            text = raw.tobytes().split(b"\0")[0].decode("latin-1")
+            return Value(name, text, raw, [])
+        if kind == "VALUE":
+            raw = raw.reshape(())
+        elif kind == "VAL_BLK":
+            raw = raw.reshape(self.blockShape(characteristic, count), order = self.plans.layout(layout).order)
+        return Value(name, self.physical(characteristic.Conversion, raw), raw, axes)
+
+    def values(self, characteristics = None):
+        """Decode many CHARACTERISTICs (objects or names), all by default.
+
+        Returns
+        -------
+        dict
+            Name ==> :class:`Value`.
+        """
+        if characteristics is None:
+            characteristics = self.database.characteristics.values()
+        result = {}
+        for characteristic in characteristics:
+            value = self.decode(characteristic)
+            result[value.name] = value
+        return result
+
+    def readRecord(self, address, layout, order, maxPoints, count):
+        """Read the decoded components of a record, s. :meth:`pya2l.layouts.LayoutPlan.record`.
+
+        Parameters
+        ----------
+        layout: str
+            Name of the RECORD_LAYOUT.
+        maxPoints: list of int
+            Number of axis points memory is reserved for.
+        count: int
+            Number of values per axis point, e.g. of VAL_BLKs.
+        """
+        plan = self.plans.plan(layout, address, maxPoints, count)
+        if plan.counted:
+            points = list(plan.points)
+            known = set()
+            for index in plan.counted:
+                name, offset, datatype = plan.countFields[index]
+                if not plan.dependencies[index] <= known:
+                    raise ValueError("{0} of RECORD_LAYOUT '{1}' follows components whose sizes aren't known yet.".format(
+                        name, layout)
+                    )
+                points[index] = int(self.read(address + offset, datatype, 1, order)[0])
+                if points[index] > plan.maxPoints[index]:
+                    raise ValueError("{0} exceeds the maximum number of axis points.".format(name))
+                known.add(index)
+                plan = self.plans.plan(layout, address, maxPoints, count, points)
+        return self.record(plan, address, order)
+
+    def record(self, plan, address, order):
+        offset = address - self.baseAddress
+        if offset < 0 or offset + plan.size > len(self.image):
+            raise ValueError("Address range 0x{0:08X}..0x{1:08X} isn't in the image.".format(address, address + plan.size))
+        return plan.record(self.image, offset, order)
+
+    def axis(self, inst, raw):
+        """:class:`Axis` of an AXIS_DESCR or AXIS_PTS object whose points are `raw`.
+        """
+        deposit = getattr(inst, "DEPOSIT", None)
+        if (self.deposit if deposit is None else valueOf(deposit.Mode)) == "DIFFERENCE":
+            raw = np.cumsum(raw)
+        return Axis(self.physical(inst.Conversion, raw), raw)
+
+    def fixAxis(self, axis):
+        parameters = getattr(axis, "FIX_AXIS_PAR", None)
+        if parameters is not None:
+            number = valueOf(parameters.Numberapo)
+            raw = valueOf(parameters.Offset) + np.arange(number) * 2 ** valueOf(parameters.Shift)
+            return Axis(self.physical(axis.Conversion, raw), raw)
+        parameters = getattr(axis, "FIX_AXIS_PAR_DIST", None)
+        if parameters is not None:
+            number = valueOf(parameters.Numberapo)
+            raw = valueOf(parameters.Offset) + np.arange(number) * valueOf(parameters.Distance)
+            return Axis(self.physical(axis.Conversion, raw), raw)
+        for child in axis.children:
+            if child.__class__.__name__ == "FIX_AXIS_PAR_LIST":
+                raw = np.array([valueOf(value) for value in child.AxisPts_Value], dtype = np.float64)
+                return Axis(self.physical(axis.Conversion, raw), raw)
+        raise ValueError("FIX_AXIS without FIX_AXIS_PAR, FIX_AXIS_PAR_DIST or FIX_AXIS_PAR_LIST.")
+
+    def decodeAxisPts(self, axisPts):
+        """Decode the axis points of an AXIS_PTS object (used by COM_AXIS).
+        """
+        axisPts = getattr(axisPts, "element", axisPts)
+        layout = valueOf(axisPts.Deposit)
+        maxPoints = [valueOf(axisPts.MaxAxisPoints)]
+        record = self.readRecord(valueOf(axisPts.Address), layout, byteOrder(axisPts, self.byteOrder), maxPoints, 1)
+        if "AXIS_PTS_X" not in record:
+            raise ValueError("RECORD_LAYOUT '{0}' has no AXIS_PTS_X.".format(layout))
+        return self.axis(axisPts, record["AXIS_PTS_X"])
+
+    def physical(self, conversion, raw):
+        name = valueOf(conversion)
+        if name == "NO_COMPU_METHOD":
+            return raw
+        return self.database.conversion(name)(raw)
+
+    def blockShape(self, characteristic, count):
+        matrixDim = getattr(characteristic, "MATRIX_DIM", None)
+        if matrixDim is None:
+            return (count, )
+        shape = [valueOf(getattr(matrixDim, attr, 1)) or 1 for attr in ("xDim", "yDim", "zDim")]
+        while len(shape) > 1 and shape[-1] == 1:
+            shape.pop()
+        return tuple(shape)
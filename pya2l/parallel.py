@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Parse the blocks of large A2L files in multiple processes.
+
+A pre-scan locates the blocks nested in MODULEs by searching for `/begin` and `/end`
+(skipping strings, comments and A2ML sections). Consecutive blocks are grouped into chunks
+of roughly equal size and parsed by worker processes, while the main process walks the
+rest of the file and splices the results in, in file order.
+
+:func:`parseMany` parses a batch of files in a pool of worker processes.
+"""
+
+from collections import namedtuple
+import io
+import mmap
+import multiprocessing
+import os
+import re
+
+from pya2l import tokenizer
+from pya2l.a2lparser import A2LParser, A2LTokenWalker, BlockStart, Splice
+from pya2l.database import A2LDatabase
+from pya2l.tokenizer import A2LTokenizer, A2ML_END_BYTES, MappedFile
+
+PRESCAN = re.compile(br"""
+    "(?:\\.|[^\\"])*"
+   |//[^\r\n]*
+   |/\*.*?\*/
+   |/(?P<tag>begin|end)\s+(?P<keyword>[A-Za-z_][A-Za-z_0-9]*)
+""", re.VERBOSE | re.DOTALL)
+
+SPLIT_PARENTS = frozenset(("MODULE", ))
+SPLIT_ANCESTORS = ("PROJECT", "MODULE")   # Blocks enclosing chunks.
+
+MIN_CHUNK_SIZE = 256 * 1024
+MIN_FILE_SIZE = 4 * 1024 * 1024
+
+
+def prescan(buffer):
+    """Locate the blocks nested in MODULEs.
+
+    Parameters
+    ----------
+    buffer: bytes-like object
+
+    Returns
+    -------
+    list of `(parentStart, start, end, level)` tuples or None
+        Byte ranges of the blocks, `level` as passed to :meth:`pya2l.a2lparser.BaseWalker.walkBlock`
+        of the parent. None if `/begin` and `/end` don't match up.
+    """
+    result = []
+    stack = []
+    pos = 0
+    search = PRESCAN.search
+    while True:
+        match = search(buffer, pos)
+        if match is None:
+            break
+        pos = match.end()
+        tag = match.group("tag")
+        if tag is None:
+            continue    # String or comment.
+        keyword = match.group("keyword").decode("ascii")
+        if tag == b"begin":
+            if keyword in ("A2ML", "A3ML"):
+                end = A2ML_END_BYTES.search(buffer, pos)
+                if end is None:
+                    return None
+                pos = end.end()
+                if stack and stack[-1][0] in SPLIT_PARENTS:
+                    result.append((stack[-1][1], match.start(), pos, len(stack)))
+                continue
+            stack.append((keyword, match.start()))
+        else:
+            if not stack or stack[-1][0] != keyword:
+                return None
+            _, start = stack.pop()
+            if stack and stack[-1][0] in SPLIT_PARENTS:
+                result.append((stack[-1][1], start, pos, len(stack)))
+    if stack:
+        return None
+    return result
+
+
+def makeChunks(blocks, chunkSize):
+    """Group consecutive blocks of the same parent into `(start, end, level)` ranges of about `chunkSize` bytes.
+    """
+    result = []
+    current = None
+    for parent, start, end, level in blocks:
+        if current is not None and current[0] == parent and current[2] - current[1] < chunkSize:
+            current[2] = end
+        else:
+            if current is not None:
+                result.append(tuple(current[1 : ]))
+            current = [parent, start, end, level]
+    if current is not None:
+        result.append(tuple(current[1 : ]))
+    return result
+
+
+class BlockSequenceWalker(A2LTokenWalker):
+    """Walk a sequence of blocks, e.g. a chunk of the content of a MODULE.
+    """
+
+    def __init__(self, tokens, level, keywordFilter = None, insideIncluded = False, fastForward = False):
+        super(BlockSequenceWalker, self).__init__(tokens, fastForward)
+        self.level = level
+        self.children = []
+        self.keywordFilter = keywordFilter
+        self.insideIncluded = insideIncluded
+
+    def run(self):
+        while True:
+            token = self.nextToken()
+            if token is None:
+                break
+            if token.type != tokenizer.BEGIN:
+                self.syntaxError("'/begin' expected")
+            inst = self.enterBlock(BlockStart(token), self.level)
+            if inst is not None:
+                self.instList.append((inst, self.level))
+                self.children.append(inst)
+        self.tokens = iter(())
+
+
+def readRange(filename, start, end):
+    with io.open(filename, "rb") as fp:
+        buffer = mmap.mmap(fp.fileno(), 0, access = mmap.ACCESS_READ)
+        try:
+            return buffer[start : end].decode("latin1")
+        finally:
+            buffer.close()
+
+
+def parseChunk(filename, start, end, level, keywordFilter = None, plainValues = False):
+    """Worker function: parse the blocks in `[start, end)`, s. :class:`pya2l.a2lparser.A2LParser`
+    for `keywordFilter` and `plainValues`.
+
+    Returns
+    -------
+    tuple
+        `(instList, children, lineCount)`, s. :class:`pya2l.a2lparser.Splice`.
+    """
+    source = A2LTokenizer(readRange(filename, start, end), filename, skipA2ML = True)
+    insideIncluded = keywordFilter is not None and any(keywordFilter.includes(parent) for parent in SPLIT_ANCESTORS)
+    walker = BlockSequenceWalker(source.tokens(), level, keywordFilter, insideIncluded, fastForward = True)
+    walker.plainValues = plainValues
+    walker.run()
+    return walker.instList, walker.children, source.lineNo - 1
+
+
+def segmentTokens(buffer, filename, start, end, lineOffset):
+    """Tokens of `[start, end)`, line numbers shifted by `lineOffset`; the last item is the number of lines.
+    """
+    source = A2LTokenizer(buffer[start : end].decode("latin1"), filename, skipA2ML = True, firstLine = lineOffset + 1)
+    for token in source.tokens():
+        yield token
+    yield source.lineNo - 1 - lineOffset
+
+
+def splicedTokens(buffer, filename, chunks, futures):
+    """Tokens of the file, with chunks replaced by :class:`pya2l.a2lparser.Splice` s.
+    """
+    pos = 0
+    lineOffset = 0
+    for (start, end, _), future in zip(chunks, futures):
+        for token in segmentTokens(buffer, filename, pos, start, lineOffset):
+            if isinstance(token, int):
+                lineOffset += token
+            else:
+                yield token
+        splice = Splice(future)
+        yield splice
+        lineOffset += splice.lineCount
+        pos = end
+    for token in segmentTokens(buffer, filename, pos, len(buffer), lineOffset):
+        if not isinstance(token, int):
+            yield token
+
+
+def parseParallel(parser, filename, workers = None, executor = None, chunkSize = None, minFileSize = MIN_FILE_SIZE):
+    """Parse an A2L file using multiple processes.
+
+    Files smaller than `minFileSize` or without MODULE content to split are parsed serially by `parser`,
+    as are files whose chunks can't be parsed separately -- so syntax errors are reported as usual.
+
+    Parameters
+    ----------
+    parser: :class:`pya2l.a2lparser.A2LParser`
+    filename: str
+    workers: int
+        Number of processes, defaults to the number of CPUs.
+    executor: :class:`concurrent.futures.Executor`
+        Use an existing pool instead of creating one.
+    chunkSize: int
+        Bytes per work item, defaults to a value giving four items per worker.
+    """
+    if os.path.getsize(filename) < minFileSize:
+        return parser.parseFile(filename)
+    with MappedFile(filename, skipA2ML = False) as source:
+        buffer = source.buffer
+        blocks = prescan(buffer)
+        if not blocks:
+            return parser.parseFile(filename)
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        if chunkSize is None:
+            total = sum(end - start for _, start, end, _ in blocks)
+            chunkSize = max(total // (workers * 4), MIN_CHUNK_SIZE)
+        chunks = makeChunks(blocks, chunkSize)
+        ownsExecutor = executor is None
+        if ownsExecutor:
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(workers)
+        futures = [executor.submit(parseChunk, filename, start, end, level, parser.keywordFilter, parser.plainValues)
+            for start, end, level in chunks
+        ]
+        try:
+            walker = A2LTokenWalker(splicedTokens(buffer, filename, chunks, futures))
+            walker.keywordFilter = parser.keywordFilter
+            walker.plainValues = parser.plainValues
+            walker.run()
+        except Exception:
+            for future in futures:
+                future.cancel()
+            walker = None
+        finally:
+            if ownsExecutor:
+                executor.shutdown(wait = True)
+    if walker is None:
+        return parser.parseFile(filename)
+    return walker
+
+
+BatchResult = namedtuple("BatchResult", "filename database error")
+
+_worker = None  # (options, parser) of the current worker process.
+
+
+def workerOptions(parser):
+    """Picklable configuration of `parser`, s. :func:`initWorker`.
+    """
+    cache = parser.cache
+    return (parser.tokenizer, parser.engine, (cache.directory, cache.maxSize) if cache is not None else None,
+        parser.keywordFilter, parser.plainValues
+    )
+
+
+def initWorker(options):
+    """Create the parser of a worker process.
+
+    Runs as initializer of the pool, so the generated ANTLR lexer and parser (including the
+    deserialization of their ATNs) are loaded once per process and before the first file arrives.
+    """
+    global _worker
+
+    tokenizerName, engine, cacheOptions, keywordFilter, plainValues = options
+    cache = None
+    if cacheOptions is not None:
+        from pya2l.cache import A2LCache
+
+        cache = A2LCache(*cacheOptions)
+    parser = A2LParser(tokenizerName, engine, cache)
+    parser.keywordFilter = keywordFilter
+    parser.plainValues = plainValues
+    if "antlr" in (tokenizerName, engine):
+        from pya2l import aml
+
+        aml.ParserWrapper('a2l', 'a2lFile')
+    _worker = (options, parser)
+    return parser
+
+
+def parseInWorker(filename, options):
+    """Worker function of :func:`parseMany`.
+    """
+    if _worker is not None and _worker[0] == options:
+        parser = _worker[1]
+    else:
+        parser = initWorker(options)    # No initializer support (Python < 3.7).
+    result = parser.parseFromFileName(filename)
+    if type(result) is not A2LDatabase:
+        result = A2LDatabase(result.instList)   # Walkers carry parser state, which doesn't pickle.
+    return result
+
+
+def createPool(workers, options):
+    from concurrent.futures import ProcessPoolExecutor
+
+    try:
+        return ProcessPoolExecutor(workers, initializer = initWorker, initargs = (options, ))
+    except TypeError:
+        return ProcessPoolExecutor(workers)
+
+
+def parseMany(parser, filenames, workers = None, retries = 1):
+    """Parse A2L files in a pool of worker processes.
+
+    Workers are started once and reused for all files. Results are generated as soon as a
+    file is finished, i.e. not necessarily in the order of `filenames`.
+    Failures are reported per file; if a worker process dies (crash, out of memory, ...), the
+    pool breaks and the files pending in it are retried one by one, each in a pool of its own,
+    so only the file that kills its worker is reported as failed.
+
+    Parameters
+    ----------
+    parser: :class:`pya2l.a2lparser.A2LParser`
+        Tokenizer, engine and cache settings are used by the workers.
+    filenames: iterable of str
+    workers: int
+        Number of processes, defaults to the number of CPUs.
+    retries: int
+        How often a file is re-submitted after it killed the worker of its own pool.
+
+    Yields
+    ------
+    :class:`BatchResult`
+        `(filename, database, error)`; `database` is an :class:`pya2l.database.A2LDatabase`,
+        or None if parsing raised `error`.
+    """
+    from collections import deque
+    from concurrent.futures import FIRST_COMPLETED, wait
+    try:
+        from concurrent.futures.process import BrokenProcessPool
+    except ImportError:
+        BrokenProcessPool = RuntimeError
+
+    options = workerOptions(parser)
+    workers = workers or multiprocessing.cpu_count()
+    executor = createPool(workers, options)
+    pending = {}    # future ==> (filename, attempts, pool of its own or None)
+    suspects = deque()  # (filename, attempts) pending in a broken pool.
+    try:
+        for filename in filenames:
+            pending[executor.submit(parseInWorker, filename, options)] = (filename, 0, None)
+        while pending or suspects:
+            isolated = sum(1 for _, _, pool in pending.values() if pool is not None)
+            while suspects and isolated < workers:
+                filename, attempts = suspects.popleft()
+                pool = createPool(1, options)
+                pending[pool.submit(parseInWorker, filename, options)] = (filename, attempts, pool)
+                isolated += 1
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                filename, attempts, pool = pending.pop(future)
+                if pool is not None:
+                    pool.shutdown(wait = False)
+                error = future.exception()
+                if error is None:
+                    yield BatchResult(filename, future.result(), None)
+                elif isinstance(error, BrokenProcessPool) and pool is None:
+                    suspects.append((filename, attempts))   # Any file of the pool may have killed it.
+                elif isinstance(error, BrokenProcessPool) and attempts < retries:
+                    suspects.append((filename, attempts + 1))
+                else:
+                    yield BatchResult(filename, None, error)
+    finally:
+        for future, (_, _, pool) in pending.items():
+            future.cancel()
+            if pool is not None:
+                pool.shutdown(wait = True)
+        executor.shutdown(wait = True)
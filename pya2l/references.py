@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Resolve identifiers referring to other objects.
+"""
+
+import six
+
+from pya2l.classes import A2LElement, ReferenceObject, ValueObject, ValueType
+
+
+##
+## (keyword, attribute) ==> keywords the referenced object may be an instance of.
+##
+REFERENCES = {
+    ("AXIS_DESCR", "Conversion"): ("COMPU_METHOD", ),
+    ("AXIS_DESCR", "InputQuantity"): ("MEASUREMENT", ),
+    ("AXIS_PTS", "Conversion"): ("COMPU_METHOD", ),
+    ("AXIS_PTS", "Deposit"): ("RECORD_LAYOUT", ),
+    ("AXIS_PTS", "InputQuantity"): ("MEASUREMENT", ),
+    ("AXIS_PTS_REF", "AxisPoints"): ("AXIS_PTS", ),
+    ("CHARACTERISTIC", "Conversion"): ("COMPU_METHOD", ),
+    ("CHARACTERISTIC", "Deposit"): ("RECORD_LAYOUT", ),
+    ("COMPARISON_QUANTITY", "Name"): ("MEASUREMENT", ),
+    ("COMPU_TAB_REF", "ConversionTable"): ("COMPU_TAB", "COMPU_VTAB", "COMPU_VTAB_RANGE"),
+    ("CURVE_AXIS_REF", "CurveAxis"): ("CHARACTERISTIC", ),
+    ("DEF_CHARACTERISTIC", "Identifier"): ("CHARACTERISTIC", "AXIS_PTS"),
+    ("DEPENDENT_CHARACTERISTIC", "Characteristic"): ("CHARACTERISTIC", "AXIS_PTS"),
+    ("FRAME_MEASUREMENT", "Identifier"): ("MEASUREMENT", ),
+    ("FUNCTION_LIST", "Name"): ("FUNCTION", ),
+    ("IN_MEASUREMENT", "Identifier"): ("MEASUREMENT", ),
+    ("LOC_MEASUREMENT", "Identifier"): ("MEASUREMENT", ),
+    ("MAP_LIST", "Name"): ("CHARACTERISTIC", ),
+    ("MEASUREMENT", "Conversion"): ("COMPU_METHOD", ),
+    ("OUT_MEASUREMENT", "Identifier"): ("MEASUREMENT", ),
+    ("REF_CHARACTERISTIC", "Identifier"): ("CHARACTERISTIC", "AXIS_PTS"),
+    ("REF_GROUP", "Identifier"): ("GROUP", ),
+    ("REF_MEASUREMENT", "Identifier"): ("MEASUREMENT", ),
+    ("REF_MEMORY_SEGMENT", "Name"): ("MEMORY_SEGMENT", ),
+    ("REF_UNIT", "Unit"): ("UNIT", ),
+    ("STATUS_STRING_REF", "ConversionTable"): ("COMPU_VTAB", "COMPU_VTAB_RANGE"),
+    ("SUB_FUNCTION", "Identifier"): ("FUNCTION", ),
+    ("SUB_GROUP", "Identifier"): ("GROUP", ),
+    ("VIRTUAL", "MeasuringChannel"): ("MEASUREMENT", ),
+    ("VIRTUAL_CHARACTERISTIC", "Characteristic"): ("CHARACTERISTIC", "AXIS_PTS"),
+}
+
+##
+## Blocks only consisting of references, the enclosing block is reported as referrer.
+##
+REFERENCE_LISTS = frozenset((
+    "DEF_CHARACTERISTIC", "DEPENDENT_CHARACTERISTIC", "FUNCTION_LIST", "IN_MEASUREMENT",
+    "LOC_MEASUREMENT", "MAP_LIST", "OUT_MEASUREMENT", "REF_CHARACTERISTIC", "REF_GROUP",
+    "REF_MEASUREMENT", "SUB_FUNCTION", "SUB_GROUP", "VIRTUAL", "VIRTUAL_CHARACTERISTIC",
+))
+
+##
+## Placeholders meaning "no reference".
+##
+NO_REFERENCE = frozenset(("NO_COMPU_METHOD", "NO_INPUT_QUANTITY"))
+
+IDENTIFIERS = (ValueObject, ) + six.string_types
+
+REFERENCED_KEYWORDS = frozenset(keyword for keywords in REFERENCES.values() for keyword in keywords)
+
+
+class CrossReferences(object):
+    """Result of :func:`resolveReferences`.
+
+    Attributes
+    ----------
+    referencedBy: dict
+        Referenced object ==> list of `(referrer, attribute)` tuples, in file order.
+    unresolved: list
+        `(referrer, attribute, name)` of identifiers naming non-existing objects.
+    """
+
+    def __init__(self):
+        self.referencedBy = {}
+        self.unresolved = []
+
+    def users(self, target, keyword = None):
+        """Objects referring to `target`, optionally only instances of `keyword`.
+        """
+        return [referrer for referrer, _ in self.referencedBy.get(target, [])
+            if keyword is None or referrer.__class__.__name__ == keyword
+        ]
+
+
+class Resolver(object):
+    """Replaces identifiers by :class:`pya2l.classes.ReferenceObject` s, recording them in a :class:`CrossReferences`.
+
+    Parameters
+    ----------
+    database: :class:`pya2l.database.A2LDatabase`
+        Provides the namespaces of the referenced keywords.
+    result: :class:`CrossReferences`
+        Defaults to a new, empty one.
+    stale: set
+        `id()` s of targets that no longer exist; references to them are resolved again.
+    """
+
+    def __init__(self, database, result = None, stale = frozenset()):
+        self.namespaces = dict((keyword, database.index(keyword)) for keyword in REFERENCED_KEYWORDS)
+        self.result = result if result is not None else CrossReferences()
+        self.stale = stale
+
+    def resolve(self, value, keywords, referrer, attr):
+        referencedBy = self.result.referencedBy
+        if isinstance(value, ReferenceObject):
+            if id(value.target) not in self.stale:  # Already resolved.
+                referencedBy.setdefault(value.target, []).append((referrer, attr))
+                return value
+            value = ValueObject(value.value, value.type)
+        if isinstance(value, ValueObject):
+            name, valueType = value.value, value.type
+        else:
+            name, valueType = value, ValueType.IDENT   # Parsed with plain values.
+        if name in NO_REFERENCE:
+            return value
+        for keyword in keywords:
+            target = self.namespaces[keyword].get(name)
+            if target is not None:
+                referencedBy.setdefault(target, []).append((referrer, attr))
+                return ReferenceObject(name, valueType, target)
+        self.result.unresolved.append((referrer, attr, name))
+        return value
+
+    def visit(self, inst, referrer):
+        keyword = inst.__class__.__name__
+        for attr in inst.attrs:
+            value = getattr(inst, attr)
+            keywords = REFERENCES.get((keyword, attr))
+            if keywords is not None:
+                if isinstance(value, list):
+                    setattr(inst, attr, [self.resolve(item, keywords, referrer, attr) if isinstance(item, IDENTIFIERS) else item
+                        for item in value
+                    ])
+                elif isinstance(value, IDENTIFIERS):
+                    setattr(inst, attr, self.resolve(value, keywords, referrer, attr))
+            elif isinstance(value, A2LElement):
+                self.visit(value, referrer)  # Optional keywords, e.g. COMPU_TAB_REF.
+            elif isinstance(value, list) and value and isinstance(value[0], A2LElement):
+                for item in value:   # Optional keywords occurring more than once.
+                    self.visit(item, referrer)
+
+    def visitReferrer(self, referrer):
+        """Resolve everything reported as referenced by `referrer` again.
+        """
+        if referrer.__class__.__name__ not in REFERENCE_LISTS:
+            self.visit(referrer, referrer)
+        for child in referrer.children:
+            if child.__class__.__name__ in REFERENCE_LISTS:
+                self.visit(child, referrer)
+
+    def run(self, instList):
+        parents = {}
+        for inst, _ in instList:
+            if inst is not None:
+                for child in inst.children:
+                    parents[child] = inst
+        for inst, _ in instList:
+            if inst is None:
+                continue
+            referrer = inst
+            if inst.__class__.__name__ in REFERENCE_LISTS:
+                referrer = parents.get(inst, inst)
+            self.visit(inst, referrer)
+        return self.result
+
+
+def resolveReferences(database, instList = None):
+    """Replace identifiers by :class:`pya2l.classes.ReferenceObject` s in a single pass over `database.instList`.
+
+    Parameters
+    ----------
+    database: :class:`pya2l.database.A2LDatabase`
+    instList: list of (instance, level) tuples
+        Instances to visit, defaults to `database.instList`.
+
+    Returns
+    -------
+    :class:`CrossReferences`
+    """
+    return Resolver(database).run(database.instList if instList is None else instList)
+
+
+def updateReferences(database, crossReferences, removed, added):
+    """Patch `crossReferences` in place after instances were replaced.
+
+    Parameters
+    ----------
+    database: :class:`pya2l.database.A2LDatabase`
+        Indexes must already reflect the change.
+    crossReferences: :class:`CrossReferences`
+    removed: list of (instance, level) tuples
+        Instances no longer in `database`, including nested ones.
+    added: list of (instance, level) tuples
+        New instances, including nested ones.
+    """
+    removedIds = set(id(inst) for inst, _ in removed)
+    addedNames = set(getattr(inst.Name, "value", inst.Name) for inst, _ in added
+        if inst.__class__.__name__ in REFERENCED_KEYWORDS and hasattr(inst, "Name")
+    )
+    referencedBy = crossReferences.referencedBy
+    affected = {}
+    for target in list(referencedBy):
+        if id(target) in removedIds:
+            for referrer, _ in referencedBy.pop(target):
+                affected[id(referrer)] = referrer
+    for referrer, _, name in crossReferences.unresolved:
+        if name in addedNames:
+            affected[id(referrer)] = referrer
+    dropped = removedIds | set(affected)
+    for target, users in list(referencedBy.items()):
+        users = [user for user in users if id(user[0]) not in dropped]
+        if users:
+            referencedBy[target] = users
+        else:
+            del referencedBy[target]
+    crossReferences.unresolved = [entry for entry in crossReferences.unresolved if id(entry[0]) not in dropped]
+    resolver = Resolver(database, crossReferences, removedIds)
+    for referrer in affected.values():
+        if id(referrer) not in removedIds:
+            resolver.visitReferrer(referrer)
+    resolver.run(added)
@@ -0,0 +1,378 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Store the object model of A2L files in SQLite databases.
+
+Every block instance becomes a row of the `elements` table; `keyword`, `name`,
+`address` and `conversion` are stored as indexed columns, the remaining attributes
+are pickled and only decoded when an element is actually used.
+"""
+
+from collections import OrderedDict
+import os
+import pickle
+import sqlite3
+
+import six
+
+from pya2l import classes
+from pya2l.cache import Decoder, Encoder, schemaFingerprint
+from pya2l.database import A2LDatabase
+
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE elements (
+    rowid INTEGER PRIMARY KEY,
+    parent INTEGER,
+    position INTEGER,
+    level INTEGER,
+    keyword TEXT,
+    name TEXT,
+    address INTEGER,
+    conversion TEXT,
+    attrs BLOB
+);
+CREATE INDEX idx_keyword_name ON elements (keyword, name);
+CREATE INDEX idx_address ON elements (address);
+CREATE INDEX idx_conversion ON elements (conversion);
+CREATE INDEX idx_parent ON elements (parent, position);
+"""
+
+COLUMNS = "rowid, parent, level, keyword, name, address, conversion"
+
+
+def plainValue(value):
+    """Column value of an attribute; lists, e.g. `FUNCTION_LIST.Name`, aren't indexed.
+    """
+    if isinstance(value, classes.ValueObject):
+        return value.value
+    return value if isinstance(value, six.string_types + six.integer_types + (float, )) else None
+
+
+def elementAddress(inst):
+    if hasattr(inst, "Address"):
+        return plainValue(inst.Address)
+    ecuAddress = getattr(inst, "ECU_ADDRESS", None)
+    if ecuAddress is not None and hasattr(ecuAddress, "Address"):
+        return plainValue(ecuAddress.Address)
+    return None
+
+
+def sourceFingerprint(filename):
+    stat = os.stat(filename)
+    return "{0} {1} {2!r}".format(os.path.abspath(filename), stat.st_size, stat.st_mtime)
+
+
+def exportDatabase(database, filename):
+    """Write the instances of an :class:`pya2l.database.A2LDatabase` (or walker) to a new SQLite file.
+
+    Parameters
+    ----------
+    database: :class:`pya2l.database.A2LDatabase`
+    filename: str
+        An existing file is replaced.
+    """
+    if os.path.exists(filename):
+        os.remove(filename)
+    conn = sqlite3.connect(filename)
+    try:
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO meta VALUES ('schema', ?)", (schemaFingerprint(), ))
+        rowids = {}
+        for rowid, (inst, level) in enumerate(database.instList, 1):
+            if inst is not None:
+                rowids[id(inst)] = rowid
+        parents = {}
+        for inst, level in database.instList:
+            if inst is not None:
+                for position, child in enumerate(inst.children):
+                    parents[id(child)] = (rowids[id(inst)], position)
+        rows = []
+        for rowid, (inst, level) in enumerate(database.instList, 1):
+            if inst is None:
+                continue
+            parent, position = parents.get(id(inst), (None, None))
+            encoder = Encoder(keepReferences = False)
+            attrs = [(attr, encoder.encode(getattr(inst, attr))) for attr in inst.attrs]
+            rows.append((rowid, parent, position, level, inst.__class__.__name__,
+                plainValue(getattr(inst, "Name", None)), elementAddress(inst),
+                plainValue(getattr(inst, "Conversion", None)),
+                sqlite3.Binary(pickle.dumps(attrs, pickle.HIGHEST_PROTOCOL))
+            ))
+        conn.executemany("INSERT INTO elements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class NameIndex(object):
+    """Read-only mapping of names to elements, backed by the `(keyword, name)` index.
+    """
+
+    def __init__(self, database, keyword):
+        self.database = database
+        self.keyword = keyword
+
+    def __getitem__(self, name):
+        element = self.database.get(self.keyword, name)
+        if element is None:
+            raise KeyError(name)
+        return element
+
+    def get(self, name, default = None):
+        element = self.database.get(self.keyword, name)
+        return default if element is None else element
+
+    def __contains__(self, name):
+        return self.database.get(self.keyword, name) is not None
+
+    def __iter__(self):
+        return (element.name for element in self.database.query(keyword = self.keyword))
+
+    def __len__(self):
+        return self.database.conn.execute("SELECT COUNT(*) FROM elements WHERE keyword = ?", (self.keyword, )).fetchone()[0]
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        """`(name, element)` pairs in file order, the first element of a name only -- like :meth:`A2LDatabase.index`.
+        """
+        result = OrderedDict()
+        for element in self.database.query(keyword = self.keyword):
+            if element.name is not None:
+                result.setdefault(element.name, element)
+        return list(result.items())
+
+    def values(self):
+        return [element for _, element in self.items()]
+
+
+class ChildList(list):
+    """`children` of a hydrated instance; the child rows are hydrated on first use, not along with their parent.
+    """
+
+    def __init__(self, database, rowid):
+        super(ChildList, self).__init__()
+        self._database = database
+        self._rowid = rowid
+
+    @property
+    def loaded(self):
+        return self._database is None
+
+    def load(self):
+        if self._database is not None:
+            database, self._database = self._database, None
+            list.extend(self, [child.element for child in database.children(self._rowid)])
+
+
+def loading(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args):
+        self.load()
+        return method(self, *args)
+    wrapper.__name__ = name
+    return wrapper
+
+for name in ("__iter__", "__len__", "__getitem__", "__contains__", "__reversed__", "__eq__", "__ne__", "__repr__",
+        "__getslice__", "__reduce_ex__", "index", "count", "append", "extend", "insert", "remove", "pop", "sort", "reverse"):
+    if hasattr(list, name):
+        setattr(ChildList, name, loading(name))
+del name
+
+
+class LazyElement(object):
+    """Proxy of an element stored in an :class:`A2LSqliteDatabase`.
+
+    `keyword`, `name`, `address` and `conversion` are available right away,
+    any other attribute access loads the complete instance.
+    """
+
+    def __init__(self, database, rowid, parent, level, keyword, name, address, conversion):
+        self._database = database
+        self._element = None
+        self.rowid = rowid
+        self.parentId = parent
+        self.level = level
+        self.keyword = keyword
+        self.name = name
+        self.address = address
+        self.conversion = conversion
+
+    @property
+    def element(self):
+        """The hydrated :mod:`pya2l.classes` instance.
+        """
+        if self._element is None:
+            self._element = self._database.hydrate(self)
+        return self._element
+
+    @property
+    def children(self):
+        return self._database.children(self.rowid)
+
+    @property
+    def parent(self):
+        return self._database.byRowid(self.parentId) if self.parentId is not None else None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.element, name)
+
+    def __str__(self):
+        return str(self.element)
+
+    def __repr__(self):
+        return "<LazyElement {0} '{1}'>".format(self.keyword, self.name)
+
+
+class A2LSqliteDatabase(A2LDatabase):
+    """Query the instances stored by :func:`exportDatabase`.
+
+    Opening a database doesn't load anything; rows are turned into
+    :class:`LazyElement` s on demand.
+
+    Parameters
+    ----------
+    filename: str
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        if not os.path.exists(filename):
+            raise IOError("No such file: '{0}'".format(filename))
+        self.conn = sqlite3.connect(filename)
+        self._indexes = {}
+
+    @classmethod
+    def fromA2L(cls, a2lFilename, dbFilename = None, parser = None):
+        """Open the SQLite database for an A2L file, (re-)importing it if the file changed.
+
+        Parameters
+        ----------
+        a2lFilename: str
+        dbFilename: str
+            Defaults to `a2lFilename` with extension `.a2ldb`.
+        parser: :class:`pya2l.a2lparser.A2LParser`
+            Used for importing, defaults to the fast recursive parser.
+        """
+        if dbFilename is None:
+            dbFilename = os.path.splitext(a2lFilename)[0] + ".a2ldb"
+        fingerprint = sourceFingerprint(a2lFilename)
+        if os.path.exists(dbFilename):
+            database = cls(dbFilename)
+            if database.meta("source") == fingerprint and database.meta("schema") == schemaFingerprint():
+                return database
+            database.close()
+        if parser is None:
+            from pya2l.a2lparser import A2LParser
+
+            parser = A2LParser(tokenizer = "fast", engine = "recursive")
+        exportDatabase(parser.parseFromFileName(a2lFilename), dbFilename)
+        database = cls(dbFilename)
+        database.conn.execute("INSERT INTO meta VALUES ('source', ?)", (fingerprint, ))
+        database.conn.commit()
+        return database
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key, )).fetchone()
+        return row[0] if row else None
+
+    @property
+    def instList(self):
+        """`(element, level)` tuples in the order of :attr:`A2LDatabase.instList`.
+        """
+        return [(element, element.level) for element in
+            self.select("SELECT {0} FROM elements ORDER BY rowid".format(COLUMNS))
+        ]
+
+    def index(self, keyword):
+        """Name lookups are answered by SQLite, s. :class:`NameIndex`.
+        """
+        return NameIndex(self, keyword)
+
+    def instances(self, keyword):
+        """Hydrated instances of `keyword` in file order, selected by SQLite.
+        """
+        for element in self.query(keyword = keyword):
+            yield element.element
+
+    def query(self, keyword = None, name = None, address = None, conversion = None):
+        """Generate the elements matching all given criteria, in file order.
+        """
+        criteria = [(column, value) for column, value in (
+            ("keyword", keyword), ("name", name), ("address", address), ("conversion", conversion)
+        ) if value is not None]
+        where = " AND ".join("{0} = ?".format(column) for column, _ in criteria)
+        statement = "SELECT {0} FROM elements{1} ORDER BY rowid".format(COLUMNS, " WHERE " + where if where else "")
+        return self.select(statement, [value for _, value in criteria])
+
+    def get(self, keyword, name):
+        """Return the element `keyword` called `name` or None.
+        """
+        return next(self.query(keyword = keyword, name = name), None)
+
+    def addressRange(self, lower, upper):
+        """Generate the elements located at `lower` <= address < `upper`.
+        """
+        return self.select("SELECT {0} FROM elements WHERE address >= ? AND address < ? ORDER BY address".format(COLUMNS),
+            (lower, upper)
+        )
+
+    def children(self, rowid):
+        return list(self.select("SELECT {0} FROM elements WHERE parent = ? ORDER BY position".format(COLUMNS), (rowid, )))
+
+    def byRowid(self, rowid):
+        return next(self.select("SELECT {0} FROM elements WHERE rowid = ?".format(COLUMNS), (rowid, )), None)
+
+    def select(self, statement, parameters = ()):
+        for row in self.conn.execute(statement, parameters):
+            yield LazyElement(self, *row)
+
+    def hydrate(self, element):
+        (data, ) = self.conn.execute("SELECT attrs FROM elements WHERE rowid = ?", (element.rowid, )).fetchone()
+        decoder = Decoder()
+        inst = classes.createInstance(element.keyword, ())
+        for attr, value in pickle.loads(bytes(data)):
+            inst.addAttribute(attr, decoder.decode(value))
+        inst.children = ChildList(self, element.rowid)
+        return inst
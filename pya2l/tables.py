@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+"""Lookup tables of COMPU_TAB, COMPU_VTAB and COMPU_VTAB_RANGE objects as sorted NumPy arrays.
+
+:func:`lookupTable` builds the arrays of a table once and keeps them on the table object;
+lookups are binary searches (`numpy.searchsorted`) over whole arrays of samples,
+i.e. O(log n) per sample.
+
+Requires NumPy (`pip install pya2l[numpy]`).
+"""
+
+import numpy as np
+
+from pya2l.decoders import valueOf
+
+
+class NumericLookup(object):
+    """COMPU_TAB: numeric input values ==> numeric output values.
+
+    Parameters
+    ----------
+    name: str
+    inValues, outValues: array-like
+        Table rows, in any order.
+    default: float or None
+        DEFAULT_VALUE_NUMERIC, returned for input values not covered by the table.
+    """
+
+    def __init__(self, name, inValues, outValues, default = None):
+        order = np.argsort(inValues, kind = "mergesort")
+        self.name = name
+        self.inValues = np.asarray(inValues, dtype = np.float64)[order]
+        self.outValues = np.asarray(outValues, dtype = np.float64)[order]
+        self.default = default
+
+    def interpolate(self, raw):
+        """Linear interpolation (TAB_INTP); values outside the table get the default or, without default,
+        the output value at the nearest end.
+        """
+        result = np.interp(raw, self.inValues, self.outValues)
+        if self.default is not None:
+            raw = np.asarray(raw)
+            result = np.where((raw < self.inValues[0]) | (raw > self.inValues[-1]), self.default, result)
+        return result
+
+    def lookup(self, raw):
+        """Lookup without interpolation (TAB_NOINTP): values not in the table get the default or, without default,
+        the output value of the greatest input value below (or of the first row).
+        """
+        raw = np.asarray(raw)
+        index = stepIndex(self.inValues, raw)
+        if self.default is None:
+            return self.outValues[index]
+        return np.where(self.inValues[index] == raw, self.outValues[index], self.default)
+
+    def inverseInterpolate(self, physical):
+        """Inverse of :meth:`interpolate`, requires strictly monotonic output values.
+        """
+        steps = np.diff(self.outValues)
+        if np.all(steps > 0):
+            return np.interp(physical, self.outValues, self.inValues)
+        elif np.all(steps < 0):
+            return np.interp(physical, self.outValues[::-1], self.inValues[::-1])
+        raise ValueError("Table '{0}' isn't invertible, its output values aren't monotonic.".format(self.name))
+
+    def inverseLookup(self, physical):
+        """Inverse of :meth:`lookup`: the input value of the greatest output value not above `physical`.
+        """
+        order = np.argsort(self.outValues, kind = "mergesort")
+        return self.inValues[order][stepIndex(self.outValues[order], np.asarray(physical))]
+
+
+class VerbalLookup(object):
+    """COMPU_VTAB: input values ==> strings.
+
+    Parameters
+    ----------
+    name: str
+    inValues: array-like
+    texts: sequence of str
+    default: str or None
+        DEFAULT_VALUE, returned for input values not in the table.
+    """
+
+    def __init__(self, name, inValues, texts, default = None):
+        order = np.argsort(inValues, kind = "mergesort")
+        self.name = name
+        self.inValues = np.asarray(inValues, dtype = np.float64)[order]
+        self.texts = np.array(texts, dtype = object)[order]
+        self.default = default
+        self.choices = np.append(self.texts, np.array([default], dtype = object))  # Index -1 ==> default.
+        self.keys = None
+
+    def lookup(self, raw):
+        """Strings of exactly matching input values.
+        """
+        raw = np.asarray(raw)
+        index = np.searchsorted(self.inValues, raw).clip(0, len(self.inValues) - 1)
+        return self.choices[np.where(self.inValues[index] == raw, index, -1)]
+
+    def values(self, texts):
+        """Input values of `texts`, the first one for strings occurring more than once.
+
+        Raises
+        ------
+        ValueError
+            Some of `texts` aren't in the table.
+        """
+        if self.keys is None:
+            keys = self.texts.astype(np.str_)
+            order = np.argsort(keys, kind = "mergesort")
+            self.keys = (keys[order], self.inValues[order])
+        keys, values = self.keys
+        texts = np.asarray(texts, dtype = np.str_)
+        index = np.searchsorted(keys, texts).clip(0, len(keys) - 1)
+        found = keys[index] == texts
+        if not np.all(found):
+            raise ValueError("Table '{0}' has no value '{1}'.".format(self.name, np.ravel(texts[~found])[0]))
+        return values[index]
+
+
+class VerbalRangeLookup(VerbalLookup):
+    """COMPU_VTAB_RANGE: ranges of input values ==> strings.
+
+    Integer samples match `minValues <= raw <= maxValues`, floating point samples `minValues <= raw < maxValues`.
+    Overlapping ranges aren't supported, the range with the greatest lower bound below the sample is checked.
+    :meth:`values` returns the lower bounds.
+    """
+
+    def __init__(self, name, minValues, maxValues, texts, default = None):
+        super(VerbalRangeLookup, self).__init__(name, minValues, texts, default)
+        order = np.argsort(minValues, kind = "mergesort")
+        self.maxValues = np.asarray(maxValues, dtype = np.float64)[order]
+
+    @property
+    def minValues(self):
+        return self.inValues
+
+    def lookup(self, raw):
+        raw = np.asarray(raw)
+        index = np.searchsorted(self.inValues, raw, side = "right") - 1
+        found = index >= 0
+        index = index.clip(0, None)
+        if raw.dtype.kind == "f":
+            found &= raw < self.maxValues[index]
+        else:
+            found &= raw <= self.maxValues[index]
+        return self.choices[np.where(found, index, -1)]
+
+
+def stepIndex(values, samples):
+    """Index of the greatest of (sorted) `values` not above each sample, 0 for samples below all `values`.
+    """
+    return (np.searchsorted(values, samples, side = "right") - 1).clip(0, None)
+
+
+def columns(table):
+    rows = getattr(table, "Triples", None) or getattr(table, "Pairs", None)
+    if not rows:
+        raise ValueError("Table '{0}' is empty.".format(valueOf(table.Name)))
+    return [[valueOf(value) for value in column] for column in zip(*rows)]
+
+
+def defaultValue(table, keyword, attr):
+    default = getattr(table, keyword, None)
+    return None if default is None else valueOf(getattr(default, attr))
+
+
+def createLookup(table):
+    keyword = table.__class__.__name__
+    name = valueOf(table.Name)
+    if keyword == "COMPU_TAB":
+        default = defaultValue(table, "DEFAULT_VALUE_NUMERIC", "Display_Value")
+        return NumericLookup(name, *columns(table), default = None if default is None else float(default))
+    elif keyword == "COMPU_VTAB":
+        return VerbalLookup(name, *columns(table), default = defaultValue(table, "DEFAULT_VALUE", "Display_String"))
+    elif keyword == "COMPU_VTAB_RANGE":
+        return VerbalRangeLookup(name, *columns(table), default = defaultValue(table, "DEFAULT_VALUE", "Display_String"))
+    raise ValueError("'{0}' isn't a conversion table.".format(keyword))
+
+
+def lookupTable(table):
+    """The :class:`NumericLookup`, :class:`VerbalLookup` or :class:`VerbalRangeLookup` of a
+    COMPU_TAB, COMPU_VTAB or COMPU_VTAB_RANGE object.
+
+    Lookups are created on first use and kept on the object (they are not pickled or cached),
+    so create a new object if its rows change.
+
+    Raises
+    ------
+    ValueError
+        The table is empty or `table` isn't a conversion table.
+    """
+    table = getattr(table, "element", table)    # :class:`pya2l.lazy.LazyBlock`
+    lookup = getattr(table, "_lookup", None)
+    if lookup is None:
+        lookup = table._lookup = createLookup(table)
+    return lookup
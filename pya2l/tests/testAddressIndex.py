@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import io
+import os
+import unittest
+
+from pya2l.a2lparser import A2LParser
+from pya2l.addressindex import AddressIndex
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+EXAMPLE = os.path.join(BASE_DIR, "1.a2l")
+
+TEST_A2L = """
+/begin PROJECT p ""
+  /begin MODULE m ""
+    /begin MOD_PAR ""
+      /begin MEMORY_SEGMENT ram "" DATA RAM INTERN 0x1000 0x100 -1 -1 -1 -1 -1
+      /end MEMORY_SEGMENT
+    /end MOD_PAR
+    /begin RECORD_LAYOUT R_UWORD
+      FNC_VALUES 1 UWORD ROW_DIR DIRECT
+    /end RECORD_LAYOUT
+    /begin RECORD_LAYOUT R_CURVE
+      NO_AXIS_PTS_X 1 UBYTE
+      AXIS_PTS_X 2 UWORD INDEX_INCR DIRECT
+      FNC_VALUES 3 SLONG ROW_DIR DIRECT
+    /end RECORD_LAYOUT
+    /begin MEASUREMENT m_array "" FLOAT32_IEEE NO_COMPU_METHOD 0 0 0 1
+      ECU_ADDRESS 0x1000
+      MATRIX_DIM 2 3 0
+    /end MEASUREMENT
+    /begin MEASUREMENT m_virtual "" UBYTE NO_COMPU_METHOD 0 0 0 1
+    /end MEASUREMENT
+    /begin CHARACTERISTIC c_blk "" VAL_BLK 0x1020 R_UWORD 0 NO_COMPU_METHOD 0 1
+      NUMBER 4
+    /end CHARACTERISTIC
+    /begin CHARACTERISTIC c_curve "" CURVE 0x1030 R_CURVE 0 NO_COMPU_METHOD 0 1
+      /begin AXIS_DESCR STD_AXIS NO_INPUT_QUANTITY NO_COMPU_METHOD 5 0 10
+      /end AXIS_DESCR
+    /end CHARACTERISTIC
+    /begin CHARACTERISTIC c_outside "" VALUE 0x10FF R_UWORD 0 NO_COMPU_METHOD 0 1
+    /end CHARACTERISTIC
+  /end MODULE
+/end PROJECT
+"""
+
+LARGE_A2L = """
+/begin PROJECT p ""
+  /begin MODULE m ""
+    /begin MOD_PAR ""
+      /begin MEMORY_SEGMENT flash "" DATA FLASH INTERN 0x0 0x100000 -1 -1 -1 -1 -1
+      /end MEMORY_SEGMENT
+      /begin MEMORY_SEGMENT flash "" DATA FLASH INTERN 0x0 0x100000 -1 -1 -1 -1 -1
+      /end MEMORY_SEGMENT
+    /end MOD_PAR
+    /begin RECORD_LAYOUT R_UBYTE
+      FNC_VALUES 1 UBYTE ROW_DIR DIRECT
+    /end RECORD_LAYOUT
+    /begin CHARACTERISTIC c_large "" VAL_BLK 0x0 R_UBYTE 0 NO_COMPU_METHOD 0 1
+      NUMBER 0x10000
+    /end CHARACTERISTIC
+{0}
+  /end MODULE
+/end PROJECT
+"""
+
+SMALL_CHARACTERISTIC = """
+    /begin CHARACTERISTIC c_{0} "" VALUE {1} R_UBYTE 0 NO_COMPU_METHOD 0 1
+    /end CHARACTERISTIC
+"""
+
+
+class TestAddressIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.db = A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(TEST_A2L))
+        self.index = AddressIndex(self.db)
+
+    def names(self, elements):
+        return [element.Name.value for element in elements]
+
+    def testSizes(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.interval(self.db.measurements["m_array"]), (0x1000, 0x1018))
+        self.assertEqual(self.index.interval(self.db.characteristics["c_blk"]), (0x1020, 0x1028))
+        self.assertEqual(self.index.interval(self.db.characteristics["c_curve"]), (0x1030, 0x1050))   # AXIS_PTS_X aligned to 0x1032.
+
+    def testOverlapping(self):
+        self.assertEqual(self.names(self.index.overlapping(0x1017)), ["m_array"])
+        self.assertEqual(self.names(self.index.overlapping(0x1018, 8)), [])
+        self.assertEqual(self.names(self.index.overlapping(0x1010, 0x30)), ["m_array", "c_blk", "c_curve"])
+        self.assertEqual(self.names(self.index.overlapping(0x104F)), ["c_curve"])
+        self.assertEqual(self.names(self.index.overlapping(0x1050)), [])
+
+    def testValidate(self):
+        self.assertEqual(self.index.segment(0x1000).Name.value, "ram")
+        self.assertIsNone(self.index.segment(0x10FF, 2))
+        self.assertEqual(self.names(self.index.validate()), ["c_outside"])
+
+    def testExampleFile(self):
+        db = A2LParser(tokenizer = "fast", engine = "recursive").parseFromFileName(EXAMPLE)
+        index = db.addressIndex
+        self.assertIs(index, db.addressIndex)
+        self.assertEqual(index.validate(), [])
+        for start, end, element in zip(index.starts, index.ends, index.elements):
+            self.assertIn(element, index.overlapping(start, end - start))
+            self.assertIn(element, index.overlapping(end - 1))
+
+
+    def testLargeObject(self):
+        small = "".join(SMALL_CHARACTERISTIC.format(idx, 0x8000 + idx * 2) for idx in range(100))
+        db = A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(LARGE_A2L.replace("{0}", small)))
+        index = AddressIndex(db)    # Identical MEMORY_SEGMENTs mustn't get compared.
+        self.assertEqual(len(index.segments), 2)
+        self.assertEqual(index.validate(), [])
+        self.assertEqual(self.names(index.overlapping(0x8004)), ["c_large", "c_2"])
+        self.assertEqual(self.names(index.overlapping(0x8005)), ["c_large"])
+        self.assertEqual(self.names(index.overlapping(0x10000)), [])
+        self.assertEqual(self.names(index.overlapping(0xFFFF, 4)), ["c_large"])
+        self.assertEqual(len(index.overlapping(0x7FFF, 0x200)), 101)
+
+
+if __name__ == '__main__':
+    unittest.main()
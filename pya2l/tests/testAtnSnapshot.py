@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+from pya2l import aml
+from pya2l import atnsnapshot
+
+
+def dfaSize(klass):
+    return sum(len(dfa._states) for dfa in klass.decisionsToDFA)
+
+
+class TestAtnSnapshot(unittest.TestCase):
+
+    def testRestored(self):
+        wrapper = aml.ParserWrapper('a2l', 'a2lFile')
+        for klass in (wrapper.lexerClass, wrapper.parserClass):
+            digest, atn, decisionsToDFA = atnsnapshot.loadSnapshot(klass.__module__)
+            self.assertEqual(digest, atnsnapshot.fingerprint(sys.modules[klass.__module__].serializedATN()))
+        self.assertGreater(dfaSize(wrapper.lexerClass), 0)
+        dfa = wrapper.lexerClass.decisionsToDFA[0]
+        self.assertIs(dfa.atnStartState, wrapper.lexerClass.atn.decisionToState[0])
+
+    def testRuntimeVersionIsPartOfKey(self):
+        data = sys.modules[aml.ParserWrapper('a2l', 'a2lFile').lexerClass.__module__].serializedATN()
+        digest = atnsnapshot.fingerprint(data)
+        runtimeVersion = atnsnapshot.runtimeVersion
+        atnsnapshot.runtimeVersion = lambda: "0.0"
+        try:
+            self.assertNotEqual(atnsnapshot.fingerprint(data), digest)
+        finally:
+            atnsnapshot.runtimeVersion = runtimeVersion
+
+    def testStaleSnapshotIsIgnored(self):
+        directory = tempfile.mkdtemp()
+        try:
+            package = os.path.join(directory, "snapshottest")
+            shutil.copytree(os.path.dirname(sys.modules["pya2l.py3"].__file__), package)
+            filename = os.path.join(package, "a2lLexer.atn")
+            with open(filename, "rb") as fp:
+                version, digest, atn, decisionsToDFA = pickle.load(fp)
+            with open(filename, "wb") as fp:
+                pickle.dump((version, "0" * len(digest), atn, decisionsToDFA), fp, protocol = 2)
+            sys.path.insert(0, directory)
+            try:
+                module = atnsnapshot.importRecognizer("snapshottest.a2lLexer")
+            finally:
+                sys.path.remove(directory)
+            self.assertEqual(dfaSize(module.a2lLexer), 0)
+        finally:
+            for name in ("snapshottest.a2lLexer", "snapshottest"):
+                sys.modules.pop(name, None)
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from pya2l import cache
+from pya2l.a2lparser import A2LParser
+from pya2l.cache import A2LCache
+from pya2l.database import A2LDatabase
+from pya2l.tests.testA2LAcceptance import TEST_A2L
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+EXAMPLE = os.path.join(BASE_DIR, "1.a2l")
+
+
+def dumpInstances(database):
+    return [(str(inst), level) for inst, level in database.instList]
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpDir = tempfile.mkdtemp()
+        self.cache = A2LCache(os.path.join(self.tmpDir, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpDir)
+
+    def parser(self):
+        return A2LParser(tokenizer = "fast", engine = "recursive", cache = self.cache)
+
+    def writeFile(self, data, name = "test.a2l"):
+        fname = os.path.join(self.tmpDir, name)
+        with io.open(fname, "w", encoding = "latin1") as of:
+            of.write(data)
+        return fname
+
+    def testRoundTrip(self):
+        walker = self.parser().parseFromFileName(EXAMPLE)
+        self.assertIsNot(type(walker), A2LDatabase)
+        database = self.parser().parseFromFileName(EXAMPLE)
+        self.assertIs(type(database), A2LDatabase)
+        self.assertEqual(dumpInstances(database), dumpInstances(walker))
+
+    def testSharedInstances(self):
+        self.parser().parseFromFileName(EXAMPLE)
+        database = self.parser().parseFromFileName(EXAMPLE)
+        instances = set(id(inst) for inst, level in database.instList)
+        project = database.instList[-1][0]
+        self.assertEqual(project.__class__.__name__, "PROJECT")
+        for child in project.children:
+            self.assertIn(id(child), instances)
+
+    def testModifiedFile(self):
+        fname = self.writeFile(TEST_A2L)
+        self.parser().parseFromFileName(fname)
+        data = TEST_A2L.replace("Module_01", "Modified")
+        self.assertNotEqual(data, TEST_A2L)
+        self.writeFile(data)
+        mtime = time.time() + 10
+        os.utime(fname, (mtime, mtime))
+        database = self.parser().parseFromFileName(fname)
+        self.assertIsNot(type(database), A2LDatabase)
+        self.assertIn("Modified", "".join(inst for inst, level in dumpInstances(database)))
+
+    def testSameContent(self):
+        first = self.writeFile(TEST_A2L, "first.a2l")
+        second = self.writeFile(TEST_A2L, "second.a2l")
+        self.assertEqual(self.cache.key(first), self.cache.key(second))
+        self.parser().parseFromFileName(first)
+        self.assertIs(type(self.parser().parseFromFileName(second)), A2LDatabase)
+
+    def testSchemaChange(self):
+        self.parser().parseFromFileName(EXAMPLE)
+        self.assertEqual(len(self.cache.entries()), 1)
+        self.cache.schema = "0" * 16
+        self.assertIsNone(self.cache.get(EXAMPLE))
+        self.parser().parseFromFileName(EXAMPLE)
+        entries = self.cache.entries()
+        self.assertEqual(len(entries), 1)
+        self.assertIn(self.cache.schema, entries[0][2])
+
+    def testEviction(self):
+        first = self.writeFile(TEST_A2L, "first.a2l")
+        second = self.writeFile(TEST_A2L.replace("Module_01", "Other"), "second.a2l")
+        self.parser().parseFromFileName(first)
+        self.cache.maxSize = self.cache.entries()[0][1]
+        self.parser().parseFromFileName(second)
+        entries = self.cache.entries()
+        self.assertEqual(len(entries), 1)
+        self.assertIn(self.cache.key(second), entries[0][2])
+
+    def testCorruptEntry(self):
+        self.parser().parseFromFileName(EXAMPLE)
+        entry = self.cache.entries()[0][2]
+        with io.open(entry, "wb") as of:
+            of.write(b"garbage")
+        self.cache.logger.silent()
+        self.assertIsNone(self.cache.get(EXAMPLE))
+        self.assertFalse(os.path.exists(entry))
+
+    def testDefaultDirectory(self):
+        os.environ["PYA2L_CACHE_DIR"] = self.tmpDir
+        try:
+            self.assertEqual(cache.defaultDirectory(), self.tmpDir)
+        finally:
+            del os.environ["PYA2L_CACHE_DIR"]
+
+
+if __name__ == '__main__':
+    unittest.main()
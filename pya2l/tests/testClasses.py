@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import pickle
+import unittest
+
+from pya2l import classes
+from pya2l.classes import ValueObject, ValueType
+
+
+class TestElementClasses(unittest.TestCase):
+
+    def testOneClassPerKeyword(self):
+        first = classes.instanceFactory("MEASUREMENT", Name = ValueObject("m1", ValueType.IDENT))
+        second = classes.instanceFactory("MEASUREMENT", Name = ValueObject("m2", ValueType.IDENT))
+        self.assertIs(type(first), type(second))
+        self.assertEqual(type(first).__name__, "MEASUREMENT")
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.attrs, second.attrs)
+        self.assertEqual(first.children, [])
+
+    def testSlots(self):
+        inst = classes.createInstance("CHARACTERISTIC", [("Name", 1)])
+        inst.addAttribute("MATRIX_DIM", 2)
+        inst.addAttribute("Name", 3)
+        self.assertEqual(inst.attrs, ("Name", "MATRIX_DIM"))
+        self.assertEqual(inst.Name, 3)
+        self.assertFalse(hasattr(inst, "Address"))
+        with self.assertRaises(AttributeError):
+            inst.NoSuchAttribute = 1
+
+    def testDuplicates(self):
+        inst = classes.createInstance("COMPU_METHOD", [("Name", 1), ("FORMULA", 2), ("FORMULA", 3)])
+        self.assertEqual(inst.attrs, ("Name", "FORMULA"))
+        self.assertEqual(inst.FORMULA, 3)
+
+    def testUnknownKeyword(self):
+        inst = classes.instanceFactory("NO_SUCH_KEYWORD", foo = 1)
+        inst.bar = 2
+        self.assertEqual(inst.attrs, ("foo", ))
+
+    def testPickle(self):
+        child = classes.instanceFactory("AXIS_DESCR", MaxAxisPoints = ValueObject(8, ValueType.INT))
+        inst = classes.instanceFactory("CHARACTERISTIC", Name = ValueObject("c", ValueType.IDENT))
+        inst.children.append(child)
+        result = pickle.loads(pickle.dumps(inst, pickle.HIGHEST_PROTOCOL))
+        self.assertIs(type(result), type(inst))
+        self.assertEqual(str(result), str(inst))
+        self.assertEqual(str(result.children[0]), str(child))
+
+
+if __name__ == '__main__':
+    unittest.main()
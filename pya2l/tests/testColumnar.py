@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import io
+import os
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pya2l.a2lparser import A2LParser
+
+TWO_MODULES = """
+/begin PROJECT p ""
+    /begin MODULE a ""
+        /begin MEASUREMENT m1 "" UBYTE NO_COMPU_METHOD 0 0 0 255 ECU_ADDRESS 0x10 /end MEASUREMENT
+        /begin MEASUREMENT m2 "" UBYTE NO_COMPU_METHOD 0 0 0 255 ECU_ADDRESS 0x11 /end MEASUREMENT
+    /end MODULE
+    /begin MODULE b ""
+        /begin MEASUREMENT m2 "" UBYTE NO_COMPU_METHOD 0 0 0 255 ECU_ADDRESS 0x20 /end MEASUREMENT
+        /begin MEASUREMENT m3 "" UBYTE NO_COMPU_METHOD 0 0 0 255 ECU_ADDRESS 0x21 /end MEASUREMENT
+    /end MODULE
+/end PROJECT
+"""
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+EXAMPLE = os.path.join(BASE_DIR, "1.a2l")
+
+
+@unittest.skipIf(np is None, "requires NumPy")
+class TestColumnarView(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = A2LParser(tokenizer = "fast", engine = "recursive").parseFromFileName(EXAMPLE)
+
+    def testMeasurements(self):
+        view = self.db.columns("MEASUREMENT")
+        self.assertIs(view, self.db.columns("MEASUREMENT"))
+        self.assertEqual(len(view), len(self.db.measurements))
+        for row, inst in enumerate(view.elements):
+            self.assertEqual(view.names[row], inst.Name.value)
+            self.assertEqual(view.address[row], inst.ECU_ADDRESS.Address.value)
+            self.assertEqual(view.datatype[row], inst.Datatype.value)
+            self.assertEqual(view.conversion[row], inst.Conversion.value)
+            self.assertEqual(view.upperLimit[row], inst.UpperLimit.value)
+            self.assertEqual(view.accuracy[row], inst.Accuracy.value)
+        self.assertTrue(view.hasAddress.all())
+
+    def testFilter(self):
+        view = self.db.columns("CHARACTERISTIC")
+        lower = 0x800609A4
+        mask = view.datatype.mask("ULONG") & (view.address >= lower)
+        expected = [inst for inst in view.elements
+            if self.db.recordLayouts[inst.Deposit.value].FNC_VALUES.Datatype.value == "ULONG" and inst.Address.value >= lower
+        ]
+        self.assertTrue(expected)
+        self.assertEqual(view.select(mask), expected)
+        self.assertEqual(view.selectNames(mask), [inst.Name.value for inst in expected])
+
+    def testRepeatedNames(self):
+        view = A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(TWO_MODULES)).columns("MEASUREMENT")
+        self.assertEqual(len(view), 4)
+        self.assertEqual([view.names[row] for row in range(len(view))], ["m1", "m2", "m2", "m3"])
+        self.assertEqual(view.selectNames(view.address >= 0x11), ["m2", "m2", "m3"])
+        self.assertEqual(view.selectNames(view.names.mask("m2")), ["m2", "m2"])
+
+    def testCategorical(self):
+        view = self.db.columns("CHARACTERISTIC")
+        self.assertEqual(set(view.type.categories.strings), set(inst.Type.value for inst in view.elements))
+        self.assertFalse(view.type.mask("NO_SUCH_TYPE").any())
+        self.assertEqual(view.type.mask("VALUE", "CURVE", "MAP").sum(), len(view))
+
+    def testInvalidKeyword(self):
+        with self.assertRaises(ValueError):
+            self.db.columns("AXIS_PTS")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+import io
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pya2l.a2lparser import A2LParser
+
+DATA = """
+/begin PROJECT p "" /begin MODULE m ""
+    /begin MOD_PAR "" SYSTEM_CONSTANT "offset" "100" SYSTEM_CONSTANT "gain" "0.25" /end MOD_PAR
+    /begin COMPU_METHOD ident "" IDENTICAL "%4.2" "" /end COMPU_METHOD
+    /begin COMPU_METHOD lin "" LINEAR "%4.2" "" COEFFS_LINEAR 0.5 -10 /end COMPU_METHOD
+    /begin COMPU_METHOD rat "" RAT_FUNC "%4.2" "" COEFFS 0 4 8 0 0 2 /end COMPU_METHOD
+    /begin COMPU_METHOD quad "" RAT_FUNC "%4.2" "" COEFFS 1 0 0 0 0 1 /end COMPU_METHOD
+    /begin COMPU_METHOD intp "" TAB_INTP "%4.2" "" COMPU_TAB_REF tab /end COMPU_METHOD
+    /begin COMPU_METHOD nointp "" TAB_NOINTP "%4.2" "" COMPU_TAB_REF tab /end COMPU_METHOD
+    /begin COMPU_METHOD verb "" TAB_VERB "%4.2" "" COMPU_TAB_REF vtab /end COMPU_METHOD
+    /begin COMPU_METHOD range "" TAB_VERB "%4.2" "" COMPU_TAB_REF vtabRange /end COMPU_METHOD
+    /begin COMPU_METHOD form "" FORM "%4.2" ""
+        /begin FORMULA "X1 * sysc(gain) + sysc(offset)" FORMULA_INV "(X1 - sysc(offset)) / sysc(gain)" /end FORMULA
+    /end COMPU_METHOD
+    /begin COMPU_METHOD formOnly "" FORM "%4.2" "" /begin FORMULA "sin(X1)" /end FORMULA /end COMPU_METHOD
+    /begin COMPU_TAB tab "" TAB_INTP 3 10 1.0 0 0.0 20 4.0 /end COMPU_TAB
+    /begin COMPU_VTAB vtab "" TAB_VERB 3 2 "two" 0 "zero" 1 "one" DEFAULT_VALUE "unknown" /end COMPU_VTAB
+    /begin COMPU_VTAB_RANGE vtabRange "" 2 0 9 "low" 10 99 "high" /end COMPU_VTAB_RANGE
+/end MODULE /end PROJECT"""
+
+
+@unittest.skipIf(np is None, "requires NumPy")
+class TestConversion(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(DATA))
+
+    def check(self, name, raw, physical):
+        conversion = self.db.conversion(name)
+        self.assertEqual(conversion(raw).tolist(), physical)
+        self.assertEqual(conversion.toRaw(physical).tolist(), raw)
+
+    def testArithmetic(self):
+        self.check("ident", [1, 2, 3], [1, 2, 3])
+        self.check("lin", [0.0, 20.0, 40.0], [-10.0, 0.0, 10.0])
+        self.check("rat", [-4.0, 0.0, 8.0], [-4.0, -2.0, 2.0])     # raw = (4 * phys + 8) / 2
+        self.assertEqual(self.db.conversion("quad").toRaw([3.0]).tolist(), [9.0])
+        self.assertRaises(ValueError, self.db.conversion("quad").toPhysical, [9.0])
+
+    def testTables(self):
+        self.check("intp", [0.0, 5.0, 10.0, 20.0], [0.0, 0.5, 1.0, 4.0])
+        self.assertEqual(self.db.conversion("intp")([-1, 30]).tolist(), [0.0, 4.0])
+        self.assertEqual(self.db.conversion("nointp")([-1, 0, 5, 10, 19, 30]).tolist(), [0.0, 0.0, 0.0, 1.0, 1.0, 4.0])
+
+    def testVerbalTables(self):
+        self.check("verb", [0.0, 1.0, 2.0], ["zero", "one", "two"])
+        self.assertEqual(self.db.conversion("verb")([1, 7]).tolist(), ["one", "unknown"])
+        self.assertEqual(self.db.conversion("range")([-1, 0, 9, 10, 99, 100]).tolist(),
+            [None, "low", "low", "high", "high", None]
+        )
+        self.assertEqual(self.db.conversion("range").toRaw(["high", "low"]).tolist(), [10.0, 0.0])
+        self.assertRaises(ValueError, self.db.conversion("verb").toRaw, "three")
+
+    def testFormulas(self):
+        self.check("form", [0.0, 4.0, -400.0], [100.0, 101.0, 0.0])
+        self.assertEqual(self.db.systemConstants, {"offset": "100", "gain": "0.25"})
+        self.assertEqual(self.db.conversion("formOnly")([0.0]).tolist(), [0.0])
+        self.assertRaises(ValueError, self.db.conversion("formOnly").toRaw, [0.0])
+
+    def testCache(self):
+        self.assertIs(self.db.conversion("lin"), self.db.conversion("lin"))
+        self.assertRaises(KeyError, self.db.conversion, "missing")
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
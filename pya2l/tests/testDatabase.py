@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import os
+import unittest
+
+from pya2l.a2lparser import A2LParser
+from pya2l.database import A2LDatabase
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+EXAMPLE = os.path.join(BASE_DIR, "1.a2l")
+
+
+class TestNameIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = A2LParser(tokenizer = "fast", engine = "recursive").parseFromFileName(EXAMPLE)
+
+    def testLookups(self):
+        measurement = self.db.measurements["TST_TRIM_u8TstMod"]
+        self.assertEqual(measurement.__class__.__name__, "MEASUREMENT")
+        self.assertEqual(self.db.compuMethods[measurement.Conversion.value].Name.value, measurement.Conversion.value)
+        self.assertEqual(len(self.db.measurements), 6)
+        self.assertEqual(len(self.db.compuMethods), 47)
+        self.assertNotIn("TST_TRIM_u8TstMod", self.db.characteristics)
+        for name, characteristic in self.db.characteristics.items():
+            self.assertEqual(characteristic.Name.value, name)
+            self.assertIn(characteristic.Deposit.value, self.db.recordLayouts)
+        self.assertEqual(self.db.axisPts, {})
+
+    def testBuiltOnce(self):
+        self.assertIs(self.db.measurements, self.db.measurements)
+
+    def testRebuiltOnChange(self):
+        db = A2LDatabase(list(self.db.instList))
+        measurements = db.measurements
+        db.instList = [(inst, level) for inst, level in db.instList if inst is None or inst.__class__.__name__ != "MEASUREMENT"]
+        db.instList.append((None, 0))
+        self.assertEqual(len(measurements), 6)
+        self.assertEqual(db.measurements, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from pya2l.formula import FormulaSyntaxError, compileFormula
+
+
+@unittest.skipIf(np is None, "requires NumPy")
+class TestFormula(unittest.TestCase):
+
+    def evaluate(self, text, *args, **kws):
+        return compileFormula(text)(*[np.array(arg) for arg in args], **kws).tolist()
+
+    def testArithmetic(self):
+        self.assertEqual(self.evaluate("X1 * 0.5 + 1", [0, 2, 4]), [1.0, 2.0, 3.0])
+        self.assertEqual(self.evaluate("X * 2", [1, 2]), [2.0, 4.0])
+        self.assertEqual(self.evaluate("-X1 + 3 * (2 + 1)", [1, 2]), [8.0, 7.0])
+        self.assertEqual(self.evaluate("2 * 3 - 4 / 2", [1, 2]), [4.0, 4.0])
+        self.assertEqual(self.evaluate("X1 - X2 - X3", [10], [3], [2]), [5.0])
+        self.assertEqual(self.evaluate("0x10 + 1.5e1", [0]), [31.0])
+
+    def testOperators(self):
+        self.assertEqual(self.evaluate("(X1 & 0x3) << 2 | 1", [5, 6]), [5, 9])
+        self.assertEqual(self.evaluate("X1 ^ 1", [2]), [3])
+        self.assertEqual(self.evaluate("X1 >= 2 && !(X1 == 3)", [1, 2, 3]), [False, True, False])
+        self.assertEqual(self.evaluate("X1 < 2 || X1 > 2", [1, 2, 3]), [True, False, True])
+
+    def testFunctions(self):
+        self.assertEqual(self.evaluate("sqrt(pow(X1, 2))", [-3.0]), [3.0])
+        self.assertEqual(self.evaluate("abs(X1) + floor(0.5) + ceil(0.5)", [-2.0]), [3.0])
+        self.assertAlmostEqual(self.evaluate("sin(X1) + cos(X1)", [0.0])[0], 1.0)
+
+    def testSystemConstants(self):
+        formula = compileFormula("X1 + sysc(offset) * sysc(\"gain\")")
+        self.assertEqual(formula.systemConstants, frozenset(["offset", "gain"]))
+        self.assertEqual(formula(np.array([1.0]), systemConstants = {"offset": "2", "gain": 3}).tolist(), [7.0])
+        self.assertRaises(ValueError, formula, np.array([1.0]), systemConstants = {"offset": "2"})
+
+    def testCache(self):
+        self.assertIs(compileFormula("X1 / 7"), compileFormula("X1 / 7"))
+        self.assertEqual(compileFormula("X3 + X1").arity, 3)
+        self.assertRaises(ValueError, compileFormula("X3 + X1"), np.array([1.0]))
+
+    def testSyntaxErrors(self):
+        for text in ("X1 +", "(X1", "X1 $ 2", "X0", "eval(X1)", "__import__('os')", "X1.real", "X1 2"):
+            self.assertRaises(FormulaSyntaxError, compileFormula, text)
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
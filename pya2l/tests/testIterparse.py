@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import io
+import os
+import unittest
+
+from pya2l.a2lparser import A2LParser, iterparse
+from pya2l.tokenizer import A2LTokenizer
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+EXAMPLE = os.path.join(BASE_DIR, "1.a2l")
+
+
+def readExample():
+    return io.open(EXAMPLE, encoding = "latin1").read()
+
+
+class TestIterparse(unittest.TestCase):
+
+    def testEndEvents(self):
+        walker = A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(readExample()))
+        expected = [str(inst) for inst, level in walker.instList if inst is not None]
+        result = [str(element) for event, element in iterparse(EXAMPLE)]
+        self.assertEqual(result, expected)
+
+    def testBeginEndIdentity(self):
+        begun = []
+        for event, element in iterparse(EXAMPLE, events = ("begin", "end"), tags = {"COMPU_METHOD"}):
+            if event == "begin":
+                begun.append(element)
+            else:
+                self.assertIs(element, begun[-1])
+                self.assertTrue(hasattr(element, "Format"))
+        self.assertEqual(len(begun), 47)
+
+    def testTags(self):
+        names = [element.Name for event, element in iterparse(EXAMPLE, tags = {"MEASUREMENT"})]
+        self.assertEqual(len(names), 6)
+
+    def testChildrenAttached(self):
+        modules = [element for event, element in iterparse(EXAMPLE, tags = {"MODULE"})]
+        self.assertEqual(len(modules), 1)
+        self.assertTrue(modules[0].children)
+
+    def testSkip(self):
+        parser = iterparse(EXAMPLE, events = ("begin", "end"), tags = {"MODULE", "MEASUREMENT"})
+        events = []
+        for event, element in parser:
+            events.append(event)
+            if event == "begin" and element.Name.value != "TCU_F8AT":
+                parser.skip()
+        self.assertEqual(events.count("begin"), 7)
+        self.assertEqual(events.count("end"), 1)
+
+    def testInvalidEvent(self):
+        with self.assertRaises(ValueError):
+            iterparse(EXAMPLE, events = ("start", ))
+
+
+class TestChunkedTokenizer(unittest.TestCase):
+
+    DATA = '''ASAP2_VERSION 1 60
+/begin PROJECT p ""
+  /begin A2ML
+    block "IF_DATA" taggedunion { "X" struct { uint; }; };
+  /end A2ML
+  /* comment
+     spanning lines */ /begin MODULE m "a \\" string"
+  /end MODULE
+/end PROJECT
+'''
+
+    def tokens(self, data, **kws):
+        return list(A2LTokenizer(data, **kws).tokens())
+
+    def testChunkSizes(self):
+        expected = self.tokens(self.DATA, skipA2ML = True)
+        self.assertNotIn("A2ML", [token.text for token in expected])
+        for chunkSize in (1, 7, 64, 4096):
+            self.assertEqual(self.tokens(io.StringIO(self.DATA), skipA2ML = True, chunkSize = chunkSize), expected)
+
+    def testExampleFile(self):
+        data = readExample()
+        expected = self.tokens(data)
+        self.assertEqual(self.tokens(io.StringIO(data), chunkSize = 333), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
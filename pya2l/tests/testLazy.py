@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pya2l.a2lparser import A2LParser, A2LSyntaxError
+from pya2l.lazy import LazyBlock
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+EXAMPLE = os.path.join(BASE_DIR, "1.a2l")
+
+
+class TestLazy(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = A2LParser(tokenizer = "fast", engine = "recursive")
+        self.database = self.parser.parseLazy(EXAMPLE)
+
+    def tearDown(self):
+        self.database.close()
+
+    def testNothingParsedUpFront(self):
+        blocks = self.database.blocks
+        self.assertEqual(len(blocks), 305)
+        self.assertFalse(any(block.materialized for block in blocks))
+        measurement = self.database.index("MEASUREMENT")["TST_TRIM_af32o_O[6]"]
+        self.assertIsInstance(measurement, LazyBlock)
+        self.assertFalse(measurement.materialized)
+        self.assertEqual(measurement.Name.value, "TST_TRIM_af32o_O[6]")
+        self.assertEqual([block for block in blocks if block.materialized], [measurement])
+
+    def testParity(self):
+        module = [inst for inst, _ in self.parser.parseFromFileName(EXAMPLE).instList
+            if inst.__class__.__name__ == "MODULE"][0]
+        lazyModule = self.database.instList[-1][0].children[1]
+        self.assertEqual(lazyModule.Name.value, "TCU_F8AT")
+        self.assertEqual([str(block) for block in lazyModule.children], [str(child) for child in module.children])
+        self.assertEqual([inst.__class__.__name__ for inst, _ in self.database.instList if inst.__class__ is not LazyBlock],
+            [None.__class__.__name__, "HEADER", "MODULE", "PROJECT"]
+        )
+
+    def testAddressIndex(self):
+        full = self.parser.parseFromFileName(EXAMPLE).addressIndex
+        lazy = self.database.addressIndex
+        self.assertEqual(len(lazy), len(full))
+        self.assertGreater(len(lazy), 0)
+        self.assertEqual([(lazy.interval(inst), inst.Name.value) for inst in lazy.elements],
+            [(full.interval(inst), inst.Name.value) for inst in full.elements]
+        )
+        self.assertEqual([start for start, _, _ in lazy.segments], [start for start, _, _ in full.segments])
+
+    @unittest.skipIf(np is None, "requires NumPy")
+    def testColumns(self):
+        full = self.parser.parseFromFileName(EXAMPLE).columns("MEASUREMENT")
+        lazy = self.database.columns("MEASUREMENT")
+        self.assertGreater(len(lazy), 0)
+        self.assertEqual(len(lazy), len(full))
+        self.assertEqual(lazy.address.tolist(), full.address.tolist())
+        self.assertEqual([lazy.datatype[row] for row in range(len(lazy))], [full.datatype[row] for row in range(len(full))])
+
+
+class TestUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "update.a2l")
+        with io.open(EXAMPLE, "rb") as inf:
+            self.data = inf.read()
+        self.write(self.data)
+        self.parser = A2LParser(tokenizer = "fast", engine = "recursive")
+        self.database = self.parser.parseLazy(self.filename)
+
+    def tearDown(self):
+        self.database.close()
+        shutil.rmtree(self.directory)
+
+    def write(self, data):
+        with io.open(self.filename, "wb") as of:
+            of.write(data)
+
+    def assertSameAsFresh(self):
+        with self.parser.parseLazy(self.filename) as fresh:
+            self.assertEqual([(block.keyword, block.name, block.start, block.end, block.line) for block in self.database.blocks],
+                [(block.keyword, block.name, block.start, block.end, block.line) for block in fresh.blocks]
+            )
+            self.assertEqual(self.database.tailDigest, fresh.tailDigest)
+            self.assertEqual(sorted(self.database.index("MEASUREMENT")), sorted(fresh.index("MEASUREMENT")))
+
+    def testChangedBlock(self):
+        measurement = self.database.index("MEASUREMENT")["TST_TRIM_af32o_O[6]"]
+        compuMethod = measurement.Conversion.value
+        cm = self.database.index("COMPU_METHOD")[compuMethod]
+        cm.element
+        references = self.database.crossReferences
+        users = references.users(cm)
+        self.assertIn(measurement.element, users)
+        pos = self.data.index(b"/begin COMPU_METHOD " + compuMethod.encode("ascii"))
+        self.write(self.data[ : pos] + b"\n\n" + self.data[pos : ].replace(b'"%', b'"%1', 1))
+        changes = self.database.updateFrom(self.filename)
+        self.assertEqual(changes.removed, [cm])
+        self.assertEqual(len(changes.added), 1)
+        newCm = changes.added[0]
+        self.assertTrue(newCm.materialized)
+        self.assertTrue(measurement.materialized)  # Unchanged blocks are kept.
+        self.assertIs(self.database.index("COMPU_METHOD")[compuMethod], newCm)
+        self.assertIs(self.database.crossReferences, references)
+        self.assertEqual(references.users(newCm), users)
+        self.assertIs(measurement.Conversion.target, newCm)
+        self.assertNotIn(cm, references.referencedBy)
+        self.assertSameAsFresh()
+
+    def testInsertAndDelete(self):
+        pos = self.data.index(b"/begin MEASUREMENT")
+        end = self.data.index(b"/end MEASUREMENT", pos) + len(b"/end MEASUREMENT")
+        self.write(self.data[ : pos] + b'/begin COMPU_METHOD NEW_CM "" IDENTICAL "%4.2" ""\n/end COMPU_METHOD' + self.data[end : ])
+        changes = self.database.updateFrom(self.filename)
+        self.assertEqual([block.name for block in changes.removed], ["TST_TRIM_af32o_O[6]"])
+        self.assertEqual([block.name for block in changes.added], ["NEW_CM"])
+        module = self.database.instList[-1][0].children[1]
+        self.assertIn(changes.added[0], module.children)
+        self.assertEqual(len(module.children), 305)
+        self.assertSameAsFresh()
+
+    def testUnchanged(self):
+        self.write(self.data)
+        self.assertEqual(self.database.updateFrom(self.filename), ([], []))
+
+    def testStructuralChange(self):
+        self.write(self.data.replace(b"/begin PROJECT", b"/begin PROJECT\n", 1))
+        changes = self.database.updateFrom(self.filename)
+        self.assertEqual(len(changes.removed), 305)
+        self.assertEqual(len(changes.added), 305)
+        self.assertSameAsFresh()
+
+
+class TestErrors(unittest.TestCase):
+
+    def testLineNumbers(self):
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, "broken.a2l")
+            with io.open(filename, "w") as fp:
+                fp.write(u'/begin PROJECT p ""\n/begin MODULE m ""\n/begin COMPU_METHOD cm\n""\nIDENTICAL "%4.2" "" /end "x"'
+                    u'\n/end COMPU_METHOD\n/end MODULE\n/end PROJECT\n'
+                )
+            with A2LParser().parseLazy(filename) as database:
+                block = database.index("COMPU_METHOD")["cm"]
+                with self.assertRaises(A2LSyntaxError) as context:
+                    block.element
+                self.assertTrue(str(context.exception).startswith("5:"))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
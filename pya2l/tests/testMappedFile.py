@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from pya2l.a2lparser import A2LParser
+from pya2l.tests.testA2LAcceptance import TEST_A2L
+from pya2l.tokenizer import MappedFile, a2mlRegions
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+EXAMPLE = os.path.join(BASE_DIR, "1.a2l")
+
+
+def dumpInstances(walker):
+    return [(str(inst), level) for inst, level in walker.instList]
+
+
+class TestMappedFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpDir)
+
+    def writeFile(self, data):
+        fname = os.path.join(self.tmpDir, "test.a2l")
+        with io.open(fname, "wb") as of:
+            of.write(data)
+        return fname
+
+    def readAll(self, fp, size):
+        result = []
+        while True:
+            chunk = fp.read(size)
+            if not chunk:
+                return ''.join(result)
+            result.append(chunk)
+
+    def testA2MLRegions(self):
+        data = b"a /begin A2ML x /end A2ML b /begin  A3ML\n/end A3ML /begin A2ML"
+        self.assertEqual(a2mlRegions(data), [(2, 25), (28, 50)])
+
+    def testA2MLReplacedByNewlines(self):
+        fname = self.writeFile(b"x\n/begin A2ML\n\n/end A2ML y\n/begin A2ML z")
+        for size in (1, 3, 100):
+            with MappedFile(fname) as fp:
+                self.assertEqual(self.readAll(fp, size), u"x\n\n\n y\n/begin A2ML z")
+
+    def testExampleFile(self):
+        with io.open(EXAMPLE, "rb") as inf:
+            text = inf.read().decode("latin1")
+        with MappedFile(EXAMPLE, skipA2ML = False) as fp:
+            self.assertEqual(self.readAll(fp, 4096), text)
+        with MappedFile(EXAMPLE) as fp:
+            stripped = self.readAll(fp, 4096)
+        self.assertNotIn(u"/begin A2ML", stripped)
+        self.assertEqual(stripped.count(u'\n'), text.count(u'\n'))
+
+    def testEmptyFile(self):
+        with MappedFile(self.writeFile(b"")) as fp:
+            self.assertEqual(fp.read(), u"")
+
+    def testParseFromFileName(self):
+        expected = dumpInstances(A2LParser().parse(io.open(EXAMPLE, encoding = "latin1")))
+        for tokenizer in A2LParser.TOKENIZERS:
+            for engine in A2LParser.ENGINES:
+                parser = A2LParser(tokenizer = tokenizer, engine = engine)
+                self.assertEqual(dumpInstances(parser.parseFromFileName(EXAMPLE)), expected)
+
+    def testNoTrailingNewline(self):
+        data = TEST_A2L.rstrip()
+        fname = self.writeFile(data.encode("latin1"))
+        expected = dumpInstances(A2LParser(tokenizer = "fast", engine = "recursive").parseFromFileName(fname))
+        self.assertTrue(expected)
+        walker = A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(data))
+        self.assertEqual(dumpInstances(walker), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
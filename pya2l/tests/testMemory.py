@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+import io
+import struct
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pya2l.a2lparser import A2LParser
+
+if np is not None:
+    from pya2l.memory import ImageDecoder
+
+DATA = """
+/begin PROJECT p "" /begin MODULE m ""
+    /begin MOD_COMMON "" BYTE_ORDER MSB_LAST ALIGNMENT_WORD 2 ALIGNMENT_LONG 4 /end MOD_COMMON
+    /begin COMPU_METHOD half "" LINEAR "%4.2" "" COEFFS_LINEAR 0.5 0 /end COMPU_METHOD
+    /begin RECORD_LAYOUT word FNC_VALUES 1 UWORD COLUMN_DIR DIRECT /end RECORD_LAYOUT
+    /begin RECORD_LAYOUT byteRow FNC_VALUES 1 UBYTE ROW_DIR DIRECT /end RECORD_LAYOUT
+    /begin RECORD_LAYOUT map
+        NO_AXIS_PTS_X 1 UBYTE
+        NO_AXIS_PTS_Y 2 UBYTE
+        AXIS_PTS_X 3 UWORD INDEX_INCR DIRECT
+        AXIS_PTS_Y 4 UBYTE INDEX_INCR DIRECT
+        FNC_VALUES 5 ULONG COLUMN_DIR DIRECT
+    /end RECORD_LAYOUT
+    /begin RECORD_LAYOUT axis NO_AXIS_PTS_X 1 UBYTE AXIS_PTS_X 2 UBYTE INDEX_INCR DIRECT /end RECORD_LAYOUT
+    /begin RECORD_LAYOUT static
+        NO_AXIS_PTS_X 1 UBYTE AXIS_PTS_X 2 UBYTE INDEX_INCR DIRECT FNC_VALUES 3 UBYTE COLUMN_DIR DIRECT STATIC_RECORD_LAYOUT
+    /end RECORD_LAYOUT
+    /begin RECORD_LAYOUT staged
+        NO_AXIS_PTS_X 1 UBYTE AXIS_PTS_X 2 UBYTE INDEX_INCR DIRECT
+        NO_AXIS_PTS_Y 3 UBYTE AXIS_PTS_Y 4 UBYTE INDEX_INCR DIRECT
+        FNC_VALUES 5 UBYTE COLUMN_DIR DIRECT
+    /end RECORD_LAYOUT
+    /begin RECORD_LAYOUT late FNC_VALUES 1 UBYTE COLUMN_DIR DIRECT NO_AXIS_PTS_X 2 UBYTE /end RECORD_LAYOUT
+    /begin CHARACTERISTIC value "" VALUE 0x1000 word 0 half 0 100 BYTE_ORDER MSB_FIRST /end CHARACTERISTIC
+    /begin CHARACTERISTIC map "" MAP 0x1010 map 0 NO_COMPU_METHOD 0 100
+        /begin AXIS_DESCR STD_AXIS NO_INPUT_QUANTITY NO_COMPU_METHOD 4 0 100 /end AXIS_DESCR
+        /begin AXIS_DESCR STD_AXIS NO_INPUT_QUANTITY half 4 0 100 /end AXIS_DESCR
+    /end CHARACTERISTIC
+    /begin CHARACTERISTIC curve "" CURVE 0x1040 byteRow 0 NO_COMPU_METHOD 0 100
+        /begin AXIS_DESCR COM_AXIS NO_INPUT_QUANTITY NO_COMPU_METHOD 3 0 100 AXIS_PTS_REF axisPts /end AXIS_DESCR
+    /end CHARACTERISTIC
+    /begin AXIS_PTS axisPts "" 0x1050 NO_INPUT_QUANTITY axis 0 half 3 0 100 /end AXIS_PTS
+    /begin CHARACTERISTIC fixCurve "" CURVE 0x1080 byteRow 0 NO_COMPU_METHOD 0 100
+        /begin AXIS_DESCR FIX_AXIS NO_INPUT_QUANTITY NO_COMPU_METHOD 3 0 100 FIX_AXIS_PAR_DIST 5 10 3 /end AXIS_DESCR
+    /end CHARACTERISTIC
+    /begin CHARACTERISTIC staged "" MAP 0x1090 staged 0 NO_COMPU_METHOD 0 100
+        /begin AXIS_DESCR STD_AXIS NO_INPUT_QUANTITY NO_COMPU_METHOD 3 0 100 /end AXIS_DESCR
+        /begin AXIS_DESCR STD_AXIS NO_INPUT_QUANTITY NO_COMPU_METHOD 3 0 100 /end AXIS_DESCR
+    /end CHARACTERISTIC
+    /begin CHARACTERISTIC block "" VAL_BLK 0x1060 byteRow 0 NO_COMPU_METHOD 0 100 MATRIX_DIM 2 3 1 /end CHARACTERISTIC
+    /begin CHARACTERISTIC text "" ASCII 0x1070 byteRow 0 NO_COMPU_METHOD 0 100 NUMBER 8 /end CHARACTERISTIC
+/end MODULE /end PROJECT"""
+
+
+def image():
+    result = bytearray(0x100)
+    result[0x00 : 0x02] = struct.pack(">H", 258)
+    result[0x10 : 0x12] = bytes(bytearray([2, 3]))
+    result[0x12 : 0x16] = struct.pack("<HH", 10, 20)      # Aligned to a word.
+    result[0x16 : 0x19] = bytes(bytearray([2, 4, 6]))
+    result[0x1C : 0x34] = struct.pack("<6I", 1, 2, 3, 4, 5, 6)      # Aligned to a long.
+    result[0x40 : 0x43] = bytes(bytearray([7, 8, 9]))
+    result[0x50 : 0x54] = bytes(bytearray([3, 2, 4, 6]))
+    result[0x60 : 0x66] = bytes(bytearray(range(6)))
+    result[0x70 : 0x78] = b"hello\0\0\0"
+    result[0x80 : 0x83] = bytes(bytearray([1, 2, 3]))
+    result[0x90 : 0x9A] = bytes(bytearray([2, 10, 20, 2, 1, 2, 5, 6, 7, 8]))
+    return bytes(result)
+
+
+@unittest.skipIf(np is None, "requires NumPy")
+class TestImageDecoder(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        db = A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(DATA))
+        cls.decoder = ImageDecoder(db, image(), 0x1000)
+
+    def testValue(self):
+        value = self.decoder.decode("value")
+        self.assertEqual((value.raw, value.physical), (258, 129.0))
+
+    def testMap(self):
+        value = self.decoder.decode("map")
+        self.assertEqual(value.physical.tolist(), [[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(value.axes[0].physical.tolist(), [10, 20])
+        self.assertEqual(value.axes[1].physical.tolist(), [1.0, 2.0, 3.0])
+        self.assertIsNotNone(value.raw.base)   # A view of the image.
+
+    def testAxes(self):
+        curve = self.decoder.decode("curve")
+        self.assertEqual(curve.physical.tolist(), [7, 8, 9])
+        self.assertEqual(curve.axes[0].physical.tolist(), [1.0, 2.0, 3.0])
+        fixCurve = self.decoder.decode("fixCurve")
+        self.assertEqual(fixCurve.axes[0].physical.tolist(), [5, 15, 25])
+
+    def testStagedCounts(self):
+        value = self.decoder.decode("staged")     # NO_AXIS_PTS_Y follows AXIS_PTS_X.
+        self.assertEqual(value.raw.tolist(), [[5, 6], [7, 8]])
+        self.assertEqual([axis.raw.tolist() for axis in value.axes], [[10, 20], [1, 2]])
+
+    def testBlocks(self):
+        self.assertEqual(self.decoder.decode("block").physical.tolist(), [[0, 2, 4], [1, 3, 5]])
+        self.assertEqual(self.decoder.decode("text").physical, "hello")
+
+    def testValues(self):
+        values = self.decoder.values()
+        self.assertEqual(sorted(values), ["block", "curve", "fixCurve", "map", "staged", "text", "value"])
+        self.assertRaises(ValueError, ImageDecoder(self.decoder.database, image()[ : 0x20], 0x1000).decode, "curve")
+
+    def testPlans(self):
+        plans = self.decoder.database.layoutPlans
+        self.assertIs(plans, self.decoder.plans)
+        plan = plans.plan("map", 0x1010, [4, 4], points = [2, 3])
+        self.assertEqual(plan.offsets, {"NO_AXIS_PTS_X": 0, "NO_AXIS_PTS_Y": 1, "AXIS_PTS_X": 2, "AXIS_PTS_Y": 6, "FNC_VALUES": 12})
+        self.assertEqual(plan.size, 36)
+        self.assertIs(plans.plan("map", 0x2030, (4, 4), points = (2, 3)), plan)     # Equal alignment phase.
+        self.assertEqual(plans.plan("map", 0x1011, [4, 4], points = [2, 3]).offsets["AXIS_PTS_X"], 3)
+        self.assertEqual(plans.plan("map", 0x1010, [4, 4]).counted, [0, 1])
+        static = plans.plan("static", 0, [4], points = [2])
+        self.assertEqual((static.offsets["FNC_VALUES"], static.size), (5, 9))
+        self.assertEqual(plans.plan("staged", 0, [3, 3]).dependencies, {0: frozenset(), 1: frozenset([0])})
+        self.assertEqual(plans.plan("late", 0, [4]).dependencies, {0: frozenset([0])})
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+import six
+
+from pya2l.a2lparser import A2LParser, A2LSyntaxError
+from pya2l.database import A2LDatabase
+from pya2l import parallel
+from pya2l.parallel import makeChunks, parseMany, parseParallel, prescan
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+EXAMPLE = os.path.join(BASE_DIR, "1.a2l")
+
+TEXT = b"""ASAP2_VERSION 1 60
+/begin PROJECT P ""
+  /begin MODULE M ""
+    /* /begin MEASUREMENT commented out */
+    /begin COMPU_METHOD CM1 "/end COMPU_METHOD" IDENTICAL "%4.2" "" /end COMPU_METHOD
+    /begin COMPU_METHOD CM2 "" IDENTICAL "%4.2" "" /end COMPU_METHOD
+  /end MODULE
+/end PROJECT
+"""
+
+
+def crashingWorker(filename, options):
+    """:func:`pya2l.parallel.parseInWorker` killing its process on "crash.a2l".
+    """
+    if os.path.basename(filename) == "crash.a2l":
+        os._exit(1)
+    return parseInWorker(filename, options)
+
+parseInWorker = parallel.parseInWorker
+
+
+def dump(walker):
+    return [(str(inst), level) for inst, level in walker.instList]
+
+
+class TestPrescan(unittest.TestCase):
+
+    def testBlocks(self):
+        blocks = prescan(TEXT)
+        self.assertEqual(len(blocks), 2)
+        for parent, start, end, level in blocks:
+            self.assertEqual(TEXT[parent : parent + 13], b"/begin MODULE")
+            self.assertTrue(TEXT[start : end].startswith(b"/begin COMPU_METHOD"))
+            self.assertTrue(TEXT[start : end].endswith(b"/end COMPU_METHOD"))
+            self.assertEqual(level, 2)
+        self.assertEqual(makeChunks(blocks, 1), [blocks[0][1 : ], blocks[1][1 : ]])
+        self.assertEqual(makeChunks(blocks, 1000), [(blocks[0][1], blocks[1][2], 2)])
+
+    def testMismatch(self):
+        self.assertIsNone(prescan(TEXT.replace(b"/end MODULE", b"/end PROJECT")))
+
+
+class TestParseParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = A2LParser(tokenizer = "fast", engine = "recursive")
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testParity(self):
+        expected = dump(self.parser.parseFromFileName(EXAMPLE))
+        with ProcessPoolExecutor(2) as executor:
+            walker = parseParallel(self.parser, EXAMPLE, executor = executor, chunkSize = 16 * 1024, minFileSize = 0)
+        self.assertEqual(dump(walker), expected)
+        module = walker.instList[-1][0].children[1]
+        self.assertEqual(module.Name.value, "TCU_F8AT")
+
+    def testSyntaxErrorFallsBack(self):
+        filename = os.path.join(self.directory, "broken.a2l")
+        with io.open(filename, "wb") as fp:
+            fp.write(TEXT.replace(b'CM2 ""', b'CM2 "" /end "x"'))
+        with six.assertRaisesRegex(self, A2LSyntaxError, "^6:36: "):
+            parseParallel(self.parser, filename, workers = 1, minFileSize = 0)
+
+    def testSmallFileIsParsedSerially(self):
+        parser = A2LParser(tokenizer = "fast", engine = "recursive", workers = 2)
+        self.assertEqual(dump(parser.parseFromFileName(EXAMPLE)), dump(self.parser.parseFromFileName(EXAMPLE)))
+
+
+class TestParseMany(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = A2LParser(tokenizer = "fast", engine = "recursive")
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testErrorsAreIsolated(self):
+        good = os.path.join(self.directory, "good.a2l")
+        broken = os.path.join(self.directory, "broken.a2l")
+        with io.open(good, "wb") as fp:
+            fp.write(TEXT)
+        with io.open(broken, "wb") as fp:
+            fp.write(TEXT.replace(b"/end PROJECT", b""))
+        filenames = [good, broken, EXAMPLE, os.path.join(self.directory, "missing.a2l")]
+        results = dict((result.filename, result) for result in self.parser.parseMany(filenames, workers = 2))
+        self.assertEqual(sorted(results), sorted(filenames))
+        self.assertIsInstance(results[broken].error, A2LSyntaxError)
+        self.assertIsInstance(results[filenames[-1]].error, EnvironmentError)
+        for filename in (good, EXAMPLE):
+            database = results[filename].database
+            self.assertIsNone(results[filename].error)
+            self.assertIs(type(database), A2LDatabase)
+            self.assertEqual(dump(database), dump(self.parser.parseFromFileName(filename)))
+
+    @unittest.skipIf(multiprocessing.get_start_method() != "fork", "workers must inherit the patched worker function")
+    def testWorkerCrashIsIsolated(self):
+        filenames = []
+        for index in range(12):
+            filename = os.path.join(self.directory, "crash.a2l" if index == 3 else "good{0}.a2l".format(index))
+            with io.open(filename, "wb") as fp:
+                fp.write(TEXT)
+            filenames.append(filename)
+        parallel.parseInWorker = crashingWorker
+        try:
+            results = dict((result.filename, result) for result in parseMany(self.parser, filenames, workers = 2))
+        finally:
+            parallel.parseInWorker = parseInWorker
+        self.assertEqual(sorted(results), sorted(filenames))
+        failed = [filename for filename, result in results.items() if result.error is not None]
+        self.assertEqual(failed, [filenames[3]])
+        self.assertIsInstance(results[filenames[3]].error, BrokenProcessPool)
+
+
+if __name__ == '__main__':
+    unittest.main()
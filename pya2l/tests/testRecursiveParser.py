@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import io
+import os
+import unittest
+
+from pya2l import classes
+from pya2l.a2lparser import A2LParser, A2LSyntaxError
+from pya2l.decoders import FLOAT_VALUES, blockDecoder, optionDecoder, valueOf
+from pya2l.classes import ValueType
+from pya2l.tests.testA2LAcceptance import TEST_A2L
+from pya2l.tests import testA2LComments
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+
+
+def dumpInstances(walker):
+    return [(str(inst), level) for inst, level in walker.instList]
+
+
+class TestParity(unittest.TestCase):
+
+    def parse(self, data, **kws):
+        return A2LParser(**kws).parse(io.StringIO(data))
+
+    def assertParity(self, data):
+        expected = dumpInstances(self.parse(data))
+        for tokenizer in A2LParser.TOKENIZERS:
+            walker = self.parse(data, tokenizer = tokenizer, engine = "recursive")
+            self.assertEqual(dumpInstances(walker), expected)
+
+    def testExampleFile(self):
+        self.assertParity(io.open(os.path.join(BASE_DIR, "1.a2l"), encoding = "latin1").read())
+
+    def testAcceptance(self):
+        self.assertParity(TEST_A2L)
+
+    def testComment(self):
+        self.assertParity(testA2LComments.TestComment.COMMENT)
+
+    def testSkipsUnknownBlocks(self):
+        self.assertParity("""
+        /begin PROJECT p "" /begin MODULE m ""
+            /begin MEASUREMENT m1 "" UBYTE NO_COMPU_METHOD 0 0 0 255 ECU_ADDRESS 0x1000 /end MEASUREMENT
+        /end MODULE /end PROJECT""")
+
+
+class TestSyntaxErrors(unittest.TestCase):
+
+    def parse(self, data):
+        return A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(data))
+
+    def testPrematureEndOfFile(self):
+        self.assertRaises(A2LSyntaxError, self.parse, '/begin PROJECT p ""')
+
+    def testMismatchedEndTag(self):
+        self.assertRaises(A2LSyntaxError, self.parse, '/begin PROJECT p "" /end MODULE')
+
+    def testInvalidEngine(self):
+        self.assertRaises(ValueError, A2LParser, engine = "yacc")
+
+
+class TestKeywordFilter(unittest.TestCase):
+
+    KEYWORDS = ("COMPU_METHOD", "MEASUREMENT")
+
+    def keywordInstances(self, walker, keywords):
+        return [str(inst) for inst, level in walker.instList if inst.__class__.__name__ in keywords]
+
+    def testInclude(self):
+        data = io.open(os.path.join(BASE_DIR, "1.a2l"), encoding = "latin1").read()
+        expected = self.keywordInstances(A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(data)),
+            self.KEYWORDS
+        )
+        for tokenizer, engine in (("fast", "recursive"), ("antlr", "recursive"), ("antlr", "antlr")):
+            parser = A2LParser(tokenizer = tokenizer, engine = engine, include = self.KEYWORDS)
+            walker = parser.parse(io.StringIO(data))
+            self.assertEqual(self.keywordInstances(walker, self.KEYWORDS), expected)
+            keywords = set(inst.__class__.__name__ for inst, level in walker.instList if inst is not None)
+            self.assertEqual(keywords, set(self.KEYWORDS) | set(["PROJECT", "MODULE"]))
+
+    def testExclude(self):
+        data = """
+        /begin PROJECT p "" /begin MODULE m ""
+            /begin MEASUREMENT m1 "" UBYTE NO_COMPU_METHOD 0 0 0 255
+                /begin IF_DATA XCP "/end MEASUREMENT" /* /end IF_DATA */ /begin X /end X /end IF_DATA
+            /end MEASUREMENT
+        /end MODULE /end PROJECT"""
+        walker = A2LParser(tokenizer = "fast", engine = "recursive", exclude = ["IF_DATA"]).parse(io.StringIO(data))
+        measurement = walker.index("MEASUREMENT")["m1"]
+        self.assertEqual(measurement.children, [])
+        self.assertEqual([inst.__class__.__name__ for inst, level in walker.instList], ["MEASUREMENT", "MODULE", "PROJECT"])
+
+    def testSyntaxErrorAfterSkippedBlock(self):
+        data = '/begin PROJECT p ""\n/begin HEADER "" "/end HEADER"\n/end HEADER\n/begin MODULE m "" /end PROJECT'
+        parser = A2LParser(tokenizer = "fast", engine = "recursive", include = ["MEASUREMENT"])
+        with self.assertRaises(A2LSyntaxError) as context:
+            parser.parse(io.StringIO(data))
+        self.assertTrue(str(context.exception).startswith("4:"))
+
+    def testUnknownKeyword(self):
+        self.assertRaises(ValueError, A2LParser, include = ["NO_SUCH_KEYWORD"])
+
+
+class TestValues(unittest.TestCase):
+
+    DATA = """
+    /begin PROJECT p "" /begin MODULE m ""
+        /begin MEASUREMENT m1 "long identifier" UBYTE cm 0 0 0 255 ECU_ADDRESS 0x1000 /end MEASUREMENT
+        /begin MEASUREMENT m2 "" UBYTE cm 0 0 -1.5 0x10 /end MEASUREMENT
+        /begin COMPU_METHOD cm "" IDENTICAL "%4.2" "" /end COMPU_METHOD
+    /end MODULE /end PROJECT"""
+
+    def parse(self, **kws):
+        return A2LParser(**kws).parse(io.StringIO(self.DATA))
+
+    def testPlainValues(self):
+        for tokenizer, engine in (("fast", "recursive"), ("fast", "antlr")):
+            walker = self.parse(tokenizer = tokenizer, engine = engine, plainValues = True)
+            m1 = walker.index("MEASUREMENT")["m1"]
+            self.assertEqual(m1.LongIdentifier, "long identifier")
+            self.assertEqual(m1.Datatype, "UBYTE")
+            self.assertEqual(m1.Resolution, 0)
+            self.assertEqual(m1.ECU_ADDRESS.Address, 0x1000)
+            self.assertIsInstance(m1.UpperLimit, float)     # Typed by the attribute declaration.
+            m2 = walker.index("MEASUREMENT")["m2"]
+            self.assertEqual((m2.LowerLimit, m2.UpperLimit), (-1.5, 16.0))
+            self.assertIs(walker.crossReferences.users(walker.index("COMPU_METHOD")["cm"])[0], m1)
+
+    def testValueObjects(self):
+        expected = dumpInstances(self.parse())
+        walker = self.parse(tokenizer = "fast", engine = "recursive")
+        self.assertEqual(dumpInstances(walker), expected)
+        m1 = walker.index("MEASUREMENT")["m1"]
+        self.assertEqual((m1.UpperLimit.value, m1.UpperLimit.type), (255, ValueType.INT))
+
+    def testInternedIdentifiers(self):
+        for plainValues in (False, True):
+            walker = self.parse(tokenizer = "fast", engine = "recursive", plainValues = plainValues)
+            m1, m2 = walker.index("MEASUREMENT")["m1"], walker.index("MEASUREMENT")["m2"]
+            self.assertIs(valueOf(m1.Conversion), valueOf(m2.Conversion))
+
+    def testDecoders(self):
+        decoder = blockDecoder("MEASUREMENT")
+        self.assertIs(blockDecoder("MEASUREMENT"), decoder)
+        self.assertIs(classes.KeywordType.decoders["MEASUREMENT"], decoder)
+        self.assertEqual(decoder.arity, len(classes.KEYWORD_MAP["MEASUREMENT"].fixedAttributes))
+        self.assertIn("ECU_ADDRESS", decoder.children)
+        self.assertIs(decoder.fixedTables[True][decoder.fixedAttributes.index("UpperLimit")], FLOAT_VALUES)
+        self.assertEqual(blockDecoder("COMPU_VTAB").tuples[:2], ("NumberValuePairs", 2))
+        self.assertEqual(optionDecoder("RASTER", False).keyword, "RASTERAttr")
+        self.assertEqual(optionDecoder("RASTER", True).keyword, "RASTER")
+
+    def testCompiledWalkers(self):
+        decoder = blockDecoder("MEASUREMENT")
+        walk = decoder.walker(False)
+        self.assertIs(decoder.walker(False), walk)
+        self.assertIsNot(decoder.walker(True), walk)
+        self.assertEqual(walk.__name__, "walk_MEASUREMENT")
+        parser = A2LParser(tokenizer = "fast", engine = "recursive")
+        db = parser.parse(io.StringIO(u'/begin MEASUREMENT m "" UWORD CM 1 2 0 100 ECU_ADDRESS 0x10 /end MEASUREMENT'))
+        measurement = db.instList[0][0]
+        self.assertEqual((measurement.Name.value, measurement.UpperLimit.value), ("m", 100))
+        self.assertEqual(measurement.ECU_ADDRESS.Address.value, 0x10)
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import io
+import unittest
+
+from pya2l.a2lparser import A2LParser
+from pya2l.cache import Decoder, Encoder
+from pya2l.classes import ReferenceObject
+
+TEST_A2L = """
+/begin PROJECT p ""
+  /begin MODULE m ""
+    /begin COMPU_METHOD CM "" TAB_VERB "%d" ""
+      COMPU_TAB_REF VTAB
+    /end COMPU_METHOD
+    /begin COMPU_VTAB VTAB "" TAB_VERB 2 0 "off" 1 "on"
+    /end COMPU_VTAB
+    /begin RECORD_LAYOUT RL
+      FNC_VALUES 1 UBYTE ROW_DIR DIRECT
+    /end RECORD_LAYOUT
+    /begin MEASUREMENT meas "" UBYTE CM 0 0 0 1
+      ECU_ADDRESS 0x1000
+    /end MEASUREMENT
+    /begin CHARACTERISTIC c1 "" VALUE 0x2000 RL 0 CM 0 1
+      /begin FUNCTION_LIST f1
+      /end FUNCTION_LIST
+    /end CHARACTERISTIC
+    /begin CHARACTERISTIC c2 "" VALUE 0x2001 RL 0 NO_COMPU_METHOD 0 1
+    /end CHARACTERISTIC
+    /begin FUNCTION f1 ""
+      /begin REF_CHARACTERISTIC c1 c2 missing
+      /end REF_CHARACTERISTIC
+      /begin OUT_MEASUREMENT meas
+      /end OUT_MEASUREMENT
+    /end FUNCTION
+  /end MODULE
+/end PROJECT
+"""
+
+
+class TestReferences(unittest.TestCase):
+
+    def setUp(self):
+        self.db = A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(TEST_A2L))
+        self.refs = self.db.resolveReferences()
+
+    def function(self):
+        return [inst for inst, _ in self.db.instList if inst is not None and inst.__class__.__name__ == "FUNCTION"][0]
+
+    def testResolved(self):
+        c1 = self.db.characteristics["c1"]
+        self.assertIsInstance(c1.Conversion, ReferenceObject)
+        self.assertIs(c1.Conversion.target, self.db.compuMethods["CM"])
+        self.assertEqual(c1.Conversion.value, "CM")
+        self.assertIs(c1.Deposit.target, self.db.recordLayouts["RL"])
+        compuMethod = self.db.compuMethods["CM"]
+        self.assertEqual(compuMethod.COMPU_TAB_REF.ConversionTable.target.Name.value, "VTAB")
+        self.assertNotIsInstance(self.db.characteristics["c2"].Conversion, ReferenceObject)
+
+    def testVariableAttributes(self):
+        refs = [child for child in self.function().children if child.__class__.__name__ == "REF_CHARACTERISTIC"][0]
+        self.assertEqual([item.value for item in refs.Identifier], ["c1", "c2", "missing"])
+        self.assertIs(refs.Identifier[1].target, self.db.characteristics["c2"])
+        self.assertNotIsInstance(refs.Identifier[2], ReferenceObject)
+
+    def testReferencedBy(self):
+        compuMethod = self.db.compuMethods["CM"]
+        self.assertEqual([inst.Name.value for inst in self.refs.users(compuMethod)], ["meas", "c1"])
+        self.assertEqual([inst.Name.value for inst in self.refs.users(compuMethod, "CHARACTERISTIC")], ["c1"])
+        function = self.function()
+        self.assertEqual(self.refs.users(self.db.characteristics["c1"]), [function])
+        self.assertEqual(self.refs.users(self.db.measurements["meas"]), [function])
+        self.assertEqual(self.refs.users(function), [self.db.characteristics["c1"]])
+        self.assertEqual(self.refs.unresolved, [(function, "Identifier", "missing")])
+
+    def testIdempotent(self):
+        self.assertIs(self.db.crossReferences, self.refs)
+        again = self.db.resolveReferences()
+        self.assertEqual(again.unresolved, self.refs.unresolved)
+        self.assertEqual(again.referencedBy, self.refs.referencedBy)
+
+    def testCacheRoundTrip(self):
+        database = Decoder().decodeDatabase(Encoder().encodeDatabase(self.db))
+        c1 = database.characteristics["c1"]
+        self.assertIs(c1.Conversion.target, database.compuMethods["CM"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pya2l.a2lparser import A2LParser
+from pya2l.sqlitedb import A2LSqliteDatabase, exportDatabase
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+EXAMPLE = os.path.join(BASE_DIR, "1.a2l")
+
+
+class TestSqlite(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.walker = A2LParser(tokenizer = "fast", engine = "recursive").parseFromFileName(EXAMPLE)
+
+    def setUp(self):
+        self.tmpDir = tempfile.mkdtemp()
+        self.dbName = os.path.join(self.tmpDir, "test.a2ldb")
+        exportDatabase(self.walker, self.dbName)
+        self.db = A2LSqliteDatabase(self.dbName)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpDir)
+
+    def testInstances(self):
+        expected = [(str(inst), level) for inst, level in self.walker.instList if inst is not None]
+        self.assertEqual([(str(inst), level) for inst, level in self.db.instList], expected)
+
+    def testQueryByName(self):
+        measurement = self.db.get("MEASUREMENT", "TST_TRIM_u8TstMod")
+        self.assertEqual(measurement.keyword, "MEASUREMENT")
+        self.assertEqual(measurement.conversion, measurement.Conversion.value)
+        self.assertEqual(measurement.address, measurement.ECU_ADDRESS.Address.value)
+        self.assertIsNone(self.db.get("MEASUREMENT", "doesNotExist"))
+
+    def testQueryByConversion(self):
+        users = list(self.db.query(conversion = "I_5"))
+        self.assertTrue(users)
+        for element in users:
+            self.assertEqual(element.Conversion.value, "I_5")
+        self.assertEqual(self.db.get("COMPU_METHOD", "I_5").Name.value, "I_5")
+
+    def testAddressRange(self):
+        measurement = self.db.get("MEASUREMENT", "TST_TRIM_u8TstMod")
+        found = [element.rowid for element in self.db.addressRange(measurement.address, measurement.address + 1)]
+        self.assertIn(measurement.rowid, found)
+
+    def testHierarchy(self):
+        module = self.db.get("MODULE", "TCU_F8AT")
+        self.assertTrue(module.children)
+        for child in module.children:
+            self.assertEqual(child.parent.rowid, module.rowid)
+        children = module.element.children
+        self.assertFalse(children.loaded)
+        self.assertEqual(len(children), len(module.children))
+        self.assertTrue(children.loaded)
+        self.assertEqual([child.__class__.__name__ for child in children], [child.keyword for child in module.children])
+        self.assertFalse(any(child.children.loaded for child in children))
+
+    def testInheritedViews(self):
+        self.assertEqual(len(list(self.db.instances("MEASUREMENT"))), len(self.walker.measurements))
+        self.assertEqual(self.db.systemConstants, self.walker.systemConstants)
+        addressIndex = self.db.addressIndex
+        self.assertEqual(len(addressIndex), len(self.walker.addressIndex))
+        self.assertEqual([inst.Name.value for inst in addressIndex.elements],
+            [inst.Name.value for inst in self.walker.addressIndex.elements]
+        )
+        self.assertEqual(len(addressIndex.segments), len(self.walker.addressIndex.segments))
+
+    @unittest.skipIf(np is None, "requires NumPy")
+    def testColumns(self):
+        columns = self.db.columns("MEASUREMENT")
+        self.assertEqual(len(columns), len(self.walker.columns("MEASUREMENT")))
+        self.assertEqual(columns.address.tolist(), self.walker.columns("MEASUREMENT").address.tolist())
+
+    def testNameIndex(self):
+        self.assertEqual(self.db.compuMethods["I_5"].name, "I_5")
+        self.assertIn("TST_TRIM_u8TstMod", self.db.measurements)
+        self.assertEqual(len(self.db.measurements), len(self.walker.measurements))
+        self.assertEqual(sorted(self.db.measurements), sorted(self.walker.measurements))
+        self.assertEqual([name for name, _ in self.db.measurements.items()], list(self.walker.measurements))
+        with self.assertRaises(KeyError):
+            self.db.characteristics["doesNotExist"]
+
+    def testFromA2L(self):
+        a2lName = os.path.join(self.tmpDir, "1.a2l")
+        shutil.copy(EXAMPLE, a2lName)
+        with A2LSqliteDatabase.fromA2L(a2lName) as db:
+            self.assertTrue(os.path.exists(os.path.join(self.tmpDir, "1.a2ldb")))
+            source = db.meta("source")
+        with A2LSqliteDatabase.fromA2L(a2lName) as db:
+            self.assertEqual(db.meta("source"), source)
+            self.assertEqual(len(db.instList), len(self.db.instList))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+import sys
+import unittest
+
+if sys.version_info >= (3, 8):
+    from pya2l.tools.startupBenchmark import importTimes
+
+##
+## Best of five cumulative import times of `pya2l.a2lparser` are around 25 ms on a
+## typical development machine, about half of it for `re`, `six` and `enum`.
+##
+BUDGET_MS = 50
+
+LAZY_MODULES = ("antlr4", "pya2l.aml", "pya2l.amllib", "pya2l.py3.a2lParser", "mako", "logging", "pprint")
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "needs -X importtime and -X pycache_prefix")
+class TestStartup(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.times = importTimes("pya2l.a2lparser")
+
+    def testGrammarIsLoadedLazily(self):
+        for name in LAZY_MODULES:
+            self.assertNotIn(name, self.times)
+
+    def testBudget(self):
+        self.assertLessEqual(self.times["pya2l.a2lparser"] / 1000.0, BUDGET_MS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+import io
+import pickle
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pya2l.a2lparser import A2LParser
+
+if np is not None:
+    from pya2l.tables import NumericLookup, VerbalRangeLookup, lookupTable
+
+DATA = """
+/begin PROJECT p "" /begin MODULE m ""
+    /begin COMPU_TAB tab "" TAB_NOINTP 3 20 4.0 0 0.0 10 1.0 /end COMPU_TAB
+    /begin COMPU_TAB tabDefault "" TAB_INTP 2 0 0.0 10 1.0 DEFAULT_VALUE_NUMERIC -1.0 /end COMPU_TAB
+    /begin COMPU_VTAB vtab "" TAB_VERB 2 1 "one" 0 "zero" /end COMPU_VTAB
+    /begin COMPU_VTAB_RANGE vtabRange "" 2 10 20 "high" 0 9 "low" DEFAULT_VALUE "none" /end COMPU_VTAB_RANGE
+/end MODULE /end PROJECT"""
+
+
+@unittest.skipIf(np is None, "requires NumPy")
+class TestLookupTables(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = A2LParser(tokenizer = "fast", engine = "recursive").parse(io.StringIO(DATA))
+
+    def lookup(self, keyword, name):
+        return lookupTable(self.db.index(keyword)[name])
+
+    def testSortedArrays(self):
+        table = self.db.index("COMPU_TAB")["tab"]
+        lookup = lookupTable(table)
+        self.assertIs(lookupTable(table), lookup)
+        self.assertEqual(lookup.inValues.tolist(), [0.0, 10.0, 20.0])
+        self.assertEqual(lookup.outValues.tolist(), [0.0, 1.0, 4.0])
+        self.assertNotIn("_lookup", table.attrs)
+        self.assertEqual(str(pickle.loads(pickle.dumps(table))), str(table))
+
+    def testNumeric(self):
+        lookup = self.lookup("COMPU_TAB", "tab")
+        self.assertEqual(lookup.lookup([-5, 0, 15, 20, 25]).tolist(), [0.0, 0.0, 1.0, 4.0, 4.0])
+        self.assertEqual(lookup.interpolate([-5, 5, 15, 25]).tolist(), [0.0, 0.5, 2.5, 4.0])
+        self.assertEqual(lookup.inverseInterpolate([0.5, 2.5]).tolist(), [5.0, 15.0])
+        withDefault = self.lookup("COMPU_TAB", "tabDefault")
+        self.assertEqual(withDefault.interpolate([-1, 5, 11]).tolist(), [-1.0, 0.5, -1.0])
+        self.assertEqual(withDefault.lookup([0, 5, 10]).tolist(), [0.0, -1.0, 1.0])
+
+    def testVerbal(self):
+        lookup = self.lookup("COMPU_VTAB", "vtab")
+        self.assertEqual(lookup.lookup([1, 0, 2]).tolist(), ["one", "zero", None])
+        self.assertEqual(lookup.values(["zero", "one"]).tolist(), [0.0, 1.0])
+        self.assertRaises(ValueError, lookup.values, ["two"])
+
+    def testRanges(self):
+        lookup = self.lookup("COMPU_VTAB_RANGE", "vtabRange")
+        self.assertEqual(lookup.lookup(np.array([-1, 0, 9, 10, 20, 21])).tolist(),
+            ["none", "low", "low", "high", "high", "none"]
+        )
+        self.assertEqual(lookup.lookup(np.array([0.0, 8.5, 9.0, 9.5, 19.5, 20.0])).tolist(),
+            ["low", "low", "none", "none", "high", "none"]
+        )
+        self.assertEqual(lookup.values("high"), 10.0)
+
+    def testLinearScan(self):
+        random = np.random.RandomState(0)
+        inValues = random.choice(1000, 50, replace = False).astype(float)
+        lookup = NumericLookup("t", inValues, inValues * 2, default = -1.0)
+        samples = random.randint(-10, 1010, 1000)
+        expected = [value * 2.0 if value in inValues else -1.0 for value in samples]
+        self.assertEqual(lookup.lookup(samples).tolist(), expected)
+        mins = np.arange(0, 100, 10)
+        ranges = VerbalRangeLookup("r", mins[::-1], mins[::-1] + 5, [str(value) for value in mins[::-1]])
+        expected = [next((str(low) for low in mins if low <= value <= low + 5), None) for value in range(-5, 105)]
+        self.assertEqual(ranges.lookup(np.arange(-5, 105)).tolist(), expected)
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+import glob
+import io
+import os
+import unittest
+
+import antlr4
+
+from pya2l import aml
+from pya2l.a2lparser import A2LParser
+from pya2l import tokenizer
+from pya2l.tokenizer import A2LTokenizer
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+
+FILES = sorted(glob.glob(os.path.join(BASE_DIR, "examples", "*"))) + [os.path.join(BASE_DIR, "1.a2l")]
+
+EDGE_CASES = [
+    '-x 1', '+.x', '. 5', '/bex /begin /beginning /en /end /endx /inc /include /i',
+    '//abc', '//abc\rX y', '//a\r\n b', '"abc', '"a\\"b" c', '"a\\',
+    'a[1].b[2] a[1]. a.b.c a[12 0x 0xFG 1e 1e+ 1.5e3x 1.5.3 -.5 +3',
+    'ASAP2_VERSION 1 61 ASAP2_VERSIONX', '/* unterminated', '/* a */ b /**/ c',
+    '{ } ; = \xa0 x', '"multi\nline" x\n  y', '1.', '-', '/', 'a\tb\r\nc', '"" """"',
+]
+
+
+def antlrTokens(data):
+    lexer = aml.ParserWrapper('a2l', 'a2lFile').lexerClass(antlr4.InputStream(data))
+    lexer.removeErrorListeners()
+    result = []
+    while True:
+        token = lexer.nextToken()
+        if token.type == antlr4.Token.EOF:
+            break
+        if token.channel == antlr4.Token.DEFAULT_CHANNEL:
+            result.append((token.type, token.text, token.line, token.column))
+    return result
+
+
+def fastTokens(data):
+    source = A2LTokenizer(data)
+    source.logger.silent()
+    return [tuple(token) for token in source.tokens()]
+
+
+class TestConformance(unittest.TestCase):
+
+    def testExampleFiles(self):
+        for fname in FILES:
+            data = io.open(fname, encoding = "latin1").read()
+            self.assertEqual(fastTokens(data), antlrTokens(data), fname)
+
+    def testEdgeCases(self):
+        for data in EDGE_CASES:
+            self.assertEqual(fastTokens(data), antlrTokens(data), repr(data))
+
+    def testErrorCount(self):
+        tokenizer = A2LTokenizer("/begin PROJECT { x } /end PROJECT")
+        tokenizer.logger.silent()
+        list(tokenizer.tokens())
+        self.assertEqual(tokenizer.numberOfErrors, 2)
+
+
+class TestSkipBlock(unittest.TestCase):
+
+    def skipBlocks(self, data, chunkSize, keep = ()):
+        """Tokens generated if blocks are skipped right after their keyword, unless in `keep`.
+        """
+        tokens = A2LTokenizer(io.StringIO(data), chunkSize = chunkSize).tokens()
+        result = []
+        token = next(tokens, None)
+        while token is not None:
+            result.append(token)
+            if result[-2 : -1] and result[-2].type == tokenizer.BEGIN and token.text not in keep:
+                try:
+                    token = tokens.send(tokenizer.SKIP_BLOCK)
+                except StopIteration:
+                    break
+            else:
+                token = next(tokens, None)
+        return result
+
+    def testPositions(self):
+        data = io.open(os.path.join(BASE_DIR, "1.a2l"), encoding = "latin1").read()
+        tokens = fastTokens(data)
+        for chunkSize in (64, 4096):
+            skipped = self.skipBlocks(data, chunkSize, keep = ("PROJECT", "MODULE"))
+            self.assertEqual([tuple(token) for token in skipped[-4 : ]], tokens[-4 : ])    # /end MODULE /end PROJECT
+            self.assertTrue(set(tuple(token) for token in skipped) <= set(tokens))
+            self.assertLess(len(skipped), len(tokens) // 10)
+
+    def testStringsAndComments(self):
+        data = '/begin A "/end A" /* /end A */ // /end A\n /begin B /end B /end A x'
+        self.assertEqual([token.text for token in self.skipBlocks(data, 8)], ['/begin', 'A', '/end', 'A', 'x'])
+
+
+class TestParser(unittest.TestCase):
+
+    def testInvalidTokenizer(self):
+        self.assertRaises(ValueError, A2LParser, tokenizer = "flex")
+
+    def testSameInstances(self):
+        fname = os.path.join(BASE_DIR, "1.a2l")
+        results = []
+        for name in A2LParser.TOKENIZERS:
+            walker = A2LParser(tokenizer = name).parse(io.open(fname, encoding = "latin1"))
+            results.append([(inst.__class__.__name__ if inst else None, level) for inst, level in walker.instList])
+        self.assertEqual(results[0], results[1])
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Hand-written tokenizer for A2L files.
+
+Produces the same token stream as the ANTLR generated lexer (s. `a2l.g4`),
+including its error recovery, but runs a single compiled regular expression
+instead of the ATN simulator.
+"""
+
+from collections import namedtuple
+import io
+import mmap
+import os
+import re
+
+from pya2l.logger import Logger
+
+
+##
+## Token types, must be kept in sync with `py3/a2l.tokens`.
+##
+ASAP2_VERSION = 1
+INCLUDE = 2
+BEGIN = 3
+END = 4
+INT = 5
+HEX = 6
+FLOAT = 7
+COMMENT = 8
+WS = 9
+IDENT = 10
+STRING = 11
+
+ERROR = -2  # Not a real token, used for unrecognized input.
+SPLICE = -3 # Not a real token, s. :class:`pya2l.a2lparser.Splice`.
+
+SKIP_BLOCK = "skip"     # Command sent to :meth:`A2LTokenizer.tokens`.
+
+Token = namedtuple("Token", "type text line column")
+
+IDENT_PATTERN = r"[a-zA-Z_][a-zA-Z_0-9.]*(?:\[[0-9]*\])*"
+EXPONENT_PATTERN = r"(?:[eE][+-]?[0-9]+)"
+
+##
+## Alternatives are ordered, so the first one matching wins; the order is chosen to yield the
+## same longest-match results as the ANTLR lexer.
+## The last alternative mimics ANTLR's error recovery: the longest viable prefix
+## of a token plus one character get dropped.
+##
+PATTERN = r"""
+    (?P<ws>[ \t\r\n]+)
+   |(?P<comment>//[^\n\r]*\r?\n|/\*.*?\*/)
+   |(?P<begin>/begin)
+   |(?P<end>/end)
+   |(?P<include>/include)
+   |(?P<hex>0[xX][0-9a-fA-F]+)
+   |(?P<float>[+-]?(?:[0-9]+\.[0-9]*{exp}?|\.[0-9]+{exp}?|[0-9]+{exp}))
+   |(?P<int>[+-]?[0-9]+)
+   |(?P<ident>{ident}(?:\.{ident})*)
+   |(?P<string>"(?:\\.|[^\\"])*")
+   |(?P<error>//[^\n\r]*\r?.?|/\*.*|".*|[+-]\.?.?|\..?|/(?:b(?:e(?:gi?)?)?|en?|i(?:n(?:c(?:l(?:ud?)?)?)?)?)?.?|.)
+""".format(exp = EXPONENT_PATTERN, ident = IDENT_PATTERN)
+
+TOKEN_RE = re.compile(PATTERN, re.VERBOSE | re.DOTALL)
+
+##
+## While skipping blocks only `/begin` and `/end` matter -- and strings and comments, which may contain them.
+##
+SKIP_RE = re.compile(r"""
+    [^"/]*
+    (?:
+        "(?:\\.|[^\\"])*"
+       |//[^\n\r]*
+       |/\*.*?\*/
+       |(?P<begin>/begin)
+       |(?P<end>/end)
+       |(?P<open>"|/\*)
+       |/
+       |(?P<eof>\Z)
+    )
+""", re.VERBOSE | re.DOTALL)
+
+GROUP_TYPES = {
+    TOKEN_RE.groupindex['ws']: WS,
+    TOKEN_RE.groupindex['comment']: COMMENT,
+    TOKEN_RE.groupindex['begin']: BEGIN,
+    TOKEN_RE.groupindex['end']: END,
+    TOKEN_RE.groupindex['include']: INCLUDE,
+    TOKEN_RE.groupindex['hex']: HEX,
+    TOKEN_RE.groupindex['float']: FLOAT,
+    TOKEN_RE.groupindex['int']: INT,
+    TOKEN_RE.groupindex['ident']: IDENT,
+    TOKEN_RE.groupindex['string']: STRING,
+    TOKEN_RE.groupindex['error']: ERROR,
+}
+
+
+##
+## A2ML sections can't be tokenized, s. A2LTokenizer(skipA2ML = True).
+##
+A2ML_START = re.compile(r"/begin\s+A[23]ML")
+A2ML_PARTIAL = re.compile(r"/begin\s*(?:A(?:[23]M?)?)?\Z")
+A2ML_END = re.compile(r"/end\s+A[23]ML")
+
+A2ML_START_BYTES = re.compile(br"/begin\s+A[23]ML")
+A2ML_END_BYTES = re.compile(br"/end\s+A[23]ML")
+
+
+def a2mlRegions(buffer):
+    """Locate `/begin A2ML ... /end A2ML` sections.
+
+    Parameters
+    ----------
+    buffer: bytes-like object
+        e.g. a :class:`mmap.mmap`.
+
+    Returns
+    -------
+    list of (int, int) tuples
+        Byte offsets `(start, end)` of the sections.
+    """
+    result = []
+    pos = 0
+    while True:
+        start = A2ML_START_BYTES.search(buffer, pos)
+        if not start:
+            break
+        end = A2ML_END_BYTES.search(buffer, start.end())
+        if not end:
+            break
+        result.append((start.start(), end.end()))
+        pos = end.end()
+    return result
+
+
+class MappedFile(object):
+    """Read-only, memory-mapped A2L file.
+
+    Behaves like a text file object opened with latin1 encoding, but the file is never
+    read as a whole: :meth:`read` decodes just the requested slice of the mapping.
+    A2ML sections are replaced by their newlines, so line numbers stay intact.
+
+    Parameters
+    ----------
+    filename: str
+    skipA2ML: bool
+    """
+
+    def __init__(self, filename, skipA2ML = True):
+        self.name = filename
+        with io.open(filename, "rb") as fp:
+            if os.fstat(fp.fileno()).st_size:
+                self.buffer = mmap.mmap(fp.fileno(), 0, access = mmap.ACCESS_READ)
+            else:
+                self.buffer = b""   # Empty files can't be mapped.
+        self.regions = a2mlRegions(self.buffer) if skipA2ML else []
+        self.pos = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.buffer = b""
+        self.regions = []
+        self.pos = 0
+
+    def read(self, size = -1):
+        if size is None or size < 0:
+            return ''.join(iter(lambda: self.read(len(self.buffer) or 1), ""))
+        buffer = self.buffer
+        length = len(buffer)
+        while self.pos < length:
+            start = self.pos
+            stop = min(start + size, length)
+            if self.regions and self.regions[0][0] <= start:
+                regionEnd = self.regions[0][1]
+                if stop >= regionEnd:
+                    stop = regionEnd
+                    self.regions.pop(0)
+                self.pos = stop
+                count = buffer[start : stop].count(b'\n')
+                if count:
+                    return '\n' * count
+            else:
+                if self.regions:
+                    stop = min(stop, self.regions[0][0])
+                self.pos = stop
+                return buffer[start : stop].decode("latin1")
+        return ""
+
+
+class A2LTokenizer(object):
+    """Split A2L source text into tokens.
+
+    Parameters
+    ----------
+    data: str or file-like object
+        A2L source; file-like objects are read in chunks, so the whole file is never held in memory.
+    filename: str
+        Only used for diagnostic messages.
+    skipA2ML: bool
+        Drop `/begin A2ML ... /end A2ML` sections.
+    chunkSize: int
+        Number of characters read at once from file-like objects.
+    firstLine: int
+        Line number of the start of `data`, e.g. if it is an excerpt of a file.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, data, filename = None, skipA2ML = False, chunkSize = CHUNK_SIZE, firstLine = 1):
+        self.logger = Logger(self, 'tokenizer')
+        if hasattr(data, "read"):
+            self.fp = data
+            self.data = None
+            filename = filename or getattr(data, "name", None)
+        else:
+            self.fp = None
+            self.data = data
+        self.filename = filename or "<string>"
+        self.skipA2ML = skipA2ML
+        self.chunkSize = chunkSize
+        self.firstLine = firstLine
+        self.lineNo = firstLine
+        self.numberOfErrors = 0
+
+    def __iter__(self):
+        return self.tokens()
+
+    def tokens(self):
+        """Generate the tokens on the default channel, i.e. whitespace and comments are dropped.
+
+        Sending :data:`SKIP_BLOCK` to the generator (after the keyword of a block has been generated)
+        fast-forwards to the matching `/end` token, which is the result of `send()`;
+        the content of the block is not tokenized.
+        """
+        groupTypes = GROUP_TYPES
+        scan = TOKEN_RE.match
+        skipMatch = SKIP_RE.match
+        skipA2ML = self.skipA2ML
+        skipDepth = 0
+        line = self.firstLine
+        lineStart = 0   # Absolute offsets.
+        offset = 0
+        buf = ""
+        final = False
+        while not final:
+            if self.fp is None:
+                buf = self.data
+                final = True
+            else:
+                chunk = self.fp.read(self.chunkSize)
+                final = not chunk
+                buf += chunk
+            # Tokens never span a newline, except strings and comments -- which get deferred if unterminated.
+            endpos = len(buf) if final else buf.rfind('\n') + 1
+            pos = 0
+            while pos < endpos:
+                if skipDepth:
+                    match = skipMatch(buf, pos, endpos)
+                    kind = match.lastgroup
+                    if kind == "open" and not final:
+                        end = match.start(kind)     # May be terminated in the next chunk.
+                    elif kind in ("open", "eof"):
+                        end = endpos
+                    else:
+                        end = match.end()
+                    count = buf.count('\n', pos, end)
+                    if count:
+                        line += count
+                        lineStart = offset + buf.rindex('\n', pos, end) + 1
+                    pos = end
+                    if kind == "begin":
+                        skipDepth += 1
+                    elif kind == "end":
+                        skipDepth -= 1
+                        if not skipDepth:
+                            if (yield Token(END, "/end", line, offset + match.start(kind) - lineStart)) == SKIP_BLOCK:
+                                skipDepth = 1
+                    elif kind in ("open", "eof"):
+                        break
+                    continue
+                match = scan(buf, pos, endpos)
+                end = match.end()
+                if not final and end == endpos:
+                    break   # May continue in the next chunk.
+                tokenType = groupTypes[match.lastindex]
+                if tokenType == BEGIN and skipA2ML:
+                    a2ml = A2ML_START.match(buf, pos, endpos)
+                    if a2ml:
+                        a2mlEnd = A2ML_END.search(buf, a2ml.end(), endpos)
+                        if a2mlEnd:
+                            end = a2mlEnd.end()
+                            count = buf.count('\n', pos, end)
+                            if count:
+                                line += count
+                                lineStart = offset + buf.rindex('\n', pos, end) + 1
+                            pos = end
+                            continue
+                        elif not final:
+                            break
+                    elif not final and A2ML_PARTIAL.match(buf, pos, endpos):
+                        break
+                text = match.group()
+                if tokenType in (WS, COMMENT, STRING, ERROR):
+                    if tokenType == STRING:
+                        if (yield Token(STRING, text, line, offset + pos - lineStart)) == SKIP_BLOCK:
+                            skipDepth = 1
+                    elif tokenType == ERROR:
+                        self.lineNo = line
+                        self.numberOfErrors += 1
+                        self.logger.error("token recognition error at: {0!r}".format(text))
+                    count = text.count('\n')
+                    if count:
+                        line += count
+                        lineStart = offset + pos + text.rindex('\n') + 1
+                else:
+                    if tokenType == IDENT and text == 'ASAP2_VERSION':
+                        tokenType = ASAP2_VERSION
+                    if (yield Token(tokenType, text, line, offset + pos - lineStart)) == SKIP_BLOCK:
+                        skipDepth = 1
+                pos = end
+            if not final:
+                buf = buf[pos : ]
+                offset += pos
+        self.lineNo = line
+
+
+def tokensFromTokenSource(tokenSource):
+    """Generate :class:`Token` s from an ANTLR token source, e.g. the generated lexer.
+    """
+    while True:
+        token = tokenSource.nextToken()
+        if token.type == -1:    # Token.EOF
+            return
+        if token.channel == 0:  # Token.DEFAULT_CHANNEL
+            yield Token(token.type, token.text, token.line, token.column)
+
+
+class A2LTokenSource(object):
+    """Make :class:`A2LTokenizer` usable as an ANTLR token source, i.e. a drop-in replacement
+    for the generated lexer.
+    """
+
+    def __init__(self, tokenizer):
+        from antlr4.Token import CommonToken
+
+        self._tokenClass = CommonToken
+        self.tokenizer = tokenizer
+        self._tokens = tokenizer.tokens()
+        self.line = 1
+        self.column = 0
+
+    def nextToken(self):
+        token = next(self._tokens, None)
+        result = self._tokenClass(source = (self, None))
+        if token is None:
+            result.type = -1    # Token.EOF
+            result.text = "<EOF>"
+            result.line = self.tokenizer.lineNo
+            result.column = 0
+        else:
+            result.type, result.text, result.line, result.column = token
+        return result
+
+    def getSourceName(self):
+        return self.tokenizer.filename
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Compare the memory footprint of the object model built by
+per-node classes (the former `instanceFactory`) and per-keyword `__slots__` classes.
+
+Usage: python -m pya2l.tools.memoryBenchmark [file.a2l]
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+from pya2l import classes
+from pya2l.a2lparser import A2LParser
+
+DEFAULT_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "1.a2l")
+
+
+class LegacyElement(object):
+
+    __str__ = classes.A2LElement.__str__
+
+
+def legacyCreateInstance(className, items):
+    """Former behaviour: a new class and a `__dict__` per node.
+    """
+    klass = type(str(className), (LegacyElement, ), {})
+    inst = klass()
+    inst.attrs = []
+    for name, value in items:
+        setattr(inst, name, value)
+        if name not in inst.attrs:
+            inst.attrs.append(name)
+    inst.children = []
+    return inst
+
+
+def countNodes(instList):
+    count = 0
+    stack = [inst for inst, _ in instList if inst is not None]
+    seen = set()
+    while stack:
+        inst = stack.pop()
+        if id(inst) in seen:
+            continue
+        seen.add(id(inst))
+        count += 1
+        for attr in inst.attrs:
+            value = getattr(inst, attr)
+            if hasattr(value, "attrs"):
+                stack.append(value)
+    return count
+
+
+def measure(filename):
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull   # The walker prints progress messages.
+        try:
+            gc.collect()
+            tracemalloc.start()
+            start = time.time()
+            database = A2LParser(tokenizer = "fast", engine = "recursive").parseFromFileName(filename)
+            elapsed = time.time() - start
+            gc.collect()
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            sys.stdout = stdout
+    return size, countNodes(database.instList), elapsed
+
+
+def main(filename):
+    results = []
+    original = classes.createInstance
+    for title, factory in (("per-node classes", legacyCreateInstance), ("__slots__ classes", original)):
+        classes.createInstance = factory
+        try:
+            results.append((title, measure(filename)))
+        finally:
+            classes.createInstance = original
+    print("{0}:".format(os.path.basename(filename)))
+    for title, (size, nodes, elapsed) in results:
+        print("  {0:<18} {1:>10} bytes  {2:>6} nodes  {3:>6.0f} bytes/node  {4:.3f} s".format(
+            title, size, nodes, float(size) / nodes, elapsed)
+        )
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FILE)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+
+"""Measure the import time of pyA2L modules using `python -X importtime`.
+
+Bytecode is written to a temporary `pycache_prefix`, so compiling the sources
+doesn't count; the best of several runs is reported.
+
+Usage: python -m pya2l.tools.startupBenchmark [module ...]
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+DEFAULT_MODULES = ("pya2l", "pya2l.a2lparser")
+
+RUNS = 5
+
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)\s*$")
+
+
+def importTimes(module, runs = RUNS):
+    """Import `module` in fresh interpreters.
+
+    Returns
+    -------
+    dict
+        Name of each module imported -> best cumulative import time in microseconds.
+    """
+    directory = tempfile.mkdtemp()
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPATH"] = os.pathsep.join(path for path in (BASE_DIR, env.get("PYTHONPATH")) if path)
+    command = [sys.executable, "-X", "importtime", "-X", "pycache_prefix={0}".format(directory),
+        "-c", "import {0}".format(module)
+    ]
+    result = {}
+    try:
+        subprocess.check_output(command, stderr = subprocess.STDOUT, env = env)   # Write bytecode.
+        for _ in range(runs):
+            output = subprocess.check_output(command, stderr = subprocess.STDOUT, env = env)
+            for line in output.decode("utf-8", "replace").splitlines():
+                match = IMPORT_TIME.match(line)
+                if match:
+                    name = match.group(3)
+                    cumulative = int(match.group(2))
+                    result[name] = min(result.get(name, cumulative), cumulative)
+    finally:
+        shutil.rmtree(directory, ignore_errors = True)
+    return result
+
+
+def main():
+    for module in sys.argv[1 : ] or DEFAULT_MODULES:
+        times = importTimes(module)
+        own = sorted((name for name in times if name.split(".")[0] == "pya2l"), key = lambda name: -times[name])
+        print("{0}: {1:.1f} ms".format(module, times[module] / 1000.0))
+        for name in own:
+            if name != module:
+                print("    {0:30s} {1:8.1f} ms".format(name, times[name] / 1000.0))
+        print("    {0} modules imported, {1} of them from pyA2L".format(len(times), len(own)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__copyright__ = """
+   pySART - Simplified AUTOSAR-Toolkit for Python.
+
+   (C) 2010-2019 by Christoph Schueler <cpu12.gems.googlemail.com>
+
+   All Rights Reserved
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation; either version 2 of the License, or
+   (at your option) any later version.
+
+   This program is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License along
+   with this program; if not, write to the Free Software Foundation, Inc.,
+   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+   s. FLOSS-EXCEPTION.txt
+"""
+__author__  = 'Christoph Schueler'
+__version__ = '0.1.0'
+
+"""Microbenchmark of attribute value decoding, s. :meth:`pya2l.a2lparser.BaseWalker.getValue`.
+
+Decodes the value tokens of an A2L file (default: `1.a2l`) as :class:`pya2l.classes.ValueObject` s
+and as plain Python scalars, then times complete parses in both modes; the best of several runs is reported.
+
+Usage: python -m pya2l.tools.valueBenchmark [filename]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import timeit
+
+import six
+
+from pya2l.a2lparser import A2LParser, A2LTokenWalker
+from pya2l.tokenizer import A2LTokenizer
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+RUNS = 5
+
+
+@contextlib.contextmanager
+def quiet():
+    """The parser still prints progress messages, keep them out of the results.
+    """
+    stdout = sys.stdout
+    sys.stdout = io.StringIO() if six.PY3 else io.BytesIO()
+    try:
+        yield
+    finally:
+        sys.stdout = stdout
+
+
+def valueTokens(filename):
+    with io.open(filename, encoding = "latin1") as inf:
+        tokens = A2LTokenizer(inf.read(), filename, skipA2ML = True).tokens()
+        return [token for token in tokens if token.type in A2LTokenWalker.PRIMITIVE_TYPES]
+
+
+def decodeTime(tokens, plainValues, runs = RUNS):
+    """Best time in seconds to decode all `tokens`.
+    """
+    walker = A2LTokenWalker(())
+    walker.plainValues = plainValues
+    getValue = walker.getValue
+
+    def decode():
+        for token in tokens:
+            getValue(token)
+
+    return min(timeit.repeat(decode, number = 1, repeat = runs))
+
+
+def parseTime(filename, plainValues, engine = "recursive", runs = RUNS):
+    """Best time in seconds to parse `filename`.
+    """
+    parser = A2LParser(tokenizer = "fast", engine = engine, plainValues = plainValues)
+    with quiet():
+        return min(timeit.repeat(lambda: parser.parseFile(filename), number = 1, repeat = runs))
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else os.path.join(BASE_DIR, "1.a2l")
+    tokens = valueTokens(filename)
+    print("{0}: {1} values".format(filename, len(tokens)))
+    for plainValues in (False, True):
+        elapsed = decodeTime(tokens, plainValues)
+        print("    decode, {0:7s} {1:8.1f} ms  {2:6.0f} ns/value".format("plain" if plainValues else "objects",
+            elapsed * 1000.0, elapsed * 1e9 / max(len(tokens), 1))
+        )
+    for engine in ("recursive", "antlr"):
+        for plainValues in (False, True):
+            print("    parse ({0}), {1:7s} {2:8.1f} ms".format(engine, "plain" if plainValues else "objects",
+                parseTime(filename, plainValues, engine, RUNS if engine == "recursive" else 1) * 1000.0)
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -27,6 +27,11 @@ setup(
     url = 'https://www.github.com/Christoph2/pyA2L',
     packages = find_packages(),
     install_requires = install_reqs,
+    package_data = {'pya2l': ['py2/*.atn', 'py3/*.atn']},
+    extras_require = {
+        'numpy': ['numpy'],
+        'parallel': ['futures; python_version < "3"'],
+    },
     #entry_points = {
     #    'console_scripts': [
     #            'vd_exporter = pyA2L.catalogue.vd_exporter:main'